@@ -1,12 +1,51 @@
 from abc import ABC, abstractmethod
+from array import array
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+import contextlib
+import functools
+import importlib.util
+import json
+import logging
+import math
+import multiprocessing
+import os
 import random
+import sys
 import time
+import zlib
+
+try:
+    import numpy as np
+except ImportError:  # 벡터화 엔진(VectorizedGame)에서만 필요
+    np = None
+
+# 공용 패키지(starcraft_common)는 저장소 최상위에 있다. 단원 폴더에서 직접 실행해 루트가 import 경로에
+# 없으면 sys.path를 바꾸지 않고 파일 위치로 불러와 등록한다.
+if importlib.util.find_spec("starcraft_common") is None:
+    _spec = importlib.util.spec_from_file_location(
+        "starcraft_common",
+        os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "starcraft_common", "__init__.py"))
+    sys.modules[_spec.name] = importlib.util.module_from_spec(_spec)
+    _spec.loader.exec_module(sys.modules[_spec.name])
+from starcraft_common.log import configure_logging, log_event, quiet_logging, silence_logging
+
+# ========== 로깅 ==========
+# 이벤트는 공용 "starcraft" 로거 아래에 남는다 (starcraft_common.log 참고). 끄려면 quiet_logging()을 쓴다.
+log = logging.getLogger("starcraft.advanced")
+_event = functools.partial(log_event, log)
 
 class EnergyPool:
+    __slots__ = ("current", "maximum", "basic_amount")
+    
     def __init__(self, current=0, maximum=200, basic_amount = 0):
         self.current = current
         self.maximum = maximum
         self.basic_amount = basic_amount
+
+    def clone(self):
+        return EnergyPool(self.current, self.maximum, self.basic_amount)
     
     def consume(self, amount):
         if amount <= 0:
@@ -38,6 +77,9 @@ class EnergyPool:
         return self.current - before
 
 class CloakModule:
+    __slots__ = ("owner", "energy_pool", "activation_cost", "drain_per_turn",
+                 "base_duration", "is_cloaked", "remaining")
+    
     def __init__(self, owner, energy_pool, activation_cost=25, drain_per_turn=10, duration=3):
         self.owner = owner
         self.energy_pool = energy_pool
@@ -47,21 +89,30 @@ class CloakModule:
         self.is_cloaked = False
         self.remaining = 0
 
+    def clone(self, owner, energy_pool):
+        twin = CloakModule(owner, energy_pool, self.activation_cost, self.drain_per_turn, self.base_duration)
+        twin.is_cloaked = self.is_cloaked
+        twin.remaining = self.remaining
+        return twin
+
     def cloak(self):
         if not self.owner.can_act():
             return
         
         if self.is_cloaked:
-            print(f"{self.owner.name}: 이미 은폐 상태입니다. ({self.remaining}턴 남음)")
+            _event(logging.WARNING, "cloak_active", "%(unit)s: 이미 은폐 상태입니다. (%(remaining)s턴 남음)",
+                   unit=self.owner.name, remaining=self.remaining)
             return
         
         if not self.energy_pool.consume(self.activation_cost):
-            print(f"{self.owner.name}: 에너지가 부족하여 클로킹할 수 없습니다. ({self.energy_pool.current}/{self.activation_cost})")
+            _event(logging.WARNING, "cloak_no_energy", "%(unit)s: 에너지가 부족하여 클로킹할 수 없습니다. (%(energy)s/%(cost)s)",
+                   unit=self.owner.name, energy=self.energy_pool.current, cost=self.activation_cost)
             return
         
         self.is_cloaked = True
         self.remaining = self.base_duration
-        print(f"{self.owner.name}: 클로킹 시작! (지속 {self.base_duration}턴, 활성화비 {self.activation_cost}, 매 턴 소모 {self.drain_per_turn})")
+        _event(logging.INFO, "cloak", "%(unit)s: 클로킹 시작! (지속 %(duration)s턴, 활성화비 %(cost)s, 매 턴 소모 %(drain)s)",
+               unit=self.owner.name, duration=self.base_duration, cost=self.activation_cost, drain=self.drain_per_turn)
 
     def uncloak(self, reason="수동 해제"):
         if not self.is_cloaked:
@@ -69,7 +120,7 @@ class CloakModule:
         
         self.is_cloaked = False
         self.remaining = 0
-        print(f"{self.owner.name}: 클로킹 해제 ({reason}).")
+        _event(logging.INFO, "uncloak", "%(unit)s: 클로킹 해제 (%(reason)s).", unit=self.owner.name, reason=reason)
 
     def update(self):
         if not self.is_cloaked:
@@ -86,9 +137,14 @@ class CloakModule:
             self.uncloak("지속시간 종료")
 
 class RegenerationModule:
+    __slots__ = ("owner", "amount")
+    
     def __init__(self, owner, amount):
         self.owner = owner
         self.amount = amount
+
+    def clone(self, owner):
+        return RegenerationModule(owner, self.amount)
     
     def regenerate(self):
         if not self.owner.can_act():
@@ -99,18 +155,32 @@ class RegenerationModule:
         healed = self.owner.hp - before
         
         if healed > 0:
-            print(f"{self.owner.name}: 자가 회복 +{healed} (현재 HP {self.owner.hp}/{self.owner.max_hp})")
+            _event(logging.INFO, "regen", "%(unit)s: 자가 회복 +%(healed)s (현재 HP %(hp)s/%(max_hp)s)",
+                   unit=self.owner.name, healed=healed, hp=self.owner.hp, max_hp=self.owner.max_hp)
 
     def update(self):
         self.regenerate()
 
+@functools.lru_cache(maxsize=None)
+def _slot_names(cls):
+    """cls와 모든 부모 클래스의 __slots__ 이름 (클래스마다 한 번만 계산한다)"""
+    return tuple(name for c in cls.__mro__ for name in c.__dict__.get("__slots__", ()))
+
+# 유닛 계층은 __slots__로 인스턴스 __dict__를 없앤다.
+# 다중 상속이 가능하도록 슬롯을 추가하는 중간 클래스는 MechanicUnit 하나로 제한하고,
+# 나머지 중간 클래스(GroundUnit, AerialUnit, CreatureUnit)는 빈 슬롯만 둔다.
 class BaseUnit(ABC):
+    __slots__ = ("max_hp", "hp", "x", "y", "name", "_death_listeners")
+    ATTACK_RANGE = math.inf  # 사거리 (Game(use_ranges=True)에서만 사용)
+    MOVE_SPEED = 1           # 사거리 밖일 때 한 턴에 이동하는 거리
+    
     def __init__(self, hp=100, x=0, y=0, name="Default Unit", **kwargs):
         self.max_hp = hp
         self.hp = hp
         self.x = x
         self.y = y
         self.name = name
+        self._death_listeners = ()
     
     def is_alive(self):
         return self.hp > 0
@@ -121,6 +191,28 @@ class BaseUnit(ABC):
     def can_act(self):
         return self.is_alive()
     
+    def clone(self):
+        """
+        같은 상태의 새 유닛. 생성자를 거치지 않고 슬롯 값만 복사한다.
+        사망 리스너는 복사하지 않으며, 모듈을 가진 유닛은 모듈도 새 유닛을 가리키도록 복제한다.
+        """
+        twin = object.__new__(type(self))
+        for name in _slot_names(type(self)):
+            setattr(twin, name, getattr(self, name))
+        twin._death_listeners = ()
+        return twin
+    
+    def add_death_listener(self, callback):
+        # 대부분의 유닛은 리스너가 하나뿐이므로 리스트 대신 튜플로 보관한다
+        self._death_listeners += (callback,)
+
+    def remove_death_listener(self, callback):
+        listeners = self._death_listeners
+        for i, registered in enumerate(listeners):
+            if registered == callback:  # 바운드 메서드는 매번 새 객체이므로 ==로 비교한다
+                self._death_listeners = listeners[:i] + listeners[i + 1:]
+                return
+    
     def attacked(self, dmg):
         if not self.is_alive():
             return
@@ -128,7 +220,9 @@ class BaseUnit(ABC):
         self.hp = max(self.hp - dmg, 0)
         
         if self.hp == 0:
-            print(f"Unit {self.name}이(가) 사망하였습니다.")
+            _event(logging.INFO, "death", "Unit %(unit)s이(가) 사망하였습니다.", unit=self.name)
+            for callback in self._death_listeners:
+                callback(self)
     
     @abstractmethod
     def attack(self, other):
@@ -138,22 +232,28 @@ class BaseUnit(ABC):
         pass
 
 class GroundUnit(BaseUnit, ABC):
+    __slots__ = ()
+    ground_unit = True
+    
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self.ground_unit = True
     
     def update(self, **kwargs):
         super().update()
 
 class AerialUnit(BaseUnit, ABC):
+    __slots__ = ()
+    air_unit = True
+    
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self.air_unit = True
     
     def update(self, **kwargs):
         super().update()
 
 class MechanicUnit(BaseUnit, ABC):
+    __slots__ = ("islockdown", "locktick")
+    
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.islockdown = False
@@ -175,9 +275,11 @@ class MechanicUnit(BaseUnit, ABC):
             
             if self.locktick == 0:
                 self.islockdown = False
-                print(f"{self.name}의 락다운이 해제되었습니다.")
+                _event(logging.INFO, "lockdown_end", "%(unit)s의 락다운이 해제되었습니다.", unit=self.name)
 
 class CreatureUnit(BaseUnit, ABC):
+    __slots__ = ()
+    
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
     
@@ -188,6 +290,9 @@ class CreatureUnit(BaseUnit, ABC):
         super().update()
 
 class Marine(GroundUnit, MechanicUnit):
+    __slots__ = ("gauss_dmg",)
+    ATTACK_RANGE = 5
+    
     def __init__(self, hp=100, x=0, y=0, name="Default Marine"):
         super().__init__(hp=hp, x=x, y=y, name=name)
         self.gauss_dmg = 12
@@ -197,12 +302,17 @@ class Marine(GroundUnit, MechanicUnit):
             return
         
         other.attacked(self.gauss_dmg)
-        print(f"{self.name}: 가우스 소총 발사! ({self.gauss_dmg} 피해)")
+        _event(logging.INFO, "attack", "%(unit)s: 가우스 소총 발사! (%(damage)s 피해)",
+               unit=self.name, target=other.name, damage=self.gauss_dmg)
     
     def update(self):
         super().update()
 
 class Zergling(GroundUnit, CreatureUnit):
+    __slots__ = ("claw_dmg", "regen")
+    ATTACK_RANGE = 1
+    MOVE_SPEED = 2
+    
     def __init__(self, hp=100, x=0, y=0, name="Default Zergling"):
         super().__init__(hp=hp, x=x, y=y, name=name)
         self.claw_dmg = 10
@@ -214,7 +324,13 @@ class Zergling(GroundUnit, CreatureUnit):
             return
         
         other.attacked(self.claw_dmg)
-        print(f"{self.name}: 발톱으로 할퀴기! ({self.claw_dmg} 피해)")
+        _event(logging.INFO, "attack", "%(unit)s: 발톱으로 할퀴기! (%(damage)s 피해)",
+               unit=self.name, target=other.name, damage=self.claw_dmg)
+    
+    def clone(self):
+        twin = super().clone()
+        twin.regen = self.regen.clone(owner=twin)
+        return twin
     
     def regenerate(self):
         self.regen.regenerate()
@@ -224,6 +340,9 @@ class Zergling(GroundUnit, CreatureUnit):
         self.regen.update()
 
 class Zealot(GroundUnit, MechanicUnit):
+    __slots__ = ("psionic_blade_dmg",)
+    ATTACK_RANGE = 1
+    
     def __init__(self, hp=100, x=0, y=0, name="Default Zealot"):
         super().__init__(hp=hp, x=x, y=y, name=name)
         self.psionic_blade_dmg = 20
@@ -233,17 +352,21 @@ class Zealot(GroundUnit, MechanicUnit):
             return
         
         other.attacked(self.psionic_blade_dmg)
-        print(f"{self.name}: 사이오닉 검으로 공격! ({self.psionic_blade_dmg} 피해)")
+        _event(logging.INFO, "attack", "%(unit)s: 사이오닉 검으로 공격! (%(damage)s 피해)",
+               unit=self.name, target=other.name, damage=self.psionic_blade_dmg)
     
     def update(self):
         super().update()
 
 class Ghost(GroundUnit, MechanicUnit):
+    __slots__ = ("pistol_dmg", "energy", "cloaking")
     DEFAULT_ENERGY = 50
     MAX_ENERGY = 200
     THRESHOLD = 100
     LOCKDOWN_TICKS = 3
     BASIC_AMOUNT = 25
+    ATTACK_RANGE = 6
+    LOCKDOWN_RANGE = 8
     
     def __init__(self, hp=100, x=0, y=0, name="Default Ghost"):
         super().__init__(hp=hp, x=x, y=y, name=name)
@@ -258,7 +381,14 @@ class Ghost(GroundUnit, MechanicUnit):
             return
         
         other.attacked(self.pistol_dmg)
-        print(f"{self.name}: 권총 사격! ({self.pistol_dmg} 피해)")
+        _event(logging.INFO, "attack", "%(unit)s: 권총 사격! (%(damage)s 피해)",
+               unit=self.name, target=other.name, damage=self.pistol_dmg)
+        
+    def clone(self):
+        twin = super().clone()
+        twin.energy = self.energy.clone()
+        twin.cloaking = self.cloaking.clone(owner=twin, energy_pool=twin.energy)
+        return twin
         
     def cloak(self):
         self.cloaking.cloak()
@@ -267,20 +397,23 @@ class Ghost(GroundUnit, MechanicUnit):
         self.cloaking.uncloak("수동 해제")
         
     def lockdown(self, other):
-        if not self._islockdown():
+        if not self.can_act():
             return
         
         if not isinstance(other, MechanicUnit):
-            print(f"{self.name}: 대상이 기계 유닛이 아닙니다. 락다운 불가.")
+            _event(logging.WARNING, "lockdown_invalid", "%(unit)s: 대상이 기계 유닛이 아닙니다. 락다운 불가.",
+                   unit=self.name, target=other.name)
             return
         
         if not self.energy.consume(Ghost.THRESHOLD):
-            print(f"{self.name}: 에너지가 부족합니다. ({self.energy.current}/{Ghost.THRESHOLD})")
+            _event(logging.WARNING, "lockdown_no_energy", "%(unit)s: 에너지가 부족합니다. (%(energy)s/%(cost)s)",
+                   unit=self.name, energy=self.energy.current, cost=Ghost.THRESHOLD)
             return
         
         other.islockdown = True
         other.locktick = Ghost.LOCKDOWN_TICKS
-        print(f"{self.name}: {other.name}에게 락다운 시전! ({Ghost.LOCKDOWN_TICKS}턴 지속)  남은 에너지 {self.energy.current}")
+        _event(logging.INFO, "lockdown", "%(unit)s: %(target)s에게 락다운 시전! (%(ticks)s턴 지속)  남은 에너지 %(energy)s",
+               unit=self.name, target=other.name, ticks=Ghost.LOCKDOWN_TICKS, energy=self.energy.current)
         
     def update(self):
         super().update()
@@ -288,6 +421,9 @@ class Ghost(GroundUnit, MechanicUnit):
         self.cloaking.update()
 
 class Wraith(AerialUnit, MechanicUnit):
+    __slots__ = ("laser_dmg", "energy", "cloaking")
+    ATTACK_RANGE = 5
+    MOVE_SPEED = 2
     DEFAULT_ENERGY = 60
     MAX_ENERGY = 200
     BASIC_AMOUNT = 20
@@ -305,7 +441,14 @@ class Wraith(AerialUnit, MechanicUnit):
             return
         
         other.attacked(self.laser_dmg)
-        print(f"{self.name}: 듀얼 레이저 발사! ({self.laser_dmg} 피해)")
+        _event(logging.INFO, "attack", "%(unit)s: 듀얼 레이저 발사! (%(damage)s 피해)",
+               unit=self.name, target=other.name, damage=self.laser_dmg)
+        
+    def clone(self):
+        twin = super().clone()
+        twin.energy = self.energy.clone()
+        twin.cloaking = self.cloaking.clone(owner=twin, energy_pool=twin.energy)
+        return twin
         
     def cloak(self):
         self.cloaking.cloak()
@@ -318,101 +461,605 @@ class Wraith(AerialUnit, MechanicUnit):
         self.energy.update()
         self.cloaking.update()
 
+class SpatialGrid:
+    """
+    균일 격자 공간 인덱스. 유닛을 (x, y)가 속한 칸에 보관하므로
+    반경 r 질의는 r을 덮는 칸들만 확인한다 (칸 크기를 최대 사거리로 두면 3x3칸).
+    칸 안의 유닛은 삽입 순서를 유지하므로 질의 결과 순서도 재현 가능하다.
+    """
+    def __init__(self, cell_size=8.0):
+        self.cell_size = float(cell_size)
+        self.cells = {}   # (cx, cy) -> {unit: None}
+        self.where = {}   # unit -> (cx, cy)
+        self.sum_x = 0.0  # 무게중심 계산용 좌표 합
+        self.sum_y = 0.0
+
+    def __len__(self):
+        return len(self.where)
+
+    def _key(self, x, y):
+        return (math.floor(x / self.cell_size), math.floor(y / self.cell_size))
+
+    def insert(self, unit):
+        key = self._key(unit.x, unit.y)
+        self.cells.setdefault(key, {})[unit] = None
+        self.where[unit] = key
+        self.sum_x += unit.x
+        self.sum_y += unit.y
+
+    def remove(self, unit):
+        key = self.where.pop(unit, None)
+        if key is None:
+            return
+        cell = self.cells[key]
+        del cell[unit]
+        if not cell:
+            del self.cells[key]
+        self.sum_x -= unit.x
+        self.sum_y -= unit.y
+
+    def move(self, unit, nx, ny):
+        if unit not in self.where:
+            unit.move(nx, ny)
+            return
+        self.remove(unit)
+        unit.move(nx, ny)
+        self.insert(unit)
+
+    def centroid(self):
+        n = len(self.where)
+        if n == 0:
+            return None
+        return self.sum_x / n, self.sum_y / n
+
+    def _keys_in_box(self, x0, y0, x1, y1):
+        cx0, cy0 = self._key(x0, y0)
+        cx1, cy1 = self._key(x1, y1)
+        # 빈 칸이 대부분인 넓은 범위라면 유닛이 있는 칸만 훑는다
+        if (cx1 - cx0 + 1) * (cy1 - cy0 + 1) > len(self.cells):
+            return [k for k in self.cells if cx0 <= k[0] <= cx1 and cy0 <= k[1] <= cy1]
+        return [(cx, cy) for cx in range(cx0, cx1 + 1) for cy in range(cy0, cy1 + 1)]
+
+    def query(self, x, y, radius, accept=None):
+        """(x, y)에서 radius 이내의 유닛 목록. radius가 무한대(사거리 제한 없음)이면 모든 유닛이다."""
+        if radius == math.inf:
+            # 칸 범위를 계산하지 않는다 (math.floor(inf)는 OverflowError)
+            return [u for cell in self.cells.values() for u in cell if accept is None or accept(u)]
+        r2 = radius * radius
+        found = []
+        for key in self._keys_in_box(x - radius, y - radius, x + radius, y + radius):
+            cell = self.cells.get(key)
+            if not cell:
+                continue
+            for u in cell:
+                if (u.x - x) ** 2 + (u.y - y) ** 2 <= r2 and (accept is None or accept(u)):
+                    found.append(u)
+        return found
+
+    def nearest(self, x, y, max_ring=3):
+        """
+        (x, y) 주변 max_ring칸 안에서 가장 가까운 유닛과 거리. 없으면 (None, inf).
+        탐색 범위를 제한해서 드문드문 흩어진 넓은 맵에서도 비용이 일정하다.
+        """
+        if not self.where:
+            return None, math.inf
+        cx, cy = self._key(x, y)
+        best, best_d2 = None, math.inf
+        for ring in range(max_ring + 1):
+            # ring칸 밖의 유닛은 적어도 (ring - 1) * cell_size 만큼 떨어져 있다
+            if best is not None and ((ring - 1) * self.cell_size) ** 2 > best_d2:
+                break
+            for k in self._ring_keys(cx, cy, ring):
+                for u in self.cells.get(k, ()):
+                    d2 = (u.x - x) ** 2 + (u.y - y) ** 2
+                    if d2 < best_d2:
+                        best, best_d2 = u, d2
+        return best, math.sqrt(best_d2)
+
+    @staticmethod
+    def _ring_keys(cx, cy, ring):
+        if ring == 0:
+            return [(cx, cy)]
+        keys = [(cx + dx, cy + dy) for dx in range(-ring, ring + 1) for dy in (-ring, ring)]
+        keys += [(cx + dx, cy + dy) for dx in (-ring, ring) for dy in range(-ring + 1, ring)]
+        return keys
+
+class EnemyView:
+    """
+    팀별 생존 리스트 중 자기 팀을 뺀 나머지를 하나의 시퀀스처럼 보여준다.
+    리스트를 새로 만들지 않으므로 len은 O(k), 인덱싱은 O(k) (k: 팀 수).
+    순서는 적 팀의 생존 목록을 팀 순서대로 이어 붙인 리스트와 같아서 random.choice 결과도 같다.
+    """
+    def __init__(self, alive_by_team, team_id):
+        self.alive_by_team = alive_by_team
+        self.team_id = team_id
+
+    def __len__(self):
+        return sum(len(team) for i, team in enumerate(self.alive_by_team) if i != self.team_id)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        for i, team in enumerate(self.alive_by_team):
+            if i == self.team_id:
+                continue
+            if index < len(team):
+                return team[index]
+            index -= len(team)
+        raise IndexError("EnemyView index out of range")
+
+# Game._act가 내리는 결정 코드 (리플레이 기록 단위)
+ACT_ATTACK = 0
+ACT_LOCKDOWN = 1
+ACT_CLOAK = 2
+ACT_UNCLOAK = 3
+ACT_MOVE = 4
+
 class Game:
     def __init__(self, players, max_turns=12, seed=None,
-                p_lockdown=0.35, p_cloak=0.25, p_uncloak=0.10, verbose=True):
+                p_lockdown=0.35, p_cloak=0.25, p_uncloak=0.10, verbose=True, use_ranges=False, profile=False,
+                simultaneous=False):
         """
         players: [team1_units, team2_units, ...]
         max_turns: 최대 턴 수
-        seed: 랜덤 시드 (재현용)
+        seed: 랜덤 시드 (재현용). 게임마다 독립된 random.Random을 사용한다.
         p_lockdown: 고스트가 락다운을 시도할 확률 (조건 충족 시)
         p_cloak: 유닛이 은폐를 시도할 확률 (조건 충족 시)
         p_uncloak: 은폐 중 해제를 시도할 확률
         verbose: 출력 on/off
+        use_ranges: True면 유닛 위치(x, y)와 사거리(ATTACK_RANGE)를 반영한다.
+                    사거리 안의 적만 공격하고, 없으면 가장 가까운 적에게 MOVE_SPEED만큼 다가간다.
+        profile: True면 GameProfiler를 붙여 턴마다 단계별/유닛 클래스별 시간을 재고,
+                 run()이 끝날 때 요약 표를 남긴다. 끄면 턴마다 속성 검사 한 번의 비용만 든다.
+        simultaneous: True면 한 턴을 동시에 처리한다 (use_ranges=True 필요). 모든 유닛이 턴 시작 상태를 보고
+                 결정하고, 피해/락다운/이동은 결정이 모두 끝난 뒤 적용하며, 난수는 (시드, 턴, 유닛)마다
+                 독립된 흐름을 쓴다. ShardedGame과 같은 규칙의 한 프로세스 기준 구현으로,
+                 같은 시드이면 영역 수와 관계없이 ShardedGame과 결과가 같다.
         """
+        if simultaneous and not use_ranges:
+            raise ValueError("simultaneous=True는 use_ranges=True와 함께만 쓸 수 있습니다.")
         self.players = players
         self.max_turns = max_turns
         self.p_lockdown = p_lockdown
         self.p_cloak = p_cloak
         self.p_uncloak = p_uncloak
         self.verbose = verbose
-
-        if seed is not None:
-            random.seed(seed)
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.turns_played = 0
+        self.recorder = None  # ReplayRecorder가 붙으면 매 결정을 기록한다
+        self.simultaneous = simultaneous
+        self.profiler = None  # GameProfiler가 붙으면 턴마다 단계별 시간을 잰다
 
         self.all_units = [u for team in players for u in team]
         self.unit_team = {u: i for i, team in enumerate(players) for u in team}
 
+        # 팀별 생존 유닛 목록과 목록 안의 위치. 사망 시 BaseUnit.attacked가 리스너로 O(1)에 갱신한다
+        # (마지막 유닛을 빈 자리로 옮기므로 목록 순서가 바뀐다. snapshot()은 이 순서까지 보존한다).
+        self.alive_by_team = [[u for u in team if u.is_alive()] for team in players]
+        self.alive_mech_by_team = [[u for u in team if isinstance(u, MechanicUnit)]
+                                   for team in self.alive_by_team]
+        self._index_alive()
+        self._listening = False
+        self._listen()
+
+        # 팀별 공간 인덱스 (칸 크기 = 유한한 최대 사거리)
+        self.use_ranges = use_ranges
+        self.grids = []
+        if use_ranges:
+            ranges = [r for u in self.all_units
+                      for r in (u.ATTACK_RANGE, getattr(u, "LOCKDOWN_RANGE", math.inf)) if r != math.inf]
+            cell_size = max(ranges, default=8)
+            self.grids = [SpatialGrid(cell_size) for _ in players]
+            for tid, team in enumerate(self.alive_by_team):
+                for u in team:
+                    self.grids[tid].insert(u)
+        if simultaneous:
+            if any(r == math.inf for u in self.all_units
+                   for r in (u.ATTACK_RANGE, getattr(u, "LOCKDOWN_RANGE", 0))):
+                raise ValueError("동시 처리는 사거리가 유한한 유닛만 다룰 수 있습니다.")
+            self.sight = cell_size * ShardedGame.SIGHT_CELLS
+            self.uid = {u: i for i, u in enumerate(self.all_units)}
+            # ShardedGame과 같은 방식으로 문자열/실수 시드도 64비트 정수로 바꾼다
+            self.split_seed = seed if isinstance(seed, int) else random.Random(seed).getrandbits(64)
+        if profile:
+            GameProfiler(self)
+
+    # ========== 생존 목록 ==========
+    def _index_alive(self):
+        self.alive_pos = {u: i for team in self.alive_by_team for i, u in enumerate(team)}
+        self.mech_pos = {u: i for team in self.alive_mech_by_team for i, u in enumerate(team)}
+        self.alive_teams = {i for i, team in enumerate(self.alive_by_team) if team}
+
+    @staticmethod
+    def _swap_remove(items, pos, unit):
+        i = pos.pop(unit)
+        last = items.pop()
+        if last is not unit:
+            items[i] = last
+            pos[last] = i
+
+    def _listen(self):
+        for u in self.all_units:
+            u.add_death_listener(self._on_unit_death)
+        self._listening = True
+
+    def detach(self):
+        """
+        유닛에서 사망 리스너를 떼어 낸다. run()이 끝날 때 자동으로 호출된다.
+        떼어 낸 뒤에는 생존 목록이 갱신되지 않으므로 step()을 직접 부르지 말고 resume()으로 이어 간다.
+        """
+        if self._listening:
+            for u in self.all_units:
+                u.remove_death_listener(self._on_unit_death)
+            self._listening = False
+
+    def _on_unit_death(self, unit):
+        if unit not in self.alive_pos:
+            return
+        tid = self.unit_team[unit]
+        team = self.alive_by_team[tid]
+        self._swap_remove(team, self.alive_pos, unit)
+        if unit in self.mech_pos:
+            self._swap_remove(self.alive_mech_by_team[tid], self.mech_pos, unit)
+        if not team:
+            self.alive_teams.discard(tid)
+        if self.grids:
+            self.grids[tid].remove(unit)
+
     # ========== 헬퍼 ==========
+
     def _alive_units(self):
-        return [u for u in self.all_units if u.is_alive()]
+        return [u for team in self.alive_by_team for u in team]
 
-    def _alive_enemies(self, unit):
+    def _alive_enemies(self, unit, index=None):
         tid = self.unit_team[unit]
-        return [e for e in self._alive_units() if self.unit_team[e] != tid]
+        return EnemyView(self.alive_by_team if index is None else index, tid)
 
-    def _print(self, msg):
+    def _enemies_in_range(self, unit, radius, accept=None):
+        tid = self.unit_team[unit]
+        found = []
+        for i, grid in enumerate(self.grids):
+            if i != tid:
+                found.extend(grid.query(unit.x, unit.y, radius, accept))
+        return found
+
+    def _mech_targets(self, ghost):
+        if self.use_ranges:
+            return self._enemies_in_range(ghost, Ghost.LOCKDOWN_RANGE,
+                                          lambda e: isinstance(e, MechanicUnit))
+        return self._alive_enemies(ghost, self.alive_mech_by_team)
+
+    def _approach(self, unit):
+        """근처의 가장 가까운 적에게, 근처에 적이 없으면 가장 가까운 적 팀의 무게중심으로 이동한다."""
+        tid = self.unit_team[unit]
+        target, dist, goal = None, math.inf, None
+        for i, grid in enumerate(self.grids):
+            if i != tid:
+                e, d = grid.nearest(unit.x, unit.y)
+                if d < dist:
+                    target, dist = e, d
+        if target is not None:
+            goal = (target.x, target.y)
+            # 사거리 경계에서 부동소수 오차로 멈추지 않도록 살짝 더 다가간다
+            travel = min(unit.MOVE_SPEED, dist - unit.ATTACK_RANGE + 1e-6)
+        else:
+            for i, grid in enumerate(self.grids):
+                c = grid.centroid() if i != tid else None
+                if c is not None and math.dist((unit.x, unit.y), c) < dist:
+                    goal, dist = c, math.dist((unit.x, unit.y), c)
+            travel = unit.MOVE_SPEED
+        if goal is None or dist == 0 or travel <= 0:
+            return
+        step = min(1.0, travel / dist)
+        nx = unit.x + (goal[0] - unit.x) * step
+        ny = unit.y + (goal[1] - unit.y) * step
+        self.grids[tid].move(unit, nx, ny)
+        self._print("move", "%(unit)s: (%(x).1f, %(y).1f)(으)로 이동", unit=unit.name, x=nx, y=ny)
+
+    def _print(self, event, template, /, **fields):
         if self.verbose:
-            print(msg)
+            _event(logging.INFO, event, template, **fields)
+
+    # ========== 상태 스냅샷 ==========
+    @staticmethod
+    def _unit_state(u):
+        state = (u.hp, u.x, u.y)
+        if isinstance(u, MechanicUnit):
+            state += (u.islockdown, u.locktick)
+        cloaking = getattr(u, "cloaking", None)
+        if cloaking is not None:
+            state += (u.energy.current, cloaking.is_cloaked, cloaking.remaining)
+        return state
+
+    @staticmethod
+    def _set_unit_state(u, state):
+        u.hp, u.x, u.y = state[:3]
+        if isinstance(u, MechanicUnit):
+            u.islockdown, u.locktick = state[3:5]
+        cloaking = getattr(u, "cloaking", None)
+        if cloaking is not None:
+            u.energy.current, cloaking.is_cloaked, cloaking.remaining = state[-3:]
+
+    def snapshot(self):
+        """
+        게임 진행 상태를 튜플로 떠 둔다 (유닛 객체는 all_units 순서의 인덱스로 표현).
+        생존 목록의 순서와 공간 격자의 칸 순서, 칸 안의 유닛 순서까지 보존해서 restore 후에도 결과가 같다.
+        """
+        index = {u: i for i, u in enumerate(self.all_units)}
+        grids = tuple((g.sum_x, g.sum_y,
+                       tuple((key, tuple(index[u] for u in cell)) for key, cell in g.cells.items()))
+                      for g in self.grids)
+        alive = tuple(tuple(index[u] for u in team) for team in self.alive_by_team)
+        alive_mech = tuple(tuple(index[u] for u in team) for team in self.alive_mech_by_team)
+        return (self.turns_played, self.rng.getstate(),
+                tuple(self._unit_state(u) for u in self.all_units), grids, alive, alive_mech)
+
+    def restore(self, snapshot):
+        """snapshot()으로 떠 둔 상태로 되돌린다. 유닛 객체는 그대로 두고 값만 바꾼다."""
+        self.turns_played, rng_state, unit_states, grids, alive, alive_mech = snapshot
+        self.rng.setstate(rng_state)
+        units = self.all_units
+        for u, state in zip(units, unit_states):
+            self._set_unit_state(u, state)
+        self.alive_by_team[:] = [[units[i] for i in team] for team in alive]
+        self.alive_mech_by_team[:] = [[units[i] for i in team] for team in alive_mech]
+        self._index_alive()
+        for grid, (sum_x, sum_y, cells) in zip(self.grids, grids):
+            grid.sum_x, grid.sum_y = sum_x, sum_y
+            grid.cells = {key: {self.all_units[i]: None for i in members} for key, members in cells}
+            grid.where = {u: key for key, cell in grid.cells.items() for u in cell}
+
+    def fork(self, snapshot=None, verbose=None):
+        """
+        독립된 유닛 복제본으로 이루어진 새 Game을 만든다 (what-if 분기용).
+        snapshot을 주면 그 상태에서, 없으면 현재 상태에서 갈라진다. RNG 상태도 이어받으므로
+        분기에서 아무것도 바꾸지 않으면 원래 게임과 같은 결과가 나온다.
+        copy.deepcopy와 달리 유닛 슬롯과 모듈만 복제하고, 한 스냅샷에서 여러 번 분기할 수 있다.
+        """
+        if snapshot is None:
+            snapshot = self.snapshot()
+        players = [[u.clone() for u in team] for team in self.players]
+        game = Game(players, self.max_turns, self.seed, self.p_lockdown, self.p_cloak, self.p_uncloak,
+                    self.verbose if verbose is None else verbose, self.use_ranges,
+                    simultaneous=self.simultaneous)
+        if self.simultaneous:
+            game.split_seed = self.split_seed
+        game.restore(snapshot)
+        return game
 
     # ========== 액션 결정 ==========
+    def _perform(self, u, action, target=None):
+        """결정을 실행한다. recorder가 붙어 있으면 실행 전에 기록한다."""
+        if self.recorder is not None:
+            self.recorder.add(u, action, target)
+        if action == ACT_ATTACK:
+            u.attack(target)
+        elif action == ACT_LOCKDOWN:
+            u.lockdown(target)
+        elif action == ACT_CLOAK:
+            u.cloak()
+        elif action == ACT_UNCLOAK:
+            u.uncloak()
+        else:
+            # 이동 목표는 기록하지 않는다: 같은 상태에서 다시 계산하면 같은 결과가 나온다
+            self._approach(u)
+
     def _act(self, u):
         if not u.can_act():
             return
-        enemies = self._alive_enemies(u)
-        if not enemies:
-            return
+        if self.use_ranges:
+            enemies = self._enemies_in_range(u, u.ATTACK_RANGE)
+        else:
+            enemies = self._alive_enemies(u)
 
-        # 고스트: 락다운/클로킹/공격
+        # 고스트: 락다운 (락다운 사거리가 공격 사거리보다 길어서, 공격할 적이 없어도 시전할 수 있다)
         if isinstance(u, Ghost):
-            mech_targets = [e for e in enemies if isinstance(e, MechanicUnit)]
+            mech_targets = self._mech_targets(u)
             if (u.energy.current >= Ghost.THRESHOLD and mech_targets
-                    and random.random() < self.p_lockdown):
-                target = random.choice(mech_targets)
-                u.lockdown(target)
+                    and self.rng.random() < self.p_lockdown):
+                target = self.rng.choice(mech_targets)
+                self._perform(u, ACT_LOCKDOWN, target)
                 return
 
+        if not enemies:
+            if self.use_ranges:
+                self._perform(u, ACT_MOVE)
+            return
+
+        # 고스트: 클로킹/공격
+        if isinstance(u, Ghost):
             # 클로킹 토글 혹은 공격
             if (not u.cloaking.is_cloaked
                 and u.energy.current >= u.cloaking.activation_cost
-                and random.random() < self.p_cloak):
-                u.cloak()
-            elif u.cloaking.is_cloaked and random.random() < self.p_uncloak:
-                u.uncloak()
+                and self.rng.random() < self.p_cloak):
+                self._perform(u, ACT_CLOAK)
+            elif u.cloaking.is_cloaked and self.rng.random() < self.p_uncloak:
+                self._perform(u, ACT_UNCLOAK)
             else:
-                u.attack(random.choice(enemies))
+                self._perform(u, ACT_ATTACK, self.rng.choice(enemies))
             return
 
         # 레이스: 클로킹 토글/공격
         if isinstance(u, Wraith):
             if (not u.cloaking.is_cloaked
                 and u.energy.current >= u.cloaking.activation_cost
-                and random.random() < self.p_cloak):
+                and self.rng.random() < self.p_cloak):
+                self._perform(u, ACT_CLOAK)
+            elif u.cloaking.is_cloaked and self.rng.random() < self.p_uncloak:
+                self._perform(u, ACT_UNCLOAK)
+            else:
+                self._perform(u, ACT_ATTACK, self.rng.choice(enemies))
+            return
+
+        # 그 외: 공격
+        self._perform(u, ACT_ATTACK, self.rng.choice(enemies))
+
+    # ========== 동시 처리 ==========
+    # _SplitMix, _TargetSink, _COORD_SCALE은 아래 영역 분할 엔진 절에 있다 (ShardedGame과 공유)
+    def _team_centroids(self):
+        """팀별 생존 유닛의 무게중심. ShardedGame처럼 정수화한 좌표 합으로 계산한다."""
+        centroids = []
+        for team in self.alive_by_team:
+            if not team:
+                centroids.append(None)
+                continue
+            sx = sum(round(u.x * _COORD_SCALE) for u in team)
+            sy = sum(round(u.y * _COORD_SCALE) for u in team)
+            centroids.append((sx / len(team) / _COORD_SCALE, sy / len(team) / _COORD_SCALE))
+        return centroids
+
+    def _enemies_near(self, unit, radius, accept=None):
+        found = self._enemies_in_range(unit, radius, accept)
+        found.sort(key=self.uid.__getitem__)
+        return found
+
+    def _decide(self, uid, u, turn_index, centroids, strikes, moves):
+        """RegionShard._act와 같은 규칙. 자기 자신에 대한 효과(은폐, 에너지)만 바로 반영한다."""
+        rng = _SplitMix(self.split_seed, turn_index, uid)
+        enemies = self._enemies_near(u, u.ATTACK_RANGE)
+        if isinstance(u, Ghost):
+            mech_targets = self._enemies_near(u, Ghost.LOCKDOWN_RANGE, lambda e: isinstance(e, MechanicUnit))
+            if (u.energy.current >= Ghost.THRESHOLD and mech_targets
+                    and rng.random() < self.p_lockdown):
+                self._strike(uid, u, rng.choice(mech_targets), strikes, lockdown=True)
+                return
+        if not enemies:
+            self._plan_move(uid, u, centroids, moves)
+            return
+        if isinstance(u, (Ghost, Wraith)):
+            if (not u.cloaking.is_cloaked
+                and u.energy.current >= u.cloaking.activation_cost
+                and rng.random() < self.p_cloak):
                 u.cloak()
-            elif u.cloaking.is_cloaked and random.random() < self.p_uncloak:
+            elif u.cloaking.is_cloaked and rng.random() < self.p_uncloak:
                 u.uncloak()
             else:
-                u.attack(random.choice(enemies))
+                self._strike(uid, u, rng.choice(enemies), strikes)
             return
+        self._strike(uid, u, rng.choice(enemies), strikes)
 
-        # 그 외: 공격
-        u.attack(random.choice(enemies))
+    def _strike(self, uid, u, target, strikes, lockdown=False):
+        sink = _TargetSink(target.name)
+        if lockdown:
+            u.lockdown(sink)
+        else:
+            u.attack(sink)
+        if sink.damage or sink.locktick:
+            strikes.append((self.uid[target], uid, sink.damage, sink.locktick))
+
+    def _plan_move(self, uid, u, centroids, moves):
+        """시야 안의 가장 가까운 적에게, 없으면 가장 가까운 적 팀의 무게중심으로 다가간다."""
+        best, best_d2 = None, math.inf
+        for e in self._enemies_near(u, self.sight):
+            d2 = (e.x - u.x) ** 2 + (e.y - u.y) ** 2
+            if d2 < best_d2:  # 같은 거리면 uid가 작은 쪽 (정렬되어 있음)
+                best, best_d2 = e, d2
+        if best is not None:
+            goal, dist = (best.x, best.y), math.sqrt(best_d2)
+            travel = min(u.MOVE_SPEED, dist - u.ATTACK_RANGE + 1e-6)
+        else:
+            tid = self.unit_team[u]
+            goal, dist = None, math.inf
+            for t, c in enumerate(centroids):
+                if t != tid and c is not None and math.dist((u.x, u.y), c) < dist:
+                    goal, dist = c, math.dist((u.x, u.y), c)
+            travel = u.MOVE_SPEED
+        if goal is None or dist == 0 or travel <= 0:
+            return
+        step = min(1.0, travel / dist)
+        moves[uid] = (u.x + (goal[0] - u.x) * step, u.y + (goal[1] - u.y) * step)
+
+    def _simultaneous_step(self, turn_index):
+        self._print("turn", "\n=== Turn %(turn)s ===", turn=turn_index)
+        centroids = self._team_centroids()
+        strikes, moves = [], {}
+        for uid, u in enumerate(self.all_units):
+            if u.can_act():
+                self._decide(uid, u, turn_index, centroids, strikes, moves)
+
+        # 피해/락다운은 (대상, 공격자) 순서로 적용한다
+        strikes.sort()
+        units = self.all_units
+        for target_uid, _, damage, ticks in strikes:
+            target = units[target_uid]
+            if ticks:
+                target.islockdown = True
+                target.locktick = ticks
+            if damage:
+                target.attacked(damage)
+        for uid, (nx, ny) in moves.items():
+            u = units[uid]
+            self.grids[self.unit_team[u]].move(u, nx, ny)
+        for u in units:
+            u.update()
 
     # ========== 한 턴 진행 ==========
     def step(self, turn_index):
-        self._print(f"\n=== Turn {turn_index} ===")
+        if self.simultaneous:
+            self._simultaneous_step(turn_index)
+            return
+        if self.profiler is not None:
+            self._profiled_step(turn_index)
+            return
+        self._print("turn", "\n=== Turn %(turn)s ===", turn=turn_index)
         acting = self._alive_units()
-        random.shuffle(acting)
+        self.rng.shuffle(acting)
         for u in acting:
             self._act(u)
 
         # 턴 종료 업데이트
         for u in self.all_units:
             u.update()
+        if self.recorder is not None:
+            self.recorder.end_turn(turn_index)
+
+    def _profiled_step(self, turn_index):
+        """step()과 같은 일을 하면서 단계마다 시간을 잰다. act/update는 안에서 쓴 rng/log 시간을 뺀 값이다."""
+        profile = self.profiler.begin_turn(turn_index)
+        clock = time.perf_counter
+        turn_start = clock()
+        rng = self.rng
+        self.rng = _TimedRandom(rng, profile)
+        log.handle = _timed_log_handle(profile)
+        try:
+            self._print("turn", "\n=== Turn %(turn)s ===", turn=turn_index)
+            start = clock()
+            acting = self._alive_units()
+            profile.add("alive_scan", clock() - start)
+            self.rng.shuffle(acting)
+            for u in acting:
+                nested, start = profile.nested, clock()
+                self._act(u)
+                profile.add("act", clock() - start - (profile.nested - nested), type(u).__name__)
+
+            # 턴 종료 업데이트
+            for u in self.all_units:
+                nested, start = profile.nested, clock()
+                u.update()
+                profile.add("update", clock() - start - (profile.nested - nested), type(u).__name__)
+        finally:
+            self.rng = rng
+            del log.handle
+        if self.recorder is not None:
+            start = clock()
+            self.recorder.end_turn(turn_index)
+            profile.add("record", clock() - start)
+        profile.elapsed = clock() - turn_start
+
+    def replay_step(self, turn_index, decisions):
+        """기록된 결정 [(유닛 인덱스, 결정 코드, 대상 인덱스), ...]으로 한 턴을 재현한다 (RNG 미사용)."""
+        self._print("turn", "\n=== Turn %(turn)s ===", turn=turn_index)
+        units = self.all_units
+        for ui, action, ti in decisions:
+            self._perform(units[ui], action, units[ti] if ti >= 0 else None)
+        for u in units:
+            u.update()
+        self.turns_played = turn_index
 
     # ========== 종료/승패 판정 ==========
     def _alive_team_ids(self):
-        return {self.unit_team[u] for u in self.all_units if u.is_alive()}
+        return frozenset(self.alive_teams)
 
     def is_over(self):
         alive = self._alive_team_ids()
@@ -424,6 +1071,1025 @@ class Game:
             return next(iter(alive))  # team index
         return None  # 무승부 또는 아직 진행 중
 
+    # ========== 전체 실행 ==========
+    def run(self):
+        """처음부터 끝까지 진행하고 승리 팀을 돌려준다. 끝나면 유닛에서 사망 리스너를 떼어 낸다."""
+        self.turns_played = 0
+        try:
+            return self.resume()
+        finally:
+            self.detach()
+
+    def resume(self):
+        """turns_played 다음 턴부터 끝까지 진행한다 (run()과 같지만 중간 상태에서 시작)."""
+        if not self._listening:
+            # detach() 뒤에 이어 가는 경우: 그동안 죽은 유닛을 생존 목록에서 빼고 리스너를 다시 붙인다
+            for u in self.all_units:
+                if not u.is_alive():
+                    self._on_unit_death(u)
+            self._listen()
+        for t in range(self.turns_played + 1, self.max_turns + 1):
+            if self.is_over():
+                break
+            self.step(t)
+            self.turns_played = t
+        self._print_result()
+        if self.profiler is not None:
+            _event(logging.INFO, "profile", "%(table)s", table=self.profiler.summary())
+        return self.winner()
+
+    def _print_result(self):
+        if self.is_over():
+            w = self.winner()
+            if w is None:
+                self._print("result", "\n== 전원 전멸. 무승부 ==")
+            else:
+                self._print("result", "\n== Team %(team)s 승리! ==", team=w + 1)
+        else:
+            self._print("result", "\n== 턴 제한으로 종료 ==")
+
+# ========== 프로파일링 ==========
+class TurnProfile:
+    """
+    한 턴의 단계별 (누적 초, 호출 수). by_class는 (단계, 유닛 클래스 이름)별 같은 값이다.
+    단계: alive_scan(생존 유닛 수집), act(_act, 자체 시간), rng(난수 호출), log(로그 레코드 처리/출력),
+          update(턴 종료 update, 자체 시간), record(리플레이 기록). elapsed는 턴 전체 벽시계 시간.
+    """
+    __slots__ = ("turn", "phases", "by_class", "elapsed", "nested")
+
+    def __init__(self, turn):
+        self.turn = turn
+        self.phases = {}
+        self.by_class = {}
+        self.elapsed = 0.0
+        self.nested = 0.0  # act/update 안에서 쓴 rng/log 시간 (자체 시간 계산용)
+
+    def add(self, phase, seconds, cls_name=None, calls=1):
+        entry = self.phases.get(phase)
+        if entry is None:
+            entry = self.phases[phase] = [0.0, 0]
+        entry[0] += seconds
+        entry[1] += calls
+        if cls_name is not None:
+            key = (phase, cls_name)
+            entry = self.by_class.get(key)
+            if entry is None:
+                entry = self.by_class[key] = [0.0, 0]
+            entry[0] += seconds
+            entry[1] += calls
+
+    def merge(self, other):
+        for phase, (seconds, calls) in other.phases.items():
+            self.add(phase, seconds, calls=calls)
+        for key, (seconds, calls) in other.by_class.items():
+            entry = self.by_class.setdefault(key, [0.0, 0])
+            entry[0] += seconds
+            entry[1] += calls
+        self.elapsed += other.elapsed
+
+    def __repr__(self):
+        phases = ", ".join(f"{phase}={seconds * 1e3:.3f}ms/{calls}" for phase, (seconds, calls) in self.phases.items())
+        return f"TurnProfile(turn={self.turn}, elapsed={self.elapsed * 1e3:.3f}ms, {phases})"
+
+class _TimedRandom:
+    """프로파일 중인 턴에서 Game.rng 대신 쓰이며, Game이 부르는 난수 메서드의 시간을 잰다."""
+    __slots__ = ("_rng", "_profile")
+
+    def __init__(self, rng, profile):
+        self._rng = rng
+        self._profile = profile
+
+    def _timed(self, method, *args):
+        start = time.perf_counter()
+        result = method(*args)
+        seconds = time.perf_counter() - start
+        self._profile.add("rng", seconds)
+        self._profile.nested += seconds
+        return result
+
+    def random(self):
+        return self._timed(self._rng.random)
+
+    def choice(self, seq):
+        return self._timed(self._rng.choice, seq)
+
+    def shuffle(self, seq):
+        return self._timed(self._rng.shuffle, seq)
+
+def _timed_log_handle(profile):
+    # 로거 인스턴스 속성으로 잠시 덮어써서 _event가 만든 레코드의 처리 시간을 잰다
+    handle = logging.Logger.handle.__get__(log)
+
+    def timed(record):
+        start = time.perf_counter()
+        handle(record)
+        seconds = time.perf_counter() - start
+        profile.add("log", seconds)
+        profile.nested += seconds
+    return timed
+
+class GameProfiler:
+    """
+    Game에 붙어서 턴마다 TurnProfile을 남긴다 (Game(profile=True) 또는 GameProfiler(game)).
+    turns는 턴별 프로파일 목록, totals()는 전체 합계, summary()는 요약 표 문자열이다.
+    """
+    def __init__(self, game):
+        if game.simultaneous:
+            raise ValueError("동시 처리(simultaneous) Game은 프로파일링을 지원하지 않습니다.")
+        self.game = game
+        self.turns = []
+        game.profiler = self
+
+    def begin_turn(self, turn_index):
+        profile = TurnProfile(turn_index)
+        self.turns.append(profile)
+        return profile
+
+    def detach(self):
+        self.game.profiler = None
+        return self.turns
+
+    def totals(self):
+        total = TurnProfile(None)
+        for profile in self.turns:
+            total.merge(profile)
+        return total
+
+    def summary(self):
+        total = self.totals()
+        wall = total.elapsed or 1.0
+        # 한글은 터미널에서 두 칸을 차지해 열이 어긋나므로 표 머리글은 영문으로 쓴다
+        lines = [f"== 프로파일: {len(self.turns)}턴, {total.elapsed * 1e3:.1f}ms ==",
+                 f"{'phase':<12} {'class':<10} {'calls':>9} {'total ms':>10} {'us/call':>11} {'share':>6}"]
+        for phase, (seconds, calls) in sorted(total.phases.items(), key=lambda kv: -kv[1][0]):
+            lines.append(f"{phase:<12} {'':<10} {calls:>9} {seconds * 1e3:>10.2f} "
+                         f"{seconds / calls * 1e6:>11.2f} {seconds / wall:>6.1%}")
+            rows = [(cls_name, entry) for (p, cls_name), entry in total.by_class.items() if p == phase]
+            for cls_name, (seconds, calls) in sorted(rows, key=lambda row: -row[1][0]):
+                lines.append(f"{'':<12} {cls_name:<10} {calls:>9} {seconds * 1e3:>10.2f} "
+                             f"{seconds / calls * 1e6:>11.2f} {seconds / wall:>6.1%}")
+        other = total.elapsed - sum(seconds for seconds, _ in total.phases.values())
+        lines.append(f"{'(other)':<12} {'':<10} {'':>9} {other * 1e3:>10.2f} {'':>11} {other / wall:>6.1%}")
+        return "\n".join(lines)
+
+# ========== 리플레이 ==========
+UNIT_CLASSES = {cls.__name__: cls for cls in (Marine, Zergling, Zealot, Ghost, Wraith)}
+
+class ReplayRecorder:
+    """
+    Game에 붙어서 턴마다 _act의 결정을 (유닛, 결정 코드, 대상) 정수 세 개로 기록하고,
+    snapshot_every 턴마다 상태 스냅샷을 남긴다. 기록은 replay()로 꺼낸다.
+    """
+    def __init__(self, game, snapshot_every=10):
+        if game.simultaneous:
+            raise ValueError("동시 처리(simultaneous) Game의 결정은 순서대로 재현할 수 없어 기록을 지원하지 않습니다.")
+        self.game = game
+        self.snapshot_every = snapshot_every
+        self.index = {u: i for i, u in enumerate(game.all_units)}
+        self.decisions = array("i")       # [unit, action, target] * N, target -1 = 없음
+        self.turn_ends = array("I", [0])  # turn t의 결정 = decisions[3*turn_ends[t-1]:3*turn_ends[t]]
+        self.start = game.turns_played
+        self.snapshots = {self.start: game.snapshot()}
+        game.recorder = self
+
+    def add(self, u, action, target=None):
+        self.decisions.extend((self.index[u], action, -1 if target is None else self.index[target]))
+
+    def end_turn(self, turn_index):
+        self.turn_ends.append(len(self.decisions) // 3)
+        if turn_index % self.snapshot_every == 0:
+            # step() 안에서 불리므로 게임의 turns_played는 아직 이전 턴을 가리킨다
+            self.snapshots[turn_index] = (turn_index,) + self.game.snapshot()[1:]
+
+    def detach(self):
+        self.game.recorder = None
+        return self.replay()
+
+    def replay(self):
+        game = self.game
+        roster = [[(type(u).__name__, u.max_hp, u.name) for u in team] for team in game.players]
+        config = dict(max_turns=game.max_turns, p_lockdown=game.p_lockdown, p_cloak=game.p_cloak,
+                      p_uncloak=game.p_uncloak, use_ranges=game.use_ranges)
+        return Replay(roster, config, game.seed, self.start,
+                      self.decisions, self.turn_ends, dict(self.snapshots))
+
+class Replay:
+    """
+    기록된 게임. 시드와 결정 목록, 주기적 스냅샷을 담고 있어서
+    출력 없이 빠르게 끝까지 재생하거나, 가까운 스냅샷에서 시작해 원하는 턴으로 바로 갈 수 있다.
+    """
+    MAGIC = b"SCREPLAY2"
+
+    def __init__(self, roster, config, seed, start, decisions, turn_ends, snapshots):
+        self.roster = roster          # 팀별 [(클래스 이름, 최대 HP, 이름), ...]
+        self.config = config          # Game 생성 인자
+        self.seed = seed
+        self.start = start            # 기록을 시작한 턴 (보통 0)
+        self.decisions = decisions
+        self.turn_ends = turn_ends
+        self.snapshots = snapshots
+        self._snapshot_turns = sorted(snapshots)
+
+    @classmethod
+    def record(cls, game, snapshot_every=10):
+        """game.run()을 기록하면서 실행하고 Replay를 돌려준다."""
+        recorder = ReplayRecorder(game, snapshot_every)
+        game.run()
+        return recorder.detach()
+
+    @property
+    def turns(self):
+        """기록된 마지막 턴 번호"""
+        return self.start + len(self.turn_ends) - 1
+
+    def decisions_at(self, turn):
+        i = turn - self.start
+        flat = self.decisions[3 * self.turn_ends[i - 1]:3 * self.turn_ends[i]]
+        return zip(flat[0::3], flat[1::3], flat[2::3])
+
+    def new_game(self, verbose=False):
+        players = [[UNIT_CLASSES[cls_name](hp=max_hp, name=name) for cls_name, max_hp, name in team]
+                   for team in self.roster]
+        return Game(players, seed=self.seed, verbose=verbose, **self.config)
+
+    def seek(self, turn, game=None, verbose=False):
+        """
+        turn번째 턴이 끝난 상태의 Game을 돌려준다.
+        turn 이하에서 가장 가까운 스냅샷으로 되돌린 뒤 그 이후의 결정만 다시 적용한다.
+        game을 주면 (같은 리플레이에서 만든 게임) 유닛을 새로 만들지 않고 재사용한다.
+        """
+        if not self.start <= turn <= self.turns:
+            raise ValueError(f"turn은 {self.start}..{self.turns} 범위여야 합니다: {turn}")
+        if game is None:
+            game = self.new_game(verbose)
+        base = self._snapshot_turns[bisect_right(self._snapshot_turns, turn) - 1]
+        game.restore(self.snapshots[base])
+        with contextlib.nullcontext() if verbose else quiet_logging():
+            for t in range(base + 1, turn + 1):
+                game.replay_step(t, self.decisions_at(t))
+        return game
+
+    def play(self, verbose=False):
+        """처음부터 끝까지 재생한다 (verbose=False면 출력 없이 최대 속도로)."""
+        game = self.seek(self.start, verbose=verbose)
+        with contextlib.nullcontext() if verbose else quiet_logging():
+            for t in range(self.start + 1, self.turns + 1):
+                game.replay_step(t, self.decisions_at(t))
+            game._print_result()
+        return game
+
+    # 파일 형식: MAGIC 뒤에 zlib으로 압축한 JSON 문서 하나 (숫자, 문자열, 목록만 담으므로 읽어도 코드가 실행되지 않는다)
+    def save(self, path):
+        payload = {
+            "roster": self.roster,
+            "config": self.config,
+            "seed": self.seed,
+            "start": self.start,
+            "decisions": self.decisions.tolist(),
+            "turn_ends": self.turn_ends.tolist(),
+            "snapshots": [[turn, snapshot] for turn, snapshot in self.snapshots.items()],
+        }
+        with open(path, "wb") as f:
+            f.write(self.MAGIC)
+            f.write(zlib.compress(json.dumps(payload, separators=(",", ":")).encode("utf-8")))
+
+    @staticmethod
+    def _snapshot_from_json(data):
+        """JSON 목록으로 바뀐 snapshot()을 원래의 튜플 구조로 되돌린다 (RNG 상태와 격자 키는 튜플이어야 한다)."""
+        turns_played, (version, internal, gauss_next), unit_states, grids, alive, alive_mech = data
+        return (turns_played, (version, tuple(internal), gauss_next),
+                tuple(tuple(state) for state in unit_states),
+                tuple((sum_x, sum_y, tuple((tuple(key), tuple(members)) for key, members in cells))
+                      for sum_x, sum_y, cells in grids),
+                tuple(tuple(team) for team in alive), tuple(tuple(team) for team in alive_mech))
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            if f.read(len(cls.MAGIC)) != cls.MAGIC:
+                raise ValueError(f"{path}은(는) 리플레이 파일이 아닙니다.")
+            payload = json.loads(zlib.decompress(f.read()).decode("utf-8"))
+        snapshots = {turn: cls._snapshot_from_json(snapshot) for turn, snapshot in payload["snapshots"]}
+        return cls(payload["roster"], payload["config"], payload["seed"], payload["start"],
+                   array("i", payload["decisions"]), array("I", payload["turn_ends"]), snapshots)
+
+# ========== 몬테카를로 배치 실행 ==========
+@dataclass
+class BatchResult:
+    """run_batch의 집계 결과"""
+    num_teams: int
+    games: int = 0
+    wins: list = field(default_factory=list)   # 팀별 승리 횟수
+    draws: int = 0                             # 전원 전멸
+    timeouts: int = 0                          # 턴 제한으로 종료
+    turns_total: int = 0
+    turns_min: int = 0
+    turns_max: int = 0
+
+    def __post_init__(self):
+        if not self.wins:
+            self.wins = [0] * self.num_teams
+
+    def add(self, winner, over, turns):
+        if self.games == 0:
+            self.turns_min = self.turns_max = turns
+        self.games += 1
+        self.turns_total += turns
+        self.turns_min = min(self.turns_min, turns)
+        self.turns_max = max(self.turns_max, turns)
+        if not over:
+            self.timeouts += 1
+        elif winner is None:
+            self.draws += 1
+        else:
+            self.wins[winner] += 1
+
+    @property
+    def turns_mean(self):
+        return self.turns_total / self.games if self.games else 0.0
+
+    def win_rate(self, team):
+        return self.wins[team] / self.games if self.games else 0.0
+
+def build_players(compositions):
+    """
+    compositions: [{Marine: 3, Ghost: 1}, {Zergling: 5}, ...]
+    팀 구성(유닛 클래스 -> 수)으로 새 유닛 객체를 만든다.
+    """
+    players = []
+    for team in compositions:
+        units = []
+        for cls, count in dict(team).items():
+            units.extend(cls(name=f"{cls.__name__}{k+1}") for k in range(count))
+        players.append(units)
+    return players
+
+def scatter_players(players, width, height, seed=None):
+    """모든 유닛을 width x height 맵 위의 무작위 위치에 흩어 놓는다 (거리/사거리를 쓰는 엔진용)."""
+    rng = random.Random(seed)
+    for team in players:
+        for u in team:
+            u.move(rng.uniform(0, width), rng.uniform(0, height))
+    return players
+
+def _run_single_game(compositions, seed, game_kwargs):
+    game = Game(build_players(compositions), seed=seed, verbose=False, **game_kwargs)
+    winner = game.run()
+    return winner, game.is_over(), game.turns_played
+
+def _run_seed_chunk(compositions, seeds, game_kwargs):
+    return [_run_single_game(compositions, seed, game_kwargs) for seed in seeds]
+
+def run_batch(compositions, seeds, workers=None, **game_kwargs):
+    """
+    같은 팀 구성으로 seeds 개수만큼 게임을 돌려 승/무/턴 통계를 낸다.
+    게임마다 자신의 seed로 만든 RNG를 쓰므로 실행 순서, 프로세스 배치와 무관하게 재현된다.
+
+    compositions: build_players 참고
+    seeds: 시드 목록 (정수 N을 주면 range(N))
+    workers: 프로세스 수 (None이면 CPU 수, 1이면 현재 프로세스에서 실행)
+    game_kwargs: Game에 그대로 넘길 인자 (max_turns, p_lockdown 등)
+    """
+    if isinstance(seeds, int):
+        seeds = range(seeds)
+    seeds = list(seeds)
+    workers = workers or os.cpu_count() or 1
+    result = BatchResult(num_teams=len(compositions))
+
+    if workers == 1:
+        with quiet_logging():
+            outcomes = _run_seed_chunk(compositions, seeds, game_kwargs)
+    else:
+        # 프로세스 간 통신 횟수를 줄이기 위해 시드를 묶어서 보낸다
+        chunk = max(1, len(seeds) // (workers * 8))
+        chunks = [seeds[i:i + chunk] for i in range(0, len(seeds), chunk)]
+        with ProcessPoolExecutor(max_workers=workers, initializer=silence_logging) as pool:
+            futures = [pool.submit(_run_seed_chunk, compositions, c, game_kwargs) for c in chunks]
+            outcomes = [o for f in futures for o in f.result()]
+
+    for winner, over, turns in outcomes:
+        result.add(winner, over, turns)
+    return result
+
+# ========== 영역 분할(멀티 프로세스) 전투 엔진 ==========
+_MASK64 = (1 << 64) - 1
+# 팀 무게중심용 좌표 합은 이 배율로 정수화해서 더한다. 실수 합은 더하는 순서(영역 분할)에 따라 끝자리가 달라진다.
+_COORD_SCALE = 1 << 20
+
+class _SplitMix:
+    """
+    (시드, 턴, 유닛)마다 새로 만드는 작은 난수 생성기 (splitmix64).
+    어느 영역(프로세스)에서 결정하든 같은 유닛은 같은 난수를 받는다.
+    random.Random은 만드는 데만 수 us가 들어 유닛마다 턴마다 만들기에는 무겁다.
+    """
+    __slots__ = ("state",)
+
+    def __init__(self, seed, turn, uid):
+        self.state = (seed * 0x9E3779B97F4A7C15 + turn * 0xBF58476D1CE4E5B9 + uid * 0x94D049BB133111EB) & _MASK64
+
+    def _next(self):
+        self.state = z = (self.state + 0x9E3779B97F4A7C15) & _MASK64
+        z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+        z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK64
+        return z ^ (z >> 31)
+
+    def random(self):
+        return (self._next() >> 11) * (1.0 / (1 << 53))
+
+    def choice(self, seq):
+        return seq[(self._next() * len(seq)) >> 64]
+
+class _Entry:
+    """영역의 공간 격자에 넣는 유닛 요약. 자기 영역 유닛이면 unit에 객체가, 이웃 영역 유닛이면 None이 들어간다."""
+    __slots__ = ("uid", "x", "y", "team", "mech", "name", "unit")
+
+    def __init__(self, uid, x, y, team, mech, name, unit=None):
+        self.uid = uid
+        self.x = x
+        self.y = y
+        self.team = team
+        self.mech = mech
+        self.name = name
+        self.unit = unit
+
+class _TargetSink(MechanicUnit):
+    """
+    결정 단계에서 공격/락다운 대상 대신 넘기는 객체. attack()/lockdown()의 규칙(행동 가능 여부, 에너지 소모,
+    피해량)은 유닛 코드를 그대로 따르고, 대상에 대한 효과는 바로 적용하지 않고 기록만 한다.
+    """
+    __slots__ = ("damage",)
+
+    def __init__(self, name):
+        self.name = name
+        self.hp = 1
+        self.damage = 0
+        self.islockdown = False
+        self.locktick = 0
+
+    def attacked(self, dmg):
+        self.damage += dmg
+
+    def attack(self, other):
+        pass
+
+class RegionShard:
+    """
+    맵의 x 구간 하나에 있는 유닛을 소유하고 한 턴을 두 단계로 처리한다.
+      decide:  턴 시작 상태(자기 유닛 + 이웃 영역의 경계 유닛)만 보고 소유 유닛의 행동을 정한다.
+               은폐/에너지처럼 자기 자신에 대한 효과는 바로 반영하고, 이동은 모아 두며,
+               피해/락다운은 (대상 uid, 대상 x, 공격자 uid, 피해, 락다운 턴)으로 남긴다.
+               대상이 다른 영역 소유이면 돌려줘서 조정자가 소유 영역으로 보낸다.
+      resolve: 들어온 피해/락다운을 (대상, 공격자) 순서로 적용하고 이동과 update()를 한 뒤,
+               경계 근처 유닛 요약, 팀별 통계, 영역을 벗어난 유닛(이주)을 돌려준다.
+    """
+    def __init__(self, index, edges, teams, seed, halo, sight, cell_size,
+                 p_lockdown, p_cloak, p_uncloak):
+        self.index = index
+        self.edges = edges      # 영역 사이 경계 x 좌표 (영역 i = [edges[i-1], edges[i]))
+        self.lo = edges[index - 1] if index > 0 else -math.inf
+        self.hi = edges[index] if index < len(edges) else math.inf
+        self.teams = teams      # uid -> 팀
+        self.num_teams = max(teams) + 1
+        self.seed = seed
+        self.halo = halo
+        self.sight = sight
+        self.cell_size = cell_size
+        self.p_lockdown = p_lockdown
+        self.p_cloak = p_cloak
+        self.p_uncloak = p_uncloak
+        self.units = {}         # uid -> 유닛
+        self.grids = []
+        self._order = []
+        self._moves = {}
+        self._local_actions = []
+
+    def region_of(self, x):
+        return bisect_right(self.edges, x)
+
+    def add_units(self, units):
+        for uid, unit in units:
+            self.units[uid] = unit
+
+    def all_units(self):
+        return list(self.units.items())
+
+    # ---- 결정 ----
+    def decide(self, turn, halo, centroids, migrants):
+        self.add_units(migrants)
+        teams = self.teams
+        self.grids = grids = [SpatialGrid(self.cell_size) for _ in range(self.num_teams)]
+        for uid, unit in self.units.items():
+            if unit.is_alive():
+                grids[teams[uid]].insert(_Entry(uid, unit.x, unit.y, teams[uid],
+                                                isinstance(unit, MechanicUnit), unit.name, unit))
+        for uid, x, y, team, mech, name in halo:
+            grids[team].insert(_Entry(uid, x, y, team, mech, name))
+
+        outgoing = []
+        self._order = sorted(self.units)
+        for uid in self._order:
+            unit = self.units[uid]
+            if unit.can_act():
+                self._act(uid, unit, turn, centroids, outgoing)
+        return outgoing
+
+    def _enemies_near(self, u, team, radius, mech_only=False):
+        found = []
+        for t, grid in enumerate(self.grids):
+            if t != team:
+                found.extend(grid.query(u.x, u.y, radius, (lambda e: e.mech) if mech_only else None))
+        found.sort(key=lambda e: e.uid)
+        return found
+
+    def _act(self, uid, u, turn, centroids, outgoing):
+        rng = _SplitMix(self.seed, turn, uid)
+        team = self.teams[uid]
+        enemies = self._enemies_near(u, team, u.ATTACK_RANGE)
+
+        # 고스트: 락다운/클로킹/공격, 레이스: 클로킹/공격 (Game._act와 같은 분기와 확률)
+        # 락다운 사거리는 공격 사거리보다 길어서, 공격할 적이 없어도 먼저 락다운 대상을 확인한다
+        if isinstance(u, Ghost):
+            mech_targets = self._enemies_near(u, team, Ghost.LOCKDOWN_RANGE, mech_only=True)
+            if (u.energy.current >= Ghost.THRESHOLD and mech_targets
+                    and rng.random() < self.p_lockdown):
+                self._strike(uid, u, rng.choice(mech_targets), outgoing, lockdown=True)
+                return
+        if not enemies:
+            self._plan_move(uid, u, team, centroids)
+            return
+        if isinstance(u, (Ghost, Wraith)):
+            if (not u.cloaking.is_cloaked
+                and u.energy.current >= u.cloaking.activation_cost
+                and rng.random() < self.p_cloak):
+                u.cloak()
+            elif u.cloaking.is_cloaked and rng.random() < self.p_uncloak:
+                u.uncloak()
+            else:
+                self._strike(uid, u, rng.choice(enemies), outgoing)
+            return
+
+        self._strike(uid, u, rng.choice(enemies), outgoing)
+
+    def _strike(self, uid, u, target, outgoing, lockdown=False):
+        sink = _TargetSink(target.name)
+        if lockdown:
+            u.lockdown(sink)
+        else:
+            u.attack(sink)
+        if sink.damage or sink.locktick:
+            action = (target.uid, target.x, uid, sink.damage, sink.locktick)
+            if target.unit is not None:
+                self._local_actions.append(action)
+            else:
+                outgoing.append(action)
+
+    def _plan_move(self, uid, u, team, centroids):
+        """시야(sight) 안의 가장 가까운 적에게, 없으면 가장 가까운 적 팀의 무게중심으로 다가간다."""
+        best, best_d2 = None, math.inf
+        for e in self._enemies_near(u, team, self.sight):
+            d2 = (e.x - u.x) ** 2 + (e.y - u.y) ** 2
+            if d2 < best_d2:  # 같은 거리면 uid가 작은 쪽 (정렬되어 있음)
+                best, best_d2 = e, d2
+        if best is not None:
+            goal, dist = (best.x, best.y), math.sqrt(best_d2)
+            travel = min(u.MOVE_SPEED, dist - u.ATTACK_RANGE + 1e-6)
+        else:
+            goal, dist = None, math.inf
+            for t, c in enumerate(centroids):
+                if t != team and c is not None and math.dist((u.x, u.y), c) < dist:
+                    goal, dist = c, math.dist((u.x, u.y), c)
+            travel = u.MOVE_SPEED
+        if goal is None or dist == 0 or travel <= 0:
+            return
+        step = min(1.0, travel / dist)
+        self._moves[uid] = (u.x + (goal[0] - u.x) * step, u.y + (goal[1] - u.y) * step)
+
+    # ---- 적용 ----
+    def resolve(self, actions):
+        incoming = self._local_actions + actions
+        self._local_actions = []
+        incoming.sort(key=lambda a: (a[0], a[2]))
+        units = self.units
+        for target_uid, _, _, damage, ticks in incoming:
+            target = units[target_uid]
+            if ticks:
+                target.islockdown = True
+                target.locktick = ticks
+            if damage:
+                target.attacked(damage)
+        for uid, (nx, ny) in self._moves.items():
+            units[uid].move(nx, ny)
+        self._moves = {}
+        for uid in self._order:
+            units[uid].update()
+
+        # 요약은 이주할 유닛까지 포함해서 만든다 (영역 밖 좌표이므로 경계 유닛으로 들어간다)
+        summary = self.summary()
+        migrants = [(uid, u) for uid, u in units.items() if not self.lo <= u.x < self.hi]
+        for uid, _ in migrants:
+            del units[uid]
+        return summary, migrants
+
+    def summary(self):
+        """(경계 유닛 요약 목록, 팀별 [생존 수, 정수화한 x 합, y 합])"""
+        border = []
+        stats = [[0, 0, 0] for _ in range(self.num_teams)]
+        lo, hi = self.lo + self.halo, self.hi - self.halo
+        for uid, u in self.units.items():
+            if not u.is_alive():
+                continue
+            team = self.teams[uid]
+            entry = stats[team]
+            entry[0] += 1
+            entry[1] += round(u.x * _COORD_SCALE)
+            entry[2] += round(u.y * _COORD_SCALE)
+            if u.x < lo or u.x >= hi:
+                border.append((uid, u.x, u.y, team, isinstance(u, MechanicUnit), u.name))
+        return border, stats
+
+def _region_worker(conn, shard):
+    silence_logging()
+    while True:
+        method, args = conn.recv()
+        if method is None:
+            break
+        conn.send(getattr(shard, method)(*args))
+    conn.close()
+
+class ShardedGame:
+    """
+    맵을 x 좌표로 regions개의 띠 영역으로 나누고, 영역마다 RegionShard 하나가 자기 유닛을 처리하는 전투 엔진.
+    processes=True이면 영역마다 워커 프로세스를 띄우고, 턴마다 두 번(결정 -> 피해 적용)
+    모든 영역이 끝나기를 기다린 뒤 다음 단계로 넘어간다 (lockstep). 프로세스 사이에는
+    경계 근처 유닛 요약, 다른 영역을 향한 피해/락다운, 영역을 옮긴 유닛만 오간다.
+
+    규칙은 Game(use_ranges=True, simultaneous=True)와 같다. 병렬로 나눌 수 있도록 한 턴을 동시에 처리하므로
+    (턴 시작 상태로 결정, 결정이 모두 끝난 뒤 피해/락다운/이동 적용, (시드, 턴, 유닛)별 난수)
+    Game의 기본 순차 처리와는 결과가 다르다. 같은 시드이면 영역 수와 processes 값에 관계없이
+    Game(simultaneous=True)와 결과가 같고, benchmarks/sharded_game.py가 이를 확인한다.
+    입력 유닛은 바꾸지 않고 복사본(clone)으로 진행하며, run()이 끝나면 players/all_units에 최종 상태의 복사본이 들어 있다.
+
+    성능 주의: 턴마다 두 번 모든 영역을 기다리고 경계 유닛 요약과 이주 유닛을 직렬화해서 주고받는다.
+    영역당 유닛이 적거나 코어가 부족하면 이 비용이 병렬 이득보다 커서 Game보다 느리다
+    (2000 유닛에서는 regions=2도 Game보다 느렸다). 큰 맵에서 코어 수만큼의 영역으로 쓰고, 쓰기 전에 측정할 것.
+    """
+    SIGHT_CELLS = 3  # 사거리 밖 적을 찾는 시야 = 칸 크기(최대 사거리) x 3, Game의 SpatialGrid.nearest와 같은 범위
+
+    def __init__(self, players, regions=4, max_turns=12, seed=None,
+                 p_lockdown=0.35, p_cloak=0.25, p_uncloak=0.10, verbose=False, processes=True):
+        # 사망 리스너를 떼어 내고 워커로 보내야 하므로 호출자의 유닛 대신 복사본을 쓴다
+        self.players = [[u.clone() for u in team] for team in players]
+        self.max_turns = max_turns
+        self.verbose = verbose
+        self.turns_played = 0
+        self.all_units = [u for team in self.players for u in team]
+        self.teams = [i for i, team in enumerate(self.players) for _ in team]
+        ranges = [r for u in self.all_units for r in (u.ATTACK_RANGE, getattr(u, "LOCKDOWN_RANGE", 0))]
+        if any(r == math.inf for r in ranges):
+            raise ValueError("ShardedGame은 사거리가 유한한 유닛만 다룰 수 있습니다.")
+        cell_size = max(ranges, default=8)
+        self.sight = cell_size * self.SIGHT_CELLS
+        self.halo = self.sight  # 이웃 영역에서 이만큼 안쪽의 유닛까지 보여준다 (모든 사거리와 시야 포함)
+        # 문자열/실수 시드도 받을 수 있도록 64비트 정수로 바꾼다
+        self.seed = seed if isinstance(seed, int) else random.Random(seed).getrandbits(64)
+
+        # 처음 배치의 x 분위수로 경계를 정해 영역마다 유닛 수를 비슷하게 맞춘다
+        xs = sorted(u.x for u in self.all_units)
+        self.edges = [xs[len(xs) * i // regions] for i in range(1, regions)] if xs else []
+        self.shards = [RegionShard(i, self.edges, self.teams, self.seed, self.halo, self.sight, cell_size,
+                                   p_lockdown, p_cloak, p_uncloak) for i in range(regions)]
+        for uid, u in enumerate(self.all_units):
+            self.shards[bisect_right(self.edges, u.x)].add_units([(uid, u)])
+        summaries = [shard.summary() for shard in self.shards]
+        self._borders = [border for border, _ in summaries]
+        self._stats = self._merge_stats(stats for _, stats in summaries)
+        self._migrants = [[] for _ in self.shards]
+
+        self._conns = []
+        self._procs = []
+        if processes and regions > 1:
+            for shard in self.shards:
+                parent, child = multiprocessing.Pipe()
+                proc = multiprocessing.Process(target=_region_worker, args=(child, shard), daemon=True)
+                proc.start()
+                child.close()
+                self._conns.append(parent)
+                self._procs.append(proc)
+
+    def _call_all(self, method, args_per_shard):
+        if not self._conns:
+            return [getattr(shard, method)(*args) for shard, args in zip(self.shards, args_per_shard)]
+        for conn, args in zip(self._conns, args_per_shard):
+            conn.send((method, args))
+        return [conn.recv() for conn in self._conns]
+
+    def _merge_stats(self, per_shard):
+        totals = [[0, 0, 0] for _ in range(max(self.teams, default=-1) + 1)]
+        for stats in per_shard:
+            for total, (count, sx, sy) in zip(totals, stats):
+                total[0] += count
+                total[1] += sx
+                total[2] += sy
+        return totals
+
+    def _halo_for(self, index):
+        # 좌표가 이 영역 안이면 (이주해 오는 유닛 포함) 자기 유닛이고, 밖이면 (이 영역에서 떠난 유닛 포함) 이웃이다
+        shard = self.shards[index]
+        lo, hi = shard.lo - self.halo, shard.hi + self.halo
+        return [entry for border in self._borders
+                for entry in border if lo <= entry[1] <= hi and not shard.lo <= entry[1] < shard.hi]
+
+    # ========== 한 턴 진행 ==========
+    def step(self, turn_index):
+        centroids = [(sx / count / _COORD_SCALE, sy / count / _COORD_SCALE) if count else None
+                     for count, sx, sy in self._stats]
+        migrants, self._migrants = self._migrants, [[] for _ in self.shards]
+        outgoing = self._call_all("decide", [(turn_index, self._halo_for(i), centroids, migrants[i])
+                                             for i in range(len(self.shards))])
+        routed = [[] for _ in self.shards]
+        for actions in outgoing:
+            for action in actions:
+                routed[bisect_right(self.edges, action[1])].append(action)
+
+        results = self._call_all("resolve", [(actions,) for actions in routed])
+        self._borders = [border for (border, _), _ in results]
+        self._stats = self._merge_stats(stats for (_, stats), _ in results)
+        for _, moved in results:
+            for uid, u in moved:
+                self._migrants[bisect_right(self.edges, u.x)].append((uid, u))
+
+    # ========== 종료/승패 판정 ==========
+    def alive_teams(self):
+        return {i for i, (count, _, _) in enumerate(self._stats) if count}
+
+    def is_over(self):
+        return len(self.alive_teams()) <= 1
+
+    def winner(self):
+        alive = self.alive_teams()
+        return next(iter(alive)) if len(alive) == 1 else None
+
+    # ========== 전체 실행 ==========
+    def run(self):
+        try:
+            with contextlib.nullcontext() if self.verbose else quiet_logging():
+                for t in range(self.turns_played + 1, self.max_turns + 1):
+                    if self.is_over():
+                        break
+                    self.step(t)
+                    self.turns_played = t
+            self._collect()
+        finally:
+            self.close()
+        return self.winner()
+
+    def _collect(self):
+        units = dict(uid_unit for moved in self._migrants for uid_unit in moved)
+        for shard_units in self._call_all("all_units", [()] * len(self.shards)):
+            units.update(shard_units)
+        self.all_units = [units[uid] for uid in range(len(self.teams))]
+        sizes = [len(team) for team in self.players]
+        it = iter(self.all_units)
+        self.players = [[next(it) for _ in range(size)] for size in sizes]
+
+    def close(self):
+        """워커 프로세스를 정리한다. run()이 끝날 때 자동으로 호출된다."""
+        for conn in self._conns:
+            conn.send((None, None))
+            conn.close()
+        for proc in self._procs:
+            proc.join()
+        self._conns, self._procs = [], []
+
+# ========== 벡터화(SoA) 전투 엔진 ==========
+# 유닛 종류 코드: _act의 분기(고스트 / 레이스 / 그 외)와 동일하게 나눈다.
+KIND_PLAIN = 0
+KIND_GHOST = 1
+KIND_WRAITH = 2
+
+# 유닛 클래스별 공격력 속성 이름
+DAMAGE_ATTRS = {
+    Marine: "gauss_dmg",
+    Zergling: "claw_dmg",
+    Zealot: "psionic_blade_dmg",
+    Ghost: "pistol_dmg",
+    Wraith: "laser_dmg",
+}
+
+def unit_damage(unit):
+    for cls in type(unit).__mro__:
+        if cls in DAMAGE_ATTRS:
+            return getattr(unit, DAMAGE_ATTRS[cls])
+    raise TypeError(f"{type(unit).__name__}: 공격력 속성을 알 수 없는 유닛입니다.")
+
+class VectorizedGame:
+    def __init__(self, players, max_turns=12, seed=None,
+                 p_lockdown=0.35, p_cloak=0.25, p_uncloak=0.10, verbose=True, waves=None):
+        """
+        Game과 같은 규칙을 유닛 객체 대신 NumPy 배열(struct-of-arrays)로 처리하는 엔진.
+
+        players ~ verbose: Game과 동일
+        waves: 한 턴의 행동 순서를 나누는 구간 수. None(기본)이면 유닛마다 한 구간이라 Game과 같은 순차 처리가 된다.
+               값을 주면 같은 구간의 행동은 동시에 처리되고, 구간이 끝날 때마다 사망/락다운이 반영된다.
+               구간이 적을수록 빠르지만 같은 구간 안에서는 그 구간에 죽은 유닛도 공격하므로 Game과 결과가 달라진다.
+        """
+        if np is None:
+            raise ImportError("VectorizedGame을 사용하려면 numpy가 필요합니다.")
+
+        self.players = players
+        self.max_turns = max_turns
+        self.p_lockdown = p_lockdown
+        self.p_cloak = p_cloak
+        self.p_uncloak = p_uncloak
+        self.verbose = verbose
+        self.waves = None if waves is None else max(1, waves)
+        self.rng = np.random.default_rng(None if seed is None else int(seed))
+
+        self.all_units = [u for team in players for u in team]
+        self.num_teams = len(players)
+        self._load(self.all_units)
+
+    # ========== 객체 <-> 배열 변환 ==========
+    def _load(self, units):
+        self.team = np.array([i for i, team in enumerate(self.players) for _ in team], dtype=np.int32)
+        self.hp = np.array([u.hp for u in units], dtype=np.int64)
+        self.max_hp = np.array([u.max_hp for u in units], dtype=np.int64)
+        self.x = np.array([u.x for u in units], dtype=np.float64)
+        self.y = np.array([u.y for u in units], dtype=np.float64)
+        self.damage = np.array([unit_damage(u) for u in units], dtype=np.int64)
+        self.kind = np.array([KIND_GHOST if isinstance(u, Ghost) else
+                              KIND_WRAITH if isinstance(u, Wraith) else KIND_PLAIN
+                              for u in units], dtype=np.int8)
+
+        # MechanicUnit: 락다운
+        self.is_mech = np.array([isinstance(u, MechanicUnit) for u in units], dtype=bool)
+        self.locked = np.array([getattr(u, "islockdown", False) for u in units], dtype=bool)
+        self.locktick = np.array([getattr(u, "locktick", 0) for u in units], dtype=np.int64)
+
+        # RegenerationModule
+        self.regen = np.array([u.regen.amount if hasattr(u, "regen") else 0 for u in units], dtype=np.int64)
+
+        # EnergyPool
+        pools = [getattr(u, "energy", None) for u in units]
+        self.energy = np.array([p.current if p else 0 for p in pools], dtype=np.int64)
+        self.energy_max = np.array([p.maximum if p else 0 for p in pools], dtype=np.int64)
+        self.energy_basic = np.array([p.basic_amount if p else 0 for p in pools], dtype=np.int64)
+
+        # CloakModule
+        cloaks = [getattr(u, "cloaking", None) for u in units]
+        self.has_cloak = np.array([c is not None for c in cloaks], dtype=bool)
+        self.cloaked = np.array([c.is_cloaked if c else False for c in cloaks], dtype=bool)
+        self.cloak_remaining = np.array([c.remaining if c else 0 for c in cloaks], dtype=np.int64)
+        self.cloak_cost = np.array([c.activation_cost if c else 0 for c in cloaks], dtype=np.int64)
+        self.cloak_drain = np.array([c.drain_per_turn if c else 0 for c in cloaks], dtype=np.int64)
+        self.cloak_duration = np.array([c.base_duration if c else 0 for c in cloaks], dtype=np.int64)
+
+        self.alive = self.hp > 0
+
+    def sync_units(self):
+        """배열 상태를 원래 유닛 객체에 되돌려 쓴다."""
+        for i, u in enumerate(self.all_units):
+            u.hp = int(self.hp[i])
+            if self.is_mech[i]:
+                u.islockdown = bool(self.locked[i])
+                u.locktick = int(self.locktick[i])
+            if self.energy_max[i]:
+                u.energy.current = int(self.energy[i])
+            if self.has_cloak[i]:
+                u.cloaking.is_cloaked = bool(self.cloaked[i])
+                u.cloaking.remaining = int(self.cloak_remaining[i])
+
+    # ========== 헬퍼 ==========
+    def _print(self, event, template, /, **fields):
+        if self.verbose:
+            _event(logging.INFO, event, template, **fields)
+
+    def _can_act(self, idx):
+        return self.alive[idx] & ~self.locked[idx]
+
+    def _pick_enemies(self, actors, pool):
+        """
+        actors 각각에 대해 pool(팀 순서로 정렬된 살아있는 유닛 인덱스) 중
+        다른 팀 유닛 하나를 균등하게 고른다. 적이 없는 행동자는 -1.
+        """
+        counts = np.bincount(self.team[pool], minlength=self.num_teams)
+        starts = np.cumsum(counts) - counts
+        t = self.team[actors]
+        n_enemy = len(pool) - counts[t]
+        r = (self.rng.random(len(actors)) * n_enemy).astype(np.int64)
+        # 자기 팀 구간을 건너뛴다
+        r += (r >= starts[t]) * counts[t]
+        picked = np.full(len(actors), -1, dtype=np.int64)
+        ok = n_enemy > 0
+        picked[ok] = pool[r[ok]]
+        return picked
+
+    # ========== 액션 결정 (구간 단위 일괄 처리) ==========
+    def _act_wave(self, actors):
+        actors = actors[self._can_act(actors)]
+        if len(actors) == 0:
+            return
+
+        targets = self._pick_enemies(actors, np.flatnonzero(self.alive))
+        has_enemy = targets >= 0
+        actors, targets = actors[has_enemy], targets[has_enemy]
+        if len(actors) == 0:
+            return
+
+        kind = self.kind[actors]
+        energy = self.energy[actors]
+        roll = self.rng.random((3, len(actors)))
+
+        # 고스트: 락다운
+        mech_targets = self._pick_enemies(actors, np.flatnonzero(self.alive & self.is_mech))
+        do_lock = ((kind == KIND_GHOST) & (energy >= Ghost.THRESHOLD)
+                   & (mech_targets >= 0) & (roll[0] < self.p_lockdown))
+
+        # 고스트/레이스: 클로킹 토글
+        cloaker = ((kind == KIND_GHOST) | (kind == KIND_WRAITH)) & ~do_lock
+        cloaked = self.cloaked[actors]
+        do_cloak = cloaker & ~cloaked & (energy >= self.cloak_cost[actors]) & (roll[1] < self.p_cloak)
+        do_uncloak = cloaker & cloaked & (roll[2] < self.p_uncloak)
+
+        do_attack = ~(do_lock | do_cloak | do_uncloak)
+
+        # 공격: 같은 구간의 피해를 합산해 한 번에 반영
+        hit = np.zeros(len(self.hp), dtype=np.int64)
+        np.add.at(hit, targets[do_attack], self.damage[actors[do_attack]])
+        self.hp = np.maximum(self.hp - hit, 0)
+
+        casters = actors[do_lock]
+        self.energy[casters] -= Ghost.THRESHOLD
+        locked = mech_targets[do_lock]
+        self.locked[locked] = True
+        self.locktick[locked] = Ghost.LOCKDOWN_TICKS
+
+        cloakers = actors[do_cloak]
+        self.energy[cloakers] -= self.cloak_cost[cloakers]
+        self.cloaked[cloakers] = True
+        self.cloak_remaining[cloakers] = self.cloak_duration[cloakers]
+
+        uncloakers = actors[do_uncloak]
+        self.cloaked[uncloakers] = False
+        self.cloak_remaining[uncloakers] = 0
+
+        self.alive = self.hp > 0
+
+    # ========== 턴 종료 업데이트 ==========
+    def _update(self):
+        # MechanicUnit.update: 락다운 틱 감소
+        ticking = self.locktick > 0
+        self.locktick[ticking] -= 1
+        self.locked[ticking & (self.locktick == 0)] = False
+
+        # RegenerationModule.update
+        healing = (self.regen > 0) & self._can_act(slice(None))
+        self.hp[healing] = np.minimum(self.max_hp[healing], self.hp[healing] + self.regen[healing])
+
+        # EnergyPool.update
+        charging = self.energy_basic > 0
+        self.energy[charging] = np.minimum(self.energy_max[charging],
+                                           self.energy[charging] + self.energy_basic[charging])
+
+        # CloakModule.update
+        cloaked = self.cloaked.copy()
+        self.cloak_remaining[cloaked & (self.cloak_remaining > 0)] -= 1
+        drain = self.cloak_drain
+        starving = cloaked & (drain > 0) & (self.energy < drain)
+        paying = cloaked & ~starving & (drain > 0)
+        self.energy[paying] -= drain[paying]
+        expired = cloaked & (starving | (self.cloak_remaining == 0))
+        self.cloaked[expired] = False
+        self.cloak_remaining[expired] = 0
+
+    # ========== 한 턴 진행 ==========
+    def step(self, turn_index):
+        acting = self.rng.permutation(np.flatnonzero(self.alive))
+        sections = len(acting) if self.waves is None else min(self.waves, len(acting))
+        for wave in np.array_split(acting, max(1, sections)):
+            self._act_wave(wave)
+
+        self._update()
+
+        if self.verbose:
+            counts = np.bincount(self.team[self.alive], minlength=self.num_teams)
+            alive = ", ".join(f"Team {i+1}: {c}" for i, c in enumerate(counts))
+            self._print("turn", "=== Turn %(turn)s === 생존 유닛 %(alive)s", turn=turn_index, alive=alive)
+
+    # ========== 종료/승패 판정 ==========
+    def _alive_team_ids(self):
+        return set(np.unique(self.team[self.alive]).tolist())
+
+    def is_over(self):
+        alive = self._alive_team_ids()
+        return len(alive) <= 1
+
+    def winner(self):
+        alive = self._alive_team_ids()
+        if len(alive) == 1:
+            return next(iter(alive))
+        return None
+
     # ========== 전체 실행 ==========
     def run(self):
         for t in range(1, self.max_turns + 1):
@@ -434,11 +2100,11 @@ class Game:
         if self.is_over():
             w = self.winner()
             if w is None:
-                self._print("\n== 전원 전멸. 무승부 ==")
+                self._print("result", "\n== 전원 전멸. 무승부 ==")
             else:
-                self._print(f"\n== Team {w+1} 승리! ==")
+                self._print("result", "\n== Team %(team)s 승리! ==", team=w + 1)
         else:
-            self._print("\n== 턴 제한으로 종료 ==")
+            self._print("result", "\n== 턴 제한으로 종료 ==")
 
 if __name__ == "__main__":
     player1 = [Marine(100, 0, 0, "Marine1"),
@@ -458,6 +2124,7 @@ if __name__ == "__main__":
 
     players = [player1, player2, player3, player4]
 
+    configure_logging()
     game = Game(players, max_turns=50, seed=time.time(),
                 p_lockdown=0.35, p_cloak=0.25, p_uncloak=0.10, verbose=True)
 
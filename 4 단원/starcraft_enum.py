@@ -1,13 +1,34 @@
 # 필요한 모듈 임포트
 from dataclasses import dataclass
 from abc import ABC, abstractmethod
-import time
-import threading
+import collections
+import functools
+import importlib.util
+import logging
+import os
+import sys
 from enum import Enum, auto
 
+# 공용 패키지(starcraft_common)는 저장소 최상위에 있다. 단원 폴더에서 직접 실행해 루트가 import 경로에
+# 없으면 sys.path를 바꾸지 않고 파일 위치로 불러와 등록한다.
+if importlib.util.find_spec("starcraft_common") is None:
+    _spec = importlib.util.spec_from_file_location(
+        "starcraft_common",
+        os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "starcraft_common", "__init__.py"))
+    sys.modules[_spec.name] = importlib.util.module_from_spec(_spec)
+    _spec.loader.exec_module(sys.modules[_spec.name])
+from starcraft_common.log import configure_logging, log_event, quiet_logging
+from starcraft_common.runtime import (Clock, EffectExpiryService, RealClock, TickScheduler, VirtualClock,
+                                      effect_service_of, gc_paused)
+
+# --- 로깅: 모든 시뮬레이터 모듈이 공유하는 "starcraft" 로거 (starcraft_common.log 참고) ---
+log = logging.getLogger("starcraft.enum")
+_event = functools.partial(log_event, log)
+
 def log_ability_usage(func):
     def wrapper(self, *args, **kwargs):
-        print(f"{self.name}이(가) {func.__name__} 스킬 사용을 시도합니다.")
+        _event(logging.INFO, "ability", "%(unit)s이(가) %(ability)s 스킬 사용을 시도합니다.",
+               unit=self.name, ability=func.__name__)
         return func(self, *args, **kwargs)
     return wrapper
 
@@ -70,9 +91,10 @@ class Unit(ABC):
         """유닛을 새로운 위치로 이동시킵니다."""
         if not self.is_alive or self.is_lockdown:
             status = "파괴되어" if not self.is_alive else "락다운 상태라"
-            print(f"{self.name}은(는) {status} 이동할 수 없습니다.")
+            _event(logging.WARNING, "move_blocked", "%(unit)s은(는) %(status)s 이동할 수 없습니다.",
+                   unit=self.name, status=status)
             return
-        print(f"{self.name}이(가) ({x}, {y}) 위치로 이동합니다.")
+        _event(logging.INFO, "move", "%(unit)s이(가) (%(x)s, %(y)s) 위치로 이동합니다.", unit=self.name, x=x, y=y)
 
     @property
     def hp(self):
@@ -92,16 +114,20 @@ class Unit(ABC):
         """유닛의 HP를 주어진 양만큼 감소시킵니다."""
         if not self.is_alive: return
         self._hp = max(0, self._hp - amount)
-        print(f"{self.name}이(가) {amount}의 데미지를 입었습니다. (남은 HP: {self._hp}/{self.max_hp})")
+        _event(logging.INFO, "damage", "%(unit)s이(가) %(amount)s의 데미지를 입었습니다. (남은 HP: %(hp)s/%(max_hp)s)",
+               unit=self.name, amount=amount, hp=self._hp, max_hp=self.max_hp)
         if self._hp <= 0:
             self.is_alive = False
-            print(f"*** {self.name}이(가) 파괴되었습니다. ***")
+            _event(logging.INFO, "death", "*** %(unit)s이(가) 파괴되었습니다. ***", unit=self.name)
+            # 사망한 유닛에 걸린 효과 만료 예약은 더 이상 필요 없다
+            effect_service_of(self).cancel_owner(self)
 
     def attack(self, target):
         """대상 유닛에 대한 공격을 시작합니다."""
         if not self.is_alive or self.is_lockdown:
             status = "파괴되어" if not self.is_alive else "락다운 상태라"
-            print(f"{self.name}은(는) {status} 공격할 수 없습니다.")
+            _event(logging.WARNING, "attack_blocked", "%(unit)s은(는) %(status)s 공격할 수 없습니다.",
+                   unit=self.name, status=status)
             return
 
         if target.is_alive:
@@ -129,59 +155,62 @@ class CloakableMixin:
         if hasattr(self, 'energy') and self.energy >= cost:
             self.energy -= cost
             self.is_cloaked = True
-            print(f"{self.name}이(가) 클로킹을 사용합니다. ({duration}초 지속, 남은 에너지: {self.energy})")
+            _event(logging.INFO, "cloak", "%(unit)s이(가) 클로킹을 사용합니다. (%(duration)s초 지속, 남은 에너지: %(energy)s)",
+                   unit=self.name, duration=duration, energy=self.energy)
             # 지속 시간이 지나면 클로킹 해제
-            threading.Timer(duration, self.uncloak).start()
+            effect_service_of(self).schedule(duration, self.uncloak, owner=self, kind="cloak")
         else:
-            print(f"{self.name}의 에너지가 부족하여 클로킹을 사용할 수 없습니다.")
+            _event(logging.WARNING, "cloak_no_energy", "%(unit)s의 에너지가 부족하여 클로킹을 사용할 수 없습니다.",
+                   unit=self.name)
 
     def uncloak(self):
         """클로킹 효과를 비활성화합니다."""
         if hasattr(self, 'is_cloaked') and self.is_cloaked:
+            effect_service_of(self).cancel_effect(self, "cloak")
             self.is_cloaked = False
-            print(f">>> {self.name}의 클로킹 효과가 해제되었습니다. <<<")
+            _event(logging.INFO, "uncloak", ">>> %(unit)s의 클로킹 효과가 해제되었습니다. <<<", unit=self.name)
 
 class RegeneratableMixin:
     """매초 자동으로 HP를 회복하는 능력을 제공하는 믹스인 클래스입니다."""
-    def _start_regeneration_process(self):
-        """별도의 스레드에서 재생 루프를 시작합니다."""
-        threading.Thread(target=self._regenerate_loop, daemon=True).start()
-
-    def _regenerate_loop(self):
-        """유닛이 살아있는 동안 지속적으로 HP를 재생합니다."""
-        while self.is_alive:
-            time.sleep(1)
-            if self.is_alive and self.hp < self.max_hp:
-                regen_rate = GameConfig.ZERGLING_HP_REGEN_RATE
-                self.hp = min(self.max_hp, self.hp + regen_rate)
-                print(f"[재생] {self.name}의 HP가 회복됩니다. (현재 HP: {self.hp}/{self.max_hp})")
+    def _start_regeneration_process(self, scheduler):
+        """틱 스케줄러에 HP 재생 작업을 등록합니다."""
+        scheduler.register(self, self._regenerate_once)
+
+    def _regenerate_once(self):
+        """한 틱 분량의 HP를 재생합니다."""
+        if self.is_alive and self.hp < self.max_hp:
+            regen_rate = GameConfig.ZERGLING_HP_REGEN_RATE
+            self.hp = min(self.max_hp, self.hp + regen_rate)
+            _event(logging.INFO, "regen", "[재생] %(unit)s의 HP가 회복됩니다. (현재 HP: %(hp)s/%(max_hp)s)",
+                   unit=self.name, hp=self.hp, max_hp=self.max_hp)
 
 class EnergyRegeneratableMixin:
     """매초 자동으로 에너지를 회복하는 능력을 제공하는 믹스인 클래스입니다."""
-    def _start_energy_regeneration_process(self):
-        """별도의 스레드에서 에너지 재생 루프를 시작합니다."""
-        threading.Thread(target=self._energy_regenerate_loop, daemon=True).start()
-
-    def _energy_regenerate_loop(self):
-        """유닛이 살아있는 동안 지속적으로 에너지를 재생합니다."""
-        while self.is_alive:
-            time.sleep(1)
-            if self.is_alive and hasattr(self, 'energy') and self.energy < self.max_energy:
-                regen_rate = GameConfig.GHOST_ENERGY_REGEN_RATE
-                self.energy = min(self.max_energy, self.energy + regen_rate)
-                print(f"[에너지 회복] {self.name}의 에너지가 회복됩니다. (현재 에너지: {self.energy}/{self.max_energy})")
-
+    def _start_energy_regeneration_process(self, scheduler):
+        """틱 스케줄러에 에너지 재생 작업을 등록합니다."""
+        scheduler.register(self, self._energy_regenerate_once)
+
+    def _energy_regenerate_once(self):
+        """한 틱 분량의 에너지를 재생합니다."""
+        if self.is_alive and hasattr(self, 'energy') and self.energy < self.max_energy:
+            regen_rate = GameConfig.GHOST_ENERGY_REGEN_RATE
+            self.energy = min(self.max_energy, self.energy + regen_rate)
+            _event(logging.INFO, "energy_regen", "[에너지 회복] %(unit)s의 에너지가 회복됩니다. (현재 에너지: %(energy)s/%(max_energy)s)",
+                   unit=self.name, energy=self.energy, max_energy=self.max_energy)
 
 # --- 종족별 유닛 구현 ---
 class Marine(Unit):
     """테란 마린 유닛을 나타냅니다."""
-    def __init__(self, name="마린", hp=GameConfig.MARINE_HP, power=GameConfig.MARINE_POWER):
+    DEFAULT_NAME = "마린"
+
+    def __init__(self, name=DEFAULT_NAME, hp=GameConfig.MARINE_HP, power=GameConfig.MARINE_POWER):
         super().__init__(name, hp, power)
 
     def _do_attack(self, target):
-        print(f"{self.name}이(가) {target.name}을(를) 가우스 소총으로 공격!")
+        _event(logging.INFO, "attack", "%(unit)s이(가) %(target)s을(를) 가우스 소총으로 공격!",
+               unit=self.name, target=target.name)
         target.take_damage(self.power)
-        print(BattleLog(attacker_name=self.name, target_name=target.name, damage=self.power))
+        _log_hit(self.name, target.name, self.power)
     
     @classmethod
     def create_elite_marine(self):
@@ -189,28 +218,32 @@ class Marine(Unit):
 
 class Zergling(Unit, RegeneratableMixin):
     """재생 능력을 가진 저그 저글링 유닛을 나타냅니다."""
-    def __init__(self, name="저글링", hp=GameConfig.ZERGLING_HP, power=GameConfig.ZERGLING_POWER):
+    DEFAULT_NAME = "저글링"
+
+    def __init__(self, name=DEFAULT_NAME, hp=GameConfig.ZERGLING_HP, power=GameConfig.ZERGLING_POWER):
         super().__init__(name, hp, power)
-        self._start_regeneration_process() # 생성 시 HP 회복 시작
 
     def _do_attack(self, target):
-        print(f"{self.name}이(가) {target.name}을(를) 발톱으로 공격!")
+        _event(logging.INFO, "attack", "%(unit)s이(가) %(target)s을(를) 발톱으로 공격!",
+               unit=self.name, target=target.name)
         target.take_damage(self.power)
-        print(BattleLog(attacker_name=self.name, target_name=target.name, damage=self.power))
+        _log_hit(self.name, target.name, self.power)
 
 class Ghost(Unit, CloakableMixin, EnergyRegeneratableMixin):
     """클로킹 및 락다운 능력을 가진 테란 고스트 유닛을 나타냅니다."""
-    def __init__(self, name="고스트", hp=GameConfig.GHOST_HP, power=GameConfig.GHOST_POWER):
+    DEFAULT_NAME = "고스트"
+
+    def __init__(self, name=DEFAULT_NAME, hp=GameConfig.GHOST_HP, power=GameConfig.GHOST_POWER):
         super().__init__(name, hp, power)
         self.max_energy = GameConfig.GHOST_MAX_ENERGY
         self.energy = GameConfig.GHOST_START_ENERGY
         self.is_cloaked = False
-        self._start_energy_regeneration_process() # 생성 시 에너지 회복 시작
 
     def _do_attack(self, target):
-        print(f"{self.name}이(가) {target.name}을(를) C-10 저격소총으로 공격!")
+        _event(logging.INFO, "attack", "%(unit)s이(가) %(target)s을(를) C-10 저격소총으로 공격!",
+               unit=self.name, target=target.name)
         target.take_damage(self.power)
-        print(BattleLog(attacker_name=self.name, target_name=target.name, damage=self.power))
+        _log_hit(self.name, target.name, self.power)
 
     @log_ability_usage
     def lockdown(self, target, duration=GameConfig.LOCKDOWN_DURATION):
@@ -220,31 +253,46 @@ class Ghost(Unit, CloakableMixin, EnergyRegeneratableMixin):
         if self.energy >= cost:
             self.energy -= cost
             target.is_lockdown = True
-            print(f"{self.name}이(가) {target.name}에게 락다운을 시전합니다! ({duration}초 지속)")
+            _event(logging.INFO, "lockdown", "%(unit)s이(가) %(target)s에게 락다운을 시전합니다! (%(duration)s초 지속)",
+                   unit=self.name, target=target.name, duration=duration)
 
             def release_lockdown():
                 if target.is_alive:
                     target.is_lockdown = False
-                    print(f">>> {target.name}의 락다운 효과가 해제되었습니다. <<<")
+                    _event(logging.INFO, "lockdown_end", ">>> %(unit)s의 락다운 효과가 해제되었습니다. <<<", unit=target.name)
 
-            # 지속 시간이 지나면 락다운 해제
-            threading.Timer(duration, release_lockdown).start()
+            # 지속 시간이 지나면 락다운 해제 (재시전 시 이전 예약은 취소된다)
+            effect_service_of(self).schedule(duration, release_lockdown, owner=target, kind="lockdown")
         else:
-            print(f"{self.name}의 에너지가 부족하여 락다운을 사용할 수 없습니다.")
+            _event(logging.WARNING, "lockdown_no_energy", "%(unit)s의 에너지가 부족하여 락다운을 사용할 수 없습니다.",
+                   unit=self.name)
 
 # --- 유닛 생성 팩토리 클래스 ---
 class UnitFactory:
     """다양한 종류의 유닛을 생성하기 위한 팩토리 클래스입니다."""
+    UNIT_CLASSES = {
+        UnitType.MARINE: Marine,
+        UnitType.ZERGLING: Zergling,
+        UnitType.GHOST: Ghost,
+    }
+
+    def unit_class(self, unit_type: UnitType):
+        """유닛 타입에 해당하는 클래스를 반환합니다."""
+        cls = self.UNIT_CLASSES.get(unit_type)
+        if cls is None:
+            raise ValueError(f"'{unit_type}'은(는) 생성할 수 없는 유닛 타입입니다.")
+        return cls
+
     def create_unit(self, unit_type: UnitType, name: str, **kwargs):
         """주어진 타입에 따라 유닛 인스턴스를 생성하고 반환합니다."""
-        if unit_type == UnitType.MARINE:
-            return Marine(name=name, **kwargs)
-        elif unit_type == UnitType.ZERGLING:
-            return Zergling(name=name, **kwargs)
-        elif unit_type == UnitType.GHOST:
-            return Ghost(name=name, **kwargs)
-        else:
-            raise ValueError(f"'{unit_type}'은(는) 생성할 수 없는 유닛 타입입니다.")
+        return self.unit_class(unit_type)(name=name, **kwargs)
+
+    def create_units(self, unit_type: UnitType, count: int, name: str = None, **overrides):
+        """같은 타입의 유닛 count개를 한 번에 생성합니다. 이름은 name(없으면 클래스의 DEFAULT_NAME) 뒤에 1부터 번호를 붙입니다."""
+        cls = self.unit_class(unit_type)
+        if name is None:
+            name = cls.DEFAULT_NAME
+        return [cls(f"{name}{i}", **overrides) for i in range(1, count + 1)]
 
 @dataclass(frozen=True)
 class BattleLog:
@@ -252,86 +300,141 @@ class BattleLog:
     target_name: str
     damage: int
 
+def _scenario_header(title):
+    _event(logging.INFO, "scenario", "\n%(rule)s\n%(title)s\n%(rule)s", rule="="*30, title=title)
+
+def _log_hit(attacker_name, target_name, damage):
+    # BattleLog의 repr과 같은 모양으로 남기되, 로그가 꺼져 있으면 객체도 만들지 않는다
+    _event(logging.INFO, "hit", "BattleLog(attacker_name=%(attacker)r, target_name=%(target)r, damage=%(damage)r)",
+           attacker=attacker_name, target=target_name, damage=damage)
+
 # --- 게임 관리 클래스 ---
 class GameManager:
     """전체 게임 상태, 유닛 생성, 시나리오를 관리합니다."""
-    def __init__(self):
+    def __init__(self, clock: Clock = None):
         self.units = []
         self.unit_factory = UnitFactory()
+        # VirtualClock을 주입하면 시나리오 대기, 재생, 스킬 만료가 모두 가상 시간으로 진행됩니다
+        self.clock = clock or RealClock()
+        self.scheduler = TickScheduler(clock=self.clock)  # 모든 유닛의 재생을 담당하는 단일 스레드
+        self.effects = EffectExpiryService(clock=self.clock)  # 클로킹/락다운 만료를 담당하는 단일 스레드
 
     def create_unit(self, unit_type: UnitType, name: str, *args, **kwargs):
         """팩토리를 사용하여 유닛을 생성하고 게임에 추가합니다."""
         try:
             unit = self.unit_factory.create_unit(unit_type, name, *args, **kwargs)
             if unit:
+                unit.effect_service = self.effects
+                if isinstance(unit, RegeneratableMixin):
+                    unit._start_regeneration_process(self.scheduler)
+                if isinstance(unit, EnergyRegeneratableMixin):
+                    unit._start_energy_regeneration_process(self.scheduler)
                 self.units.append(unit)
-                print(f"--- {name}({unit.__class__.__name__}) 생성 완료 ---")
+                _event(logging.INFO, "unit_created", "--- %(unit)s(%(cls)s) 생성 완료 ---",
+                       unit=name, cls=unit.__class__.__name__)
             return unit
         except ValueError as e:
-            print(e)
+            _event(logging.WARNING, "create_failed", "%(error)s", error=e)
             return None
 
+    def create_units(self, unit_type: UnitType, count: int, name: str = None, **overrides):
+        """
+        같은 타입의 유닛 count개를 한 번에 생성해 게임에 추가합니다.
+        재생 작업은 스케줄러에 한 번에 등록하고, 생성 메시지도 요약 한 줄만 출력합니다.
+        """
+        with gc_paused():
+            try:
+                units = self.unit_factory.create_units(unit_type, count, name, **overrides)
+            except ValueError as e:
+                _event(logging.WARNING, "create_failed", "%(error)s", error=e)
+                return []
+            regen = []
+            for unit in units:
+                unit.effect_service = self.effects
+                if isinstance(unit, RegeneratableMixin):
+                    regen.append((unit, unit._regenerate_once))
+                if isinstance(unit, EnergyRegeneratableMixin):
+                    regen.append((unit, unit._energy_regenerate_once))
+            if regen:
+                self.scheduler.register_many(regen)
+            self.units.extend(units)
+        if units:
+            counts = collections.Counter(unit.__class__.__name__ for unit in units)
+            summary = ", ".join(f"{cls_name} {n}기" for cls_name, n in counts.items())
+            _event(logging.INFO, "units_created", "--- %(summary)s 생성 완료 (%(first)s ~ %(last)s) ---",
+                   summary=summary, first=units[0].name, last=units[-1].name)
+        return units
+
+    def shutdown(self):
+        """백그라운드 스케줄러와 효과 만료 서비스를 정지합니다."""
+        self.scheduler.stop()
+        self.effects.stop()
+
     def remove_dead_units(self):
         """파괴된 모든 유닛을 활성 유닛 목록에서 제거합니다."""
         self.units = [unit for unit in self.units if unit.is_alive]
 
-    def run_scenario(self):
-        """유닛 상호작용을 보여주기 위해 미리 정의된 게임 시나리오를 실행합니다."""
+    def scenario_steps(self):
+        """유닛 상호작용을 보여주기 위해 미리 정의된 게임 시나리오를 실행하며, 대기 시간(초)을 yield 합니다."""
         # 1단계: 시나리오를 위한 유닛 생성 (사용자 지정 능력치 적용)
         marine = self.create_unit(UnitType.MARINE, "용감한 마린", hp=GameConfig.SCENARIO_MARINE_HP)
         marine = Marine.create_elite_marine()
         ghost = self.create_unit(UnitType.GHOST, "숙련된 고스트", hp=GameConfig.SCENARIO_GHOST_HP)
         zergling = self.create_unit(UnitType.ZERGLING, "날렵한 저글링")
 
-        print("\n" + "="*30)
-        print("### 시나리오 1: 고스트의 락다운과 에너지 회복 ###")
-        print("="*30)
+        _scenario_header("### 시나리오 1: 고스트의 락다운과 에너지 회복 ###")
 
         # 2단계: 고스트가 마린에게 락다운 사용
         ghost.lockdown(marine, duration=4)
-        time.sleep(1)
+        yield 1
 
         # 3단계: 마린이 락다운 상태에서 공격 시도
         marine.attack(ghost)
-        time.sleep(1)
+        yield 1
 
         # 4단계: 고스트가 클로킹 사용
         ghost.cloak(duration=5)
 
         # 5단계: 락다운이 해제되기를 기다린 후, 마린이 다시 공격
-        print("\n락다운이 해제되기를 기다립니다...")
-        time.sleep(4)
+        _event(logging.INFO, "wait", "\n락다운이 해제되기를 기다립니다...")
+        yield 4
         marine.attack(ghost)
 
         # 6단계: 고스트의 에너지가 회복되기를 기다린 후, 다시 락다운 사용
-        print("\n고스트 에너지가 회복되기를 기다립니다 (5초)...")
-        time.sleep(5)
+        _event(logging.INFO, "wait", "\n고스트 에너지가 회복되기를 기다립니다 (5초)...")
+        yield 5
         ghost.lockdown(marine, duration=2)
 
-        print("\n" + "="*30)
-        print("### 시나리오 2: 저글링의 전투와 자동 회복 ###")
-        print("="*30)
+        _scenario_header("### 시나리오 2: 저글링의 전투와 자동 회복 ###")
 
         # 7단계: 마린과 저글링의 초기 교전
         marine.attack(zergling)
         zergling.attack(marine)
 
         # 8단계: 저글링의 자동 HP 회복을 보여주기 위해 대기
-        print("\n저글링이 자동 회복하는 동안 대기합니다 (4초)...")
-        time.sleep(4)
+        _event(logging.INFO, "wait", "\n저글링이 자동 회복하는 동안 대기합니다 (4초)...")
+        yield 4
 
         # 9단계: 마린이 저글링이 파괴될 때까지 계속 공격
         while zergling.is_alive:
             if not marine.is_lockdown:
                 marine.attack(zergling)
-            time.sleep(0.5)
+            yield 0.5
 
         # 10단계: 파괴된 유닛을 정리하고 최종 상태 보고
         self.remove_dead_units()
-        print(f"\n시나리오 종료 후 생존 유닛: {[unit.name for unit in self.units]}")
+        _event(logging.INFO, "survivors", "\n시나리오 종료 후 생존 유닛: %(units)s",
+               units=[unit.name for unit in self.units])
+
+    def run_scenario(self):
+        """시나리오를 주입된 시계의 시간에 맞춰 실행합니다."""
+        for delay in self.scenario_steps():
+            self.clock.sleep(delay)
 
 # --- 시뮬레이션 실행 코드 ---
 if __name__ == "__main__":
+    configure_logging()
     game_manager = GameManager()
     game_manager.run_scenario()
+    game_manager.shutdown()
 
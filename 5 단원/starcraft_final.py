@@ -1,9 +1,43 @@
 # 필요한 모듈 임포트
 from abc import ABC, abstractmethod
-import time
+import asyncio
+import collections
+import functools
+import importlib.util
+import logging
+import math
+import mmap
+import os
+import random
+import struct
+import sys
 import threading
+import weakref
 from enum import Enum, auto
 from dataclasses import dataclass
+from typing import Optional
+
+try:
+    import numpy as np
+except ImportError:  # BattleJournal.records(), predict_battle()에서만 필요
+    np = None
+
+# 공용 패키지(starcraft_common)는 저장소 최상위에 있다. 단원 폴더에서 직접 실행해 루트가 import 경로에
+# 없으면 sys.path를 바꾸지 않고 파일 위치로 불러와 등록한다.
+if importlib.util.find_spec("starcraft_common") is None:
+    _spec = importlib.util.spec_from_file_location(
+        "starcraft_common",
+        os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "starcraft_common", "__init__.py"))
+    sys.modules[_spec.name] = importlib.util.module_from_spec(_spec)
+    _spec.loader.exec_module(sys.modules[_spec.name])
+from starcraft_common.log import configure_logging, ensure_console_output, log_event, quiet_logging, root_log
+from starcraft_common.runtime import (Clock, EffectExpiryService, EffectHandle, RealClock, TickScheduler,
+                                      VirtualClock, effect_service_of, gc_paused)
+
+# --- 로깅: 모든 시뮬레이터 모듈이 공유하는 "starcraft" 로거 (starcraft_common.log 참고) ---
+# 유닛/전략 코드는 BattleReporter.event로 구조화된 이벤트를 남기고,
+# ConsoleReporter/LoggingReporter는 그 이벤트를 이 로거로 넘긴다 (event 속성 = 이벤트 이름, args = 필드 dict).
+log = logging.getLogger("starcraft.final")
 
 # --- 미션 5: 전투 기록 표준화 (@dataclass 활용) ---
 @dataclass(frozen=True)
@@ -13,11 +47,160 @@ class BattleLog:
     target_name: str
     damage: int
 
+class BattleJournal:
+    """
+    BattleLog를 고정 길이 바이너리 레코드로 쌓는 추가 전용(append-only) 저널.
+    유닛 이름은 정수 id로 인터닝되어 '<경로>.names' 파일에 따로 저장되고,
+    레코드 영역은 메모리 매핑된 파일이라 NumPy 구조체 배열로 복사 없이 읽을 수 있다.
+
+    파일 형식: 헤더(매직 8바이트 + 레코드 수 uint64) 뒤에
+    (attacker id uint32, target id uint32, damage int32) 레코드가 이어진다.
+    이름 파일은 (바이트 길이 uint32 + UTF-8 이름) 항목의 나열이고, 새 이름은 그 이름을 쓰는 레코드보다
+    먼저 덧붙여 쓰므로 도중에 프로세스가 죽어도 레코드가 가리키는 이름은 항상 남아 있다.
+    """
+    MAGIC = b"BTLJRNL1"
+    HEADER = struct.Struct("<8sQ")
+    RECORD = struct.Struct("<IIi")
+    NAME_LENGTH = struct.Struct("<I")
+    RECORD_DTYPE = [("attacker", "<u4"), ("target", "<u4"), ("damage", "<i4")]
+
+    def __init__(self, path: str, initial_capacity: int = 4096):
+        self.path = path
+        self.names = []  # id -> 이름
+        self._ids = {}   # 이름 -> id
+        self._lock = threading.Lock()
+        exists = os.path.exists(path) and os.path.getsize(path) >= self.HEADER.size
+        self._file = open(path, "r+b" if exists else "w+b")
+        if exists:
+            magic, self.count = self.HEADER.unpack(self._file.read(self.HEADER.size))
+            if magic != self.MAGIC:
+                self._file.close()
+                raise ValueError(f"{path}은(는) BattleJournal 파일이 아닙니다.")
+            self._load_names()
+        else:
+            self.count = 0
+        self._names_file = open(self._names_path, "ab" if exists else "wb")
+        self._retired = []  # 늘리기 전의 매핑 중 records() 배열이 아직 참조하고 있어 닫지 못한 것
+        self._mm = None
+        size = max(os.path.getsize(path), self._offset(max(initial_capacity, 1)))
+        self._map(size)
+        self.HEADER.pack_into(self._mm, 0, self.MAGIC, self.count)
+
+    @property
+    def _names_path(self):
+        return self.path + ".names"
+
+    def _offset(self, index):
+        return self.HEADER.size + index * self.RECORD.size
+
+    def _load_names(self):
+        if not os.path.exists(self._names_path):
+            return
+        with open(self._names_path, "rb") as f:
+            data = f.read()
+        offset = 0
+        while offset + self.NAME_LENGTH.size <= len(data):
+            (length,) = self.NAME_LENGTH.unpack_from(data, offset)
+            start = offset + self.NAME_LENGTH.size
+            if start + length > len(data):
+                break  # 쓰다 만 마지막 항목은 버린다 (그 이름을 쓰는 레코드는 기록되지 않았다)
+            name = data[start:start + length].decode("utf-8")
+            self._ids[name] = len(self.names)
+            self.names.append(name)
+            offset = start + length
+
+    def _map(self, size):
+        self._file.truncate(size)
+        old = self._mm
+        self._mm = mmap.mmap(self._file.fileno(), size)
+        self.capacity = (size - self.HEADER.size) // self.RECORD.size
+        if old is not None:
+            self._release(old)
+
+    def _release(self, mm):
+        try:
+            mm.close()
+        except BufferError:
+            # records()로 내준 배열이 아직 이 매핑을 보고 있다: 배열이 사라진 뒤 close()에서 다시 닫는다
+            self._retired.append(mm)
+
+    def _intern(self, name: str) -> int:
+        name_id = self._ids.get(name)
+        if name_id is None:
+            encoded = name.encode("utf-8")
+            self._names_file.write(self.NAME_LENGTH.pack(len(encoded)) + encoded)
+            self._names_file.flush()
+            name_id = self._ids[name] = len(self.names)
+            self.names.append(name)
+        return name_id
+
+    def append(self, log: BattleLog) -> None:
+        self.record(log.attacker_name, log.target_name, log.damage)
+
+    def record(self, attacker_name: str, target_name: str, damage: int) -> None:
+        """BattleLog 객체를 만들지 않고 바로 한 건을 기록한다."""
+        with self._lock:
+            if self.count == self.capacity:
+                self._map(self._offset(self.capacity * 2))
+            self.RECORD.pack_into(self._mm, self._offset(self.count),
+                                  self._intern(attacker_name), self._intern(target_name), damage)
+            self.count += 1
+            self.HEADER.pack_into(self._mm, 0, self.MAGIC, self.count)
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        view = memoryview(self._mm)[self.HEADER.size:self._offset(self.count)]
+        for attacker, target, damage in self.RECORD.iter_unpack(view):
+            yield BattleLog(self.names[attacker], self.names[target], damage)
+
+    def records(self):
+        """기록된 레코드를 복사 없이 NumPy 구조체 배열로 돌려준다 (mmap 뷰)."""
+        if np is None:
+            raise ImportError("BattleJournal.records()를 사용하려면 numpy가 필요합니다.")
+        return np.frombuffer(self._mm, dtype=self.RECORD_DTYPE,
+                             count=self.count, offset=self.HEADER.size)
+
+    def damage_by_attacker(self) -> dict:
+        """공격자 이름별 누적 데미지. 텍스트를 파싱하지 않고 레코드에서 바로 합산한다."""
+        if np is not None:
+            records = self.records()
+            totals = np.bincount(records["attacker"], weights=records["damage"],
+                                 minlength=len(self.names))
+            return {self.names[i]: int(total) for i, total in enumerate(totals) if total}
+        totals = {}
+        view = memoryview(self._mm)[self.HEADER.size:self._offset(self.count)]
+        for attacker, _, damage in self.RECORD.iter_unpack(view):
+            totals[attacker] = totals.get(attacker, 0) + damage
+        return {self.names[i]: total for i, total in totals.items() if total}
+
+    def flush(self) -> None:
+        with self._lock:
+            self._mm.flush()
+            self._names_file.flush()
+            os.fsync(self._names_file.fileno())
+
+    def close(self) -> None:
+        """파일과 매핑을 모두 닫는다. records()로 받은 배열이 남아 있으면 그 매핑은 배열이 사라질 때 닫힌다."""
+        if self._file.closed:
+            return
+        self.flush()
+        retired, self._retired = self._retired, []
+        for mm in retired + [self._mm]:
+            try:
+                mm.close()
+            except BufferError:
+                pass
+        self._names_file.close()
+        self._file.close()
+
 # --- 미션 4: 특수 능력 사용 기록기 개발 (커스텀 데코레이터 활용) ---
 def log_ability_usage(func):
     """스킬 사용 시 로그를 출력하는 데코레이터"""
     def wrapper(self, *args, **kwargs):
-        print(f"-> {self.name}이(가) '{func.__name__}' 스킬 사용을 시도합니다.")
+        self.reporter.event(logging.INFO, "ability", "-> %(unit)s이(가) '%(ability)s' 스킬 사용을 시도합니다.",
+                            unit=self.name, ability=func.__name__)
         return func(self, *args, **kwargs)
     return wrapper
 
@@ -62,19 +245,213 @@ class UnitType(Enum):
     ZERGLING = auto()
     GHOST = auto()
 
+# --------------------------------------------------------------------
+# 이벤트 버스: 유닛 -> 구독자 알림 (옵저버 패턴의 타입 지정/일괄 전달 버전)
+# --------------------------------------------------------------------
+class EventType(Enum):
+    DEATH = auto()            # data: None
+    DAMAGE = auto()           # data: 받은 피해량
+    ABILITY_CAST = auto()     # data: 스킬 이름
+    STRATEGY_CHANGE = auto()  # data: 새 AttackStrategy
+
+@dataclass(frozen=True)
+class GameEvent:
+    type: EventType
+    unit: object
+    data: object = None
+
+class EventBus:
+    """
+    이벤트 종류별 구독자 목록을 관리한다. 구독자는 이벤트 리스트를 한 번에 받는다.
+    batched=True이면 이벤트를 큐에 모아 두었다가 flush() 때 종류별로 한 번씩 전달한다.
+    구독자가 없는 종류의 이벤트는 만들지도 않는다.
+    """
+    def __init__(self, batched: bool = False):
+        self.batched = batched
+        self._subscribers = {event_type: [] for event_type in EventType}
+        self._queues = {event_type: [] for event_type in EventType}
+
+    def subscribe(self, event_type: EventType, handler) -> None:
+        self._subscribers[event_type].append(handler)
+
+    def unsubscribe(self, event_type: EventType, handler) -> None:
+        if handler in self._subscribers[event_type]:
+            self._subscribers[event_type].remove(handler)
+
+    def publish(self, event_type: EventType, unit, data=None) -> None:
+        handlers = self._subscribers[event_type]
+        if not handlers:
+            return
+        event = GameEvent(event_type, unit, data)
+        if self.batched:
+            self._queues[event_type].append(event)
+            return
+        for handler in handlers:
+            handler([event])
+
+    def flush(self) -> None:
+        """모아 둔 이벤트를 종류별로 한 번에 전달한다."""
+        for event_type, queue in self._queues.items():
+            if not queue:
+                continue
+            self._queues[event_type] = []
+            for handler in self._subscribers[event_type]:
+                handler(queue)
+
 # --------------------------------------------------------------------
 # 미션 1: 역할 분담과 의존성 역전 (SRP, DIP 적용)
 # --------------------------------------------------------------------
 class BattleReporter(ABC):
     """출력 매체에 독립적인 전투/시나리오 보고 추상화"""
+    level = logging.INFO  # 이보다 낮은 레벨의 이벤트는 메시지를 만들지 않고 버린다
+
     @abstractmethod
     def log(self, message: str) -> None:
         pass
 
-class ConsoleReporter(BattleReporter):
-    """콘솔에 출력하는 구체 구현"""
+    def event(self, level: int, event: str, template: str, /, **fields) -> None:
+        """
+        구조화된 이벤트. template은 %(필드)s 형식이고, 레벨이 꺼져 있으면 포맷하지 않는다.
+        event는 이벤트 이름으로, 구조화된 출력을 하는 구현(LoggingReporter)이 사용한다.
+        """
+        if level >= self.level:
+            self.log(template % fields if fields else template)
+
+    def flush(self) -> None:
+        """버퍼에 남은 메시지를 모두 내보낸다 (버퍼가 없는 구현은 할 일 없음)."""
+        pass
+
+    def close(self) -> None:
+        self.flush()
+
+class NullReporter(BattleReporter):
+    """모든 이벤트를 버린다. 조용한 대량 실행용 (이벤트 포맷 비용도 없음)."""
+    level = logging.CRITICAL + 1
+
+    def log(self, message: str) -> None:
+        pass
+
+class LoggingReporter(BattleReporter):
+    """이벤트를 표준 logging 로거(기본: "starcraft.final")로 넘긴다. 레벨은 로거 설정을 따른다."""
+    def __init__(self, logger: logging.Logger = None):
+        self.logger = logger or log
+
+    def log(self, message: str) -> None:
+        log_event(self.logger, logging.INFO, "message", message)
+
+    def event(self, level: int, event: str, template: str, /, **fields) -> None:
+        log_event(self.logger, level, event, template, **fields)
+
+class ConsoleReporter(LoggingReporter):
+    """
+    콘솔에 출력하는 구체 구현. "starcraft" 로거를 거치므로 quiet_logging()이나 로거 레벨로 끌 수 있다.
+    처음 출력할 때 로깅이 아직 설정되지 않았으면 stdout 출력(StdoutHandler)을 붙인다.
+    만들 때 붙이지 않는 것은 모듈 임포트 시 만드는 DEFAULT_REPORTER가 로깅 설정을 바꾸지 않게 하기 위해서다.
+    """
+    _console_ready = False
+
+    def _prepare_console(self) -> None:
+        ensure_console_output()
+        self._console_ready = True
+
+    def log(self, message: str) -> None:
+        if not self._console_ready:
+            self._prepare_console()
+        super().log(message)
+
+    def event(self, level: int, event: str, template: str, /, **fields) -> None:
+        if not self._console_ready:
+            self._prepare_console()
+        super().event(level, event, template, **fields)
+
+class OverflowPolicy(Enum):
+    BLOCK = auto()  # 버퍼가 가득 차면 쓰기 스레드가 비울 때까지 기다린다 (역압)
+    DROP = auto()   # 버퍼가 가득 차면 새 메시지를 버리고 dropped를 센다
+
+class BufferedReporter(BattleReporter):
+    """
+    메시지를 크기 제한이 있는 버퍼에 넣기만 하고, 백그라운드 쓰기 스레드가
+    쌓인 메시지를 한 번에 묶어서 stdout 또는 파일에 쓴다.
+    종료 전에 close()(또는 flush())를 호출해야 남은 메시지가 모두 기록된다.
+    close() 뒤나 쓰기 스레드가 (스트림 오류 등으로) 멈춘 뒤의 log()는 ValueError를 낸다.
+    로거를 거치지 않고 스트림에 바로 쓰지만, "starcraft" 로거에 설정된 레벨(quiet_logging 포함)은 따른다.
+    """
+    def __init__(self, stream=None, path: str = None, capacity: int = 65536,
+                 policy: OverflowPolicy = OverflowPolicy.BLOCK):
+        if path is not None:
+            self._stream = open(path, "a", encoding="utf-8")
+            self._owns_stream = True
+        else:
+            self._stream = stream or sys.stdout
+            self._owns_stream = False
+        self.capacity = capacity
+        self.policy = policy
+        self.dropped = 0
+        self._buffer = []
+        self._writing = False
+        self._closed = False
+        self._stopped = False  # 쓰기 스레드가 끝났는지 (정상 종료든 오류든)
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
     def log(self, message: str) -> None:
-        print(message)
+        with self._cond:
+            while len(self._buffer) >= self.capacity and not self._stopped:
+                if self.policy is OverflowPolicy.DROP:
+                    self.dropped += 1
+                    return
+                self._cond.wait()
+            if self._closed or self._stopped:
+                raise ValueError("닫혔거나 쓰기 스레드가 멈춘 BufferedReporter에는 기록할 수 없습니다.")
+            self._buffer.append(message)
+            if len(self._buffer) == 1:
+                self._cond.notify_all()
+
+    def event(self, level: int, event: str, template: str, /, **fields) -> None:
+        if level >= self.level and level >= root_log.level:
+            self.log(template % fields if fields else template)
+
+    def flush(self) -> None:
+        """버퍼가 모두 쓰일 때까지 기다린다. 쓰기 스레드가 이미 끝났으면 기다리지 않는다."""
+        with self._cond:
+            while (self._buffer or self._writing) and not self._stopped:
+                self._cond.wait()
+        if not self._stream.closed:
+            self._stream.flush()
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self.flush()
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+        if self._owns_stream:
+            self._stream.close()
+
+    def _run(self):
+        try:
+            while True:
+                with self._cond:
+                    while not self._buffer and not self._closed:
+                        self._cond.wait()
+                    if not self._buffer and self._closed:
+                        return
+                    batch, self._buffer = self._buffer, []
+                    self._writing = True
+                    self._cond.notify_all()  # 버퍼가 비었으니 기다리던 생산자를 깨운다
+                self._stream.write("\n".join(batch) + "\n")
+                with self._cond:
+                    self._writing = False
+                    self._cond.notify_all()
+        finally:
+            # 스트림 오류로 빠져나가도 flush()/log()에서 기다리는 쪽이 멈추지 않게 한다
+            with self._cond:
+                self._writing = False
+                self._stopped = True
+                self._cond.notify_all()
 
 # --------------------------------------------------------------------
 # 미션 2: 전투 방식의 교체 (전략 패턴)
@@ -86,13 +463,23 @@ class AttackStrategy(ABC):
         """attacker가 target을 공격한다."""
         pass
 
+    @staticmethod
+    def _log_hit(attacker, target, damage) -> None:
+        """BattleLog 형식으로 보고하고, 유닛에 저널이 연결되어 있으면 바이너리로도 남긴다."""
+        attacker.reporter.event(logging.INFO, "hit",
+                                "BattleLog(attacker_name=%(attacker)r, target_name=%(target)r, damage=%(damage)r)",
+                                attacker=attacker.name, target=target.name, damage=damage)
+        if attacker.journal is not None:
+            attacker.journal.record(attacker.name, target.name, damage)
+
 class GaussRifleStrategy(AttackStrategy):
     """마린: 가우스 소총"""
     def execute(self, attacker, target) -> None:
         if not attacker.is_alive or attacker.is_lockdown: return
         damage = attacker.power
-        print(f"{attacker.name} -> {target.name} (가우스 소총 공격!)")
-        print(BattleLog(attacker.name, target.name, damage))
+        attacker.reporter.event(logging.INFO, "attack", "%(unit)s -> %(target)s (가우스 소총 공격!)",
+                                unit=attacker.name, target=target.name)
+        self._log_hit(attacker, target, damage)
         target.take_damage(damage)
 
 class ClawStrategy(AttackStrategy):
@@ -100,8 +487,9 @@ class ClawStrategy(AttackStrategy):
     def execute(self, attacker, target) -> None:
         if not attacker.is_alive or attacker.is_lockdown: return
         damage = attacker.power
-        print(f"{attacker.name} -> {target.name} (발톱 공격!)")
-        print(BattleLog(attacker.name, target.name, damage))
+        attacker.reporter.event(logging.INFO, "attack", "%(unit)s -> %(target)s (발톱 공격!)",
+                                unit=attacker.name, target=target.name)
+        self._log_hit(attacker, target, damage)
         target.take_damage(damage)
 
 class SniperRifleStrategy(AttackStrategy):
@@ -109,8 +497,9 @@ class SniperRifleStrategy(AttackStrategy):
     def execute(self, attacker, target) -> None:
         if not attacker.is_alive or attacker.is_lockdown: return
         damage = attacker.power
-        print(f"{attacker.name} -> {target.name} (C-10 저격소총 공격!)")
-        print(BattleLog(attacker.name, target.name, damage))
+        attacker.reporter.event(logging.INFO, "attack", "%(unit)s -> %(target)s (C-10 저격소총 공격!)",
+                                unit=attacker.name, target=target.name)
+        self._log_hit(attacker, target, damage)
         target.take_damage(damage)
 
 class StimpackStrategy(AttackStrategy):
@@ -118,84 +507,98 @@ class StimpackStrategy(AttackStrategy):
     def execute(self, attacker, target) -> None:
         if not attacker.is_alive or attacker.is_lockdown: return
         hp_cost = GameConfig.STIMPACK_HP_COST
-        print(f"{attacker.name}이(가) 스팀팩을 사용합니다! (HP -{hp_cost}, 공격력 +{GameConfig.STIMPACK_POWER_BONUS})")
+        attacker.reporter.event(logging.INFO, "stimpack", "%(unit)s이(가) 스팀팩을 사용합니다! (HP -%(hp_cost)s, 공격력 +%(bonus)s)",
+                                unit=attacker.name, hp_cost=hp_cost, bonus=GameConfig.STIMPACK_POWER_BONUS)
         attacker.take_damage(hp_cost)
         if not attacker.is_alive:  # 스팀팩 과다 사용으로 사망할 수 있음
             return
         damage = attacker.power + GameConfig.STIMPACK_POWER_BONUS
-        print(f"{attacker.name} -> {target.name} (스팀팩 가우스 소총 연사!)")
-        print(BattleLog(attacker.name, target.name, damage))
+        attacker.reporter.event(logging.INFO, "attack", "%(unit)s -> %(target)s (스팀팩 가우스 소총 연사!)",
+                                unit=attacker.name, target=target.name)
+        self._log_hit(attacker, target, damage)
         target.take_damage(damage)
 
 # --------------------------------------------------------------------
 # 미션 3: 유닛 강화 시스템 (데코레이터 패턴)
 # --------------------------------------------------------------------
 class UnitDecorator:
-    """Unit과 동일 인터페이스를 따르며, 다른 Unit을 감싼다."""
+    """
+    Unit과 동일 인터페이스를 따르며, 다른 Unit을 감싼다. 감싼 유닛은 바꾸지 않는다.
+    몇 겹으로 감싸도 속성과 메서드는 원본 유닛(_base)에서 한 번에 찾고,
+    겹마다 더해지는 보너스는 감쌀 때 합산해 둔다.
+    """
     def __init__(self, unit):
         self.wrapped_unit = unit
+        self._base = unit.base_unit
+        self._power_bonus = unit._power_bonus if isinstance(unit, UnitDecorator) else 0
 
-    # 기본 위임: 존재하지 않는 속성/메서드는 원본 유닛에 위임
+    # 기본 위임: 존재하지 않는 속성/메서드는 중간 겹을 거치지 않고 원본 유닛에 위임
     def __getattr__(self, attr):
-        return getattr(self.wrapped_unit, attr)
+        if attr == "_base":  # __init__ 전(복사/역직렬화 중)에는 무한 재귀 대신 속성 없음
+            raise AttributeError(attr)
+        return getattr(self._base, attr)
 
     # 주요 속성/메서드 노출 및 위임
+    @property
+    def base_unit(self):
+        return self._base
+
     @property
     def name(self):
-        return self.wrapped_unit.name
+        return self._base.name
 
     @property
     def max_hp(self):
-        return self.wrapped_unit.max_hp
+        return self._base.max_hp
 
     @property
     def hp(self):
-        return self.wrapped_unit.hp
+        return self._base.hp
 
     @hp.setter
     def hp(self, v):
-        self.wrapped_unit.hp = v
+        self._base.hp = v
 
     @property
     def is_alive(self):
-        return self.wrapped_unit.is_alive
+        return self._base.is_alive
 
     @is_alive.setter
     def is_alive(self, v):
-        self.wrapped_unit.is_alive = v
+        self._base.is_alive = v
 
     @property
     def is_lockdown(self):
-        return self.wrapped_unit.is_lockdown
+        return self._base.is_lockdown
 
     @is_lockdown.setter
     def is_lockdown(self, v):
-        self.wrapped_unit.is_lockdown = v
+        self._base.is_lockdown = v
 
     @property
     def attack_strategy(self):
-        return self.wrapped_unit.attack_strategy
+        return self._base.attack_strategy
 
     @attack_strategy.setter
     def attack_strategy(self, s):
-        self.wrapped_unit.attack_strategy = s
+        self._base.attack_strategy = s
 
     @property
     def power(self):
-        # 기본은 원본 power 그대로
-        return self.wrapped_unit.power
+        return self._base.power + self._power_bonus
 
     def set_strategy(self, new_strategy):
-        self.wrapped_unit.set_strategy(new_strategy)
+        self._base.set_strategy(new_strategy)
 
     def move(self, x, y):
-        self.wrapped_unit.move(x, y)
+        self._base.move(x, y)
 
     def take_damage(self, amount):
-        self.wrapped_unit.take_damage(amount)
+        self._base.take_damage(amount)
 
     def attack(self, target):
-        self.wrapped_unit.attack(target)
+        # 전략이 이 데코레이터의 power(보너스 포함)를 읽도록 공격자로 자신을 넘긴다
+        self._base._attack_as(self, target)
 
     def __str__(self):
         return f"{self.wrapped_unit} [+UPG]"
@@ -204,16 +607,188 @@ class UnitDecorator:
         return f"UnitDecorator({repr(self.wrapped_unit)})"
 
 class DamageUpgradeDecorator(UnitDecorator):
-    """무기 업그레이드(+보너스) 적용 데코레이터: power만 증강"""
+    """
+    무기 업그레이드(+보너스) 적용 데코레이터: power만 증강.
+    보너스는 이 데코레이터를 통해 공격할 때만 더해지고, 원본 유닛의 power는 그대로다.
+    여러 겹 쌓아도 power 읽기는 원본 유닛의 power에 합산해 둔 보너스를 더하는 한 번이다.
+    """
     def __init__(self, unit, bonus: int = 1):
         super().__init__(unit)
         self._bonus = bonus
+        self._power_bonus += bonus
+
+    def remove_upgrade(self):
+        """
+        업그레이드를 해제하고 감싸기 전의 유닛을 돌려준다. 이 데코레이터 자체는 바뀌지 않으므로,
+        이 데코레이터를 다시 감싼 바깥 데코레이터는 감쌀 때 합산한 이 보너스를 계속 포함한다.
+        업그레이드를 뺀 유닛이 필요하면 돌려받은 유닛을 다시 감싸야 한다.
+        """
+        return self.wrapped_unit
+
+# --- 단일 작성자 변경 큐: 유닛 상태 쓰기를 샤드마다 스레드 하나가 순서대로 적용 ---
+@dataclass(frozen=True)
+class UnitState:
+    """유닛 상태의 불변 스냅샷. 변경 큐의 작성자 스레드가 명령을 적용할 때마다 새로 게시한다."""
+    hp: int
+    is_alive: bool
+    is_lockdown: bool
+    energy: int = None
+    is_cloaked: bool = False
+
+class _MutationShard:
+    """명령 deque 하나와 그것을 비우는 작성자 스레드 하나. 생산자는 락 없이 append만 한다."""
+    def __init__(self):
+        self.applied = 0
+        self._queue = collections.deque()
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._stopped = False  # 작성자 스레드가 끝났으면 명령을 호출한 스레드에서 바로 적용한다
+        self._direct = set()  # 작성자 스레드 안에서 바로 적용한 명령의 유닛 (스냅샷 게시 대상)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self._ident = self._thread.ident
+
+    def put(self, unit, command, args, kwargs):
+        if self._stopped:
+            command(*args, **kwargs)
+            self.applied += 1
+            unit._publish_state()
+            return
+        if threading.get_ident() == self._ident:
+            # 작성자 스레드가 적용 중인 명령에서 나온 변경은 줄을 다시 서지 않고 바로 적용한다
+            command(*args, **kwargs)
+            self.applied += 1
+            self._direct.add(unit)
+            return
+        self._queue.append((unit, command, args, kwargs))
+        if not self._wakeup.is_set():
+            self._wakeup.set()
+
+    def marker(self):
+        """지금까지 들어온 명령이 모두 적용되고 스냅샷까지 게시되면 set 되는 Event를 돌려준다."""
+        done = threading.Event()
+        if self._stopped:
+            done.set()
+            return done
+        self._queue.append((None, done.set, (), {}))
+        self._wakeup.set()
+        return done
+
+    def close(self):
+        self._closed = True
+        self._wakeup.set()
+        self._thread.join()
+        self._stopped = True
+        # 스레드가 끝나는 사이에 들어온 명령은 여기서 마저 적용한다
+        while self._queue:
+            unit, command, args, kwargs = self._queue.popleft()
+            command(*args, **kwargs)
+            if unit is not None:
+                self.applied += 1
+                unit._publish_state()
+
+    def _run(self):
+        queue = self._queue
+        popleft = queue.popleft
+        while True:
+            self._wakeup.wait()
+            # append 후 is_set()을 확인하는 생산자와 짝을 이뤄, 깨우기 신호를 잃지 않는다
+            self._wakeup.clear()
+            markers = []
+            touched = self._direct
+            applied = 0
+            while queue:
+                unit, command, args, kwargs = popleft()
+                if unit is None:
+                    markers.append(command)
+                    continue
+                try:
+                    command(*args, **kwargs)
+                except Exception:
+                    log.exception("유닛 변경 명령 %r 적용 실패", command)
+                applied += 1
+                touched.add(unit)
+            self.applied += applied
+            self._direct = set()
+            for unit in touched:
+                unit._publish_state()
+            for done in markers:
+                done()
+            if self._closed and not queue:
+                return
+
+class MutationQueue:
+    """
+    유닛 상태를 바꾸는 호출(피해, 재생, 스킬 시전과 만료)을 명령으로 받아 샤드별 작성자 스레드가 차례로 적용한다.
+    같은 유닛의 명령은 항상 같은 샤드로 가므로 유닛마다 쓰는 스레드는 하나뿐이고, 속성마다 락을 걸지 않아도
+    읽기-수정-쓰기가 겹쳐 갱신을 잃지 않는다. 읽는 쪽은 unit.state()로 마지막으로 게시된 스냅샷을 락 없이 읽는다.
+    명령은 비동기로 적용되므로, 결과를 확인하려면 flush()로 앞서 넣은 명령이 모두 적용되기를 기다린다.
+    """
+    def __init__(self, shards: int = 1):
+        self._shards = [_MutationShard() for _ in range(shards)]
+        self._attached = weakref.WeakSet()  # close() 때 연결을 끊을 원본 유닛들
+
+    def _shard_for(self, base):
+        # id는 16바이트 정렬이라 하위 비트를 버려야 샤드가 고르게 나뉜다
+        return self._shards[(id(base) >> 4) % len(self._shards)]
+
+    def attach(self, unit):
+        """유닛의 @single_writer 메서드가 이 큐를 거치도록 연결하고 첫 스냅샷을 게시한다."""
+        base = unit.base_unit
+        base.writer = self._shard_for(base)
+        base._publish_state()
+        self._attached.add(base)
+
+    def detach(self, unit):
+        base = unit.base_unit
+        base.writer = None
+        base._state = None
+        self._attached.discard(base)
+
+    def submit(self, unit, command, *args, **kwargs):
+        """unit의 작성자 스레드에서 command(*args, **kwargs)를 실행한다."""
+        base = unit.base_unit
+        self._shard_for(base).put(base, command, args, kwargs)
 
     @property
-    def power(self):
-        return self.wrapped_unit.power + self._bonus
+    def applied(self) -> int:
+        """지금까지 적용된 명령 수"""
+        return sum(shard.applied for shard in self._shards)
+
+    def flush(self) -> None:
+        """들어온 명령과, 그 명령이 다른 샤드에 넣은 명령까지 모두 적용될 때까지 기다린다."""
+        while True:
+            before = self.applied
+            for done in [shard.marker() for shard in self._shards]:
+                done.wait()
+            if self.applied == before:
+                return
+
+    def close(self) -> None:
+        """남은 명령을 모두 적용하고 작성자 스레드를 멈춘 뒤, 연결된 유닛을 모두 떼어 낸다 (이후 변경은 바로 적용된다)."""
+        self.flush()
+        for shard in self._shards:
+            shard.close()
+        for unit in list(self._attached):
+            self.detach(unit)
+
+def single_writer(method):
+    """
+    유닛 상태를 바꾸는 메서드 표시. 유닛이 변경 큐에 연결되어 있으면(MutationQueue.attach) 호출이 명령으로
+    큐에 들어가 작성자 스레드에서 실행되고(반환값 없음), 연결되어 있지 않으면 그 자리에서 바로 실행된다.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        writer = self.writer
+        if writer is None:
+            return method(self, *args, **kwargs)
+        writer.put(self, method, (self, *args), kwargs)
+    return wrapper
+
+# GameManager에 등록되지 않은 유닛이 사용하는 기본 출력
+DEFAULT_REPORTER = ConsoleReporter()
 
-# --- Part 1: 모든 유닛의 청사진 (Subject: 옵저버 패턴 포인트 포함) ---
+# --- Part 1: 모든 유닛의 청사진 (이벤트 발행 포인트 포함) ---
 class Unit():
     def __init__(self, name, hp, power, attack_strategy: AttackStrategy = None):
         self.name = name
@@ -223,24 +798,21 @@ class Unit():
         self.is_alive = True
         self.is_lockdown = False
         self.attack_strategy: AttackStrategy = attack_strategy
-        # --- 옵저버 패턴: 구독자 보관 ---
-        self._observers = set()
-
-    # 옵저버 등록/해제/알림
-    def attach(self, observer):
-        if observer not in self._observers:
-            self._observers.add(observer)
-
-    def detach(self, observer):
-        if observer in self._observers:
-            self._observers.remove(observer)
-
-    def notify(self, event: str):
-        # 방어적 복사 후 알림
-        for ob in list(self._observers):
-            update = getattr(ob, "update", None)
-            if callable(update):
-                update(self, event)
+        # --- 출력 대상 (GameManager에 등록될 때 그 reporter로 교체됨) ---
+        self.reporter: BattleReporter = DEFAULT_REPORTER
+        # --- 전투 기록 저널 (GameManager에 journal이 주어지면 연결됨) ---
+        self.journal: BattleJournal = None
+        # --- 이벤트 발행 대상 (GameManager에 등록될 때 연결됨) ---
+        self.event_bus: EventBus = None
+        # --- 단일 작성자 변경 큐의 샤드 (MutationQueue.attach로 연결됨) ---
+        self.writer: _MutationShard = None
+        self._state: UnitState = None
+        # --- 스킬 효과 만료 서비스 (GameManager에 등록될 때 연결됨, 없으면 기본 서비스) ---
+        self.effect_service: EffectExpiryService = None
+
+    def publish(self, event_type: EventType, data=None):
+        if self.event_bus is not None:
+            self.event_bus.publish(event_type, self, data)
 
     # --- 미션 1: 유닛 상태 보고 체계 개선 (던더 메서드) ---
     def __str__(self):
@@ -249,6 +821,26 @@ class Unit():
     def __repr__(self):
         return f"{self.__class__.__name__}(name='{self.name}', hp={self.max_hp}, power={self.power})"
 
+    @property
+    def base_unit(self):
+        """데코레이터로 감싸져 있어도 원본 유닛을 가리킨다 (UnitDecorator.__getattr__로 위임)."""
+        return self
+
+    def state(self) -> UnitState:
+        """
+        상태 스냅샷. 변경 큐가 연결되어 있으면 작성자 스레드가 마지막으로 게시한 값을 락 없이 돌려주므로,
+        여러 속성을 읽어도 서로 어긋나지 않는다. 연결되어 있지 않으면 지금 값으로 만든다.
+        """
+        state = self._state
+        return state if state is not None and self.writer is not None else self._snapshot_state()
+
+    def _snapshot_state(self) -> UnitState:
+        return UnitState(self._hp, self.is_alive, self.is_lockdown,
+                         getattr(self, "energy", None), getattr(self, "is_cloaked", False))
+
+    def _publish_state(self):
+        self._state = self._snapshot_state()
+
     # --- 미션 2: 유닛 생명력 제어 시스템 강화 (@property) ---
     @property
     def hp(self):
@@ -269,84 +861,167 @@ class Unit():
     def move(self, x, y):
         if not self.is_alive or self.is_lockdown:
             status = "파괴되어" if not self.is_alive else "락다운 상태라"
-            print(f"{self.name}은(는) {status} 이동할 수 없습니다.")
+            self.reporter.event(logging.WARNING, "move_blocked", "%(unit)s은(는) %(status)s 이동할 수 없습니다.",
+                                unit=self.name, status=status)
             return
-        print(f"{self.name}이(가) ({x}, {y}) 위치로 이동합니다.")
+        self.reporter.event(logging.INFO, "move", "%(unit)s이(가) (%(x)s, %(y)s) 위치로 이동합니다.",
+                            unit=self.name, x=x, y=y)
 
+    @single_writer
     def take_damage(self, amount):
         if not self.is_alive: return
         self.hp -= amount
-        print(f"{self}이(가) {amount}의 데미지를 입었습니다.")
+        self.reporter.event(logging.INFO, "damage", "%(unit)s (HP: %(hp)s/%(max_hp)s)이(가) %(amount)s의 데미지를 입었습니다.",
+                            unit=self.name, hp=self.hp, max_hp=self.max_hp, amount=amount)
+        self.publish(EventType.DAMAGE, amount)
         if self.hp <= 0:
             self.is_alive = False
-            print(f"*** {self.name}이(가) 파괴되었습니다. ***")
-            # --- 옵저버 알림: 사망 이벤트 ---
-            self.notify("death")
+            self.reporter.event(logging.INFO, "death", "*** %(unit)s이(가) 파괴되었습니다. ***", unit=self.name)
+            # --- 이벤트 발행: 사망 ---
+            self.publish(EventType.DEATH)
 
     def set_strategy(self, new_strategy: AttackStrategy):
         """런타임에 공격 전략 교체"""
         self.attack_strategy = new_strategy
-        print(f"[전략 변경] {self.name}의 공격 전략이 {new_strategy.__class__.__name__}(으)로 변경되었습니다.")
+        self.reporter.event(logging.INFO, "strategy_change", "[전략 변경] %(unit)s의 공격 전략이 %(strategy)s(으)로 변경되었습니다.",
+                            unit=self.name, strategy=new_strategy.__class__.__name__)
+        self.publish(EventType.STRATEGY_CHANGE, new_strategy)
 
     def attack(self, target):
+        self._attack_as(self, target)
+
+    def _attack_as(self, attacker, target):
+        """attacker(이 유닛 또는 이 유닛을 감싼 데코레이터)의 능력치로 공격한다."""
         if not self.is_alive or self.is_lockdown:
             status = "파괴되어" if not self.is_alive else "락다운 상태라"
-            print(f"{self.name}은(는) {status} 공격할 수 없습니다.")
+            self.reporter.event(logging.WARNING, "attack_blocked", "%(unit)s은(는) %(status)s 공격할 수 없습니다.",
+                                unit=self.name, status=status)
             return
         if target.is_alive:
-            self._do_attack(target)
+            self._do_attack(attacker, target)
 
     # 전략 위임: 모든 하위 클래스가 동일하게 사용
-    def _do_attack(self, target):
+    @single_writer
+    def set_lockdown(self, locked: bool):
+        self.is_lockdown = locked
+
+    def _do_attack(self, attacker, target):
         if self.attack_strategy is None:
-            print(f"{self.name}은(는) 공격 전략이 설정되지 않았습니다!")
+            self.reporter.event(logging.WARNING, "no_strategy", "%(unit)s은(는) 공격 전략이 설정되지 않았습니다!", unit=self.name)
             return
-        self.attack_strategy.execute(self, target)
+        self.attack_strategy.execute(attacker, target)
 
 # --- 능력 믹스인(Mixin) 클래스 ---
 class CloakableMixin:
     @log_ability_usage
+    @single_writer
     def cloak(self, duration=GameConfig.CLOAK_DURATION):
         if not self.is_alive: return
         cost = GameConfig.CLOAK_COST
         if hasattr(self, 'energy') and self.energy >= cost:
             self.energy -= cost
             self.is_cloaked = True
-            print(f"{self.name}이(가) 클로킹을 사용합니다. ({duration}초 지속, 남은 에너지: {self.energy})")
-            threading.Timer(duration, self.uncloak).start()
+            self.reporter.event(logging.INFO, "cloak", "%(unit)s이(가) 클로킹을 사용합니다. (%(duration)s초 지속, 남은 에너지: %(energy)s)",
+                                unit=self.name, duration=duration, energy=self.energy)
+            effect_service_of(self).schedule(duration, self.uncloak, owner=self.base_unit, kind="cloak")
+            self.publish(EventType.ABILITY_CAST, "cloak")
         else:
-            print(f"{self.name}의 에너지가 부족하여 클로킹을 사용할 수 없습니다.")
+            self.reporter.event(logging.WARNING, "cloak_no_energy", "%(unit)s의 에너지가 부족하여 클로킹을 사용할 수 없습니다.",
+                                unit=self.name)
 
+    @single_writer
     def uncloak(self):
         if hasattr(self, 'is_cloaked') and self.is_cloaked:
+            effect_service_of(self).cancel_effect(self.base_unit, "cloak")
             self.is_cloaked = False
-            print(f">>> {self.name}의 클로킹 효과가 해제되었습니다. <<<")
+            self.reporter.event(logging.INFO, "uncloak", ">>> %(unit)s의 클로킹 효과가 해제되었습니다. <<<", unit=self.name)
 
 class RegeneratableMixin:
-    def _start_regeneration_process(self):
-        threading.Thread(target=self._regenerate_loop, daemon=True).start()
+    def _start_regeneration_process(self, scheduler):
+        """공용 틱 스케줄러에 HP 재생 작업을 등록한다."""
+        scheduler.register(self, self._regenerate_once)
 
-    def _regenerate_loop(self):
-        while self.is_alive:
-            time.sleep(1)
-            if self.is_alive and self.hp < self.max_hp:
-                self.hp += GameConfig.ZERGLING_HP_REGEN_RATE
-                print(f"[재생] {self}의 HP가 회복됩니다.")
+    @single_writer
+    def _regenerate_once(self):
+        if self.is_alive and self.hp < self.max_hp:
+            self.hp += GameConfig.ZERGLING_HP_REGEN_RATE
+            self.reporter.event(logging.INFO, "regen", "[재생] %(unit)s (HP: %(hp)s/%(max_hp)s)의 HP가 회복됩니다.",
+                                unit=self.name, hp=self.hp, max_hp=self.max_hp)
 
 class EnergyRegeneratableMixin:
-    def _start_energy_regeneration_process(self):
-        threading.Thread(target=self._energy_regenerate_loop, daemon=True).start()
-
-    def _energy_regenerate_loop(self):
-        while self.is_alive:
-            time.sleep(1)
-            if self.is_alive and hasattr(self, 'energy') and self.energy < self.max_energy:
-                self.energy += GameConfig.GHOST_ENERGY_REGEN_RATE
-                print(f"[에너지 회복] {self.name}의 에너지가 회복됩니다. (현재 에너지: {self.energy}/{self.max_energy})")
+    def _start_energy_regeneration_process(self, scheduler):
+        """공용 틱 스케줄러에 에너지 재생 작업을 등록한다."""
+        scheduler.register(self, self._energy_regenerate_once)
+
+    @single_writer
+    def _energy_regenerate_once(self):
+        if self.is_alive and hasattr(self, 'energy') and self.energy < self.max_energy:
+            self.energy += GameConfig.GHOST_ENERGY_REGEN_RATE
+            self.reporter.event(logging.INFO, "energy_regen", "[에너지 회복] %(unit)s의 에너지가 회복됩니다. (현재 에너지: %(energy)s/%(max_energy)s)",
+                                unit=self.name, energy=self.energy, max_energy=self.max_energy)
+
+# --- asyncio 런타임: 스레드 대신 이벤트 루프의 코루틴으로 동작 ---
+class AsyncTickScheduler(TickScheduler):
+    """TickScheduler와 같은 작업을 실행 중인 이벤트 루프의 태스크 하나로 처리한다."""
+    def __init__(self, interval: float = 1.0):
+        super().__init__(interval)
+        self._task = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run_async())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+
+    async def _run_async(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            self.tick()
+
+class AsyncEffectExpiryService(EffectExpiryService):
+    """EffectExpiryService의 힙을 그대로 쓰되, 만료 대기를 이벤트 루프의 코루틴에서 처리한다."""
+    def __init__(self, resolution: float = 0.01):
+        super().__init__(resolution)
+        self._task = None
+        self._wakeup = None
+
+    def schedule(self, delay, callback, owner=None, kind=None) -> EffectHandle:
+        handle = super().schedule(delay, callback, owner, kind)
+        self._wakeup.set()
+        return handle
+
+    def start(self):
+        if self._task is None:
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(self._run_async())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+
+    async def _run_async(self):
+        while True:
+            self._wakeup.clear()
+            if not self._heap:
+                await self._wakeup.wait()
+                continue
+            wait = self._heap[0][0] - self.clock.now()
+            if wait > 0:
+                # 더 이른 효과가 예약되면 깨어나서 대기 시간을 다시 계산한다
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            self._fire(self._pop_due(self.clock.now()))
 
 # --- 종족별 유닛 구현 ---
 class Marine(Unit):
-    def __init__(self, name="마린", hp=GameConfig.MARINE_HP, power=GameConfig.MARINE_POWER):
+    DEFAULT_NAME = "마린"
+
+    def __init__(self, name=DEFAULT_NAME, hp=GameConfig.MARINE_HP, power=GameConfig.MARINE_POWER):
         super().__init__(name, hp, power, attack_strategy=GaussRifleStrategy())
 
     @classmethod
@@ -356,84 +1031,378 @@ class Marine(Unit):
         return cls(name, hp=elite_hp, power=elite_power)
 
 class Zergling(Unit, RegeneratableMixin):
-    def __init__(self, name="저글링", hp=GameConfig.ZERGLING_HP, power=GameConfig.ZERGLING_POWER):
+    DEFAULT_NAME = "저글링"
+
+    def __init__(self, name=DEFAULT_NAME, hp=GameConfig.ZERGLING_HP, power=GameConfig.ZERGLING_POWER):
         super().__init__(name, hp, power, attack_strategy=ClawStrategy())
-        self._start_regeneration_process()
 
 class Ghost(Unit, CloakableMixin, EnergyRegeneratableMixin):
-    def __init__(self, name="고스트", hp=GameConfig.GHOST_HP, power=GameConfig.GHOST_POWER):
+    DEFAULT_NAME = "고스트"
+
+    def __init__(self, name=DEFAULT_NAME, hp=GameConfig.GHOST_HP, power=GameConfig.GHOST_POWER):
         super().__init__(name, hp, power, attack_strategy=SniperRifleStrategy())
         self.max_energy = GameConfig.GHOST_MAX_ENERGY
         self.energy = GameConfig.GHOST_START_ENERGY
         self.is_cloaked = False
-        self._start_energy_regeneration_process()
 
     @log_ability_usage
+    @single_writer
     def lockdown(self, target, duration=GameConfig.LOCKDOWN_DURATION):
         if not self.is_alive: return
         cost = GameConfig.LOCKDOWN_COST
         if self.energy >= cost:
             self.energy -= cost
-            target.is_lockdown = True
-            print(f"{self.name}이(가) {target.name}에게 락다운을 시전합니다! ({duration}초 지속)")
+            # 대상의 상태는 대상의 작성자가 바꾼다
+            target.set_lockdown(True)
+            self.reporter.event(logging.INFO, "lockdown", "%(unit)s이(가) %(target)s에게 락다운을 시전합니다! (%(duration)s초 지속)",
+                                unit=self.name, target=target.name, duration=duration)
 
             def release_lockdown():
                 if target.is_alive:
-                    target.is_lockdown = False
-                    print(f">>> {target.name}의 락다운 효과가 해제되었습니다. <<<")
+                    target.set_lockdown(False)
+                    self.reporter.event(logging.INFO, "lockdown_end", ">>> %(unit)s의 락다운 효과가 해제되었습니다. <<<",
+                                        unit=target.name)
 
-            threading.Timer(duration, release_lockdown).start()
+            # 이미 락다운 중인 대상이면 이전 만료 예약은 취소되고 새 지속시간이 적용된다
+            effect_service_of(self).schedule(duration, release_lockdown, owner=target.base_unit, kind="lockdown")
+            self.publish(EventType.ABILITY_CAST, "lockdown")
         else:
-            print(f"{self.name}의 에너지가 부족하여 락다운을 사용할 수 없습니다.")
+            self.reporter.event(logging.WARNING, "lockdown_no_energy", "%(unit)s의 에너지가 부족하여 락다운을 사용할 수 없습니다.",
+                                unit=self.name)
+
+# --- 유닛 원형 (프로토타입 패턴) ---
+class UnitPrototype:
+    """
+    유닛 한 종류의 원형. builder로 한 번 만들어 검증한 유닛의 속성을 템플릿으로 보관하고,
+    clone()은 생성자를 거치지 않고 템플릿 값을 차례로 대입해 새 유닛을 만든 뒤 능력치 재정의를 적용한다.
+    불변 값과 상태 없는 공격 전략은 복제본끼리 공유하고, 그런 값만 담은 list/dict/set은 유닛마다 복사한다.
+    공유해도 되는지 알 수 없는 속성(직접 만든 객체 등)이 하나라도 있으면 복제하지 않고 매번 builder로 만든다.
+    """
+    # 재정의 인자 이름 -> 그 값을 담는 유닛 속성 (목록에 없는 인자는 같은 이름의 속성을 바꾼다)
+    STAT_FIELDS = {"hp": ("max_hp", "_hp")}
+    # 복제본끼리 같은 객체를 써도 되는 값: 불변 값, 상태 없는 공격 전략, 공용 출력 대상
+    SHARED_TYPES = (type(None), bool, int, float, complex, str, bytes, Enum, AttackStrategy, BattleReporter)
+
+    def __init__(self, builder, name: str = None):
+        if name is None:
+            name = getattr(builder, "DEFAULT_NAME", None)
+            if name is None:
+                raise ValueError(f"{builder!r}에 DEFAULT_NAME이 없습니다. name을 지정하세요.")
+        unit = builder(name)
+        if not isinstance(unit, Unit):
+            raise ValueError(f"{builder!r}이(가) 유닛을 만들지 않았습니다.")
+        if unit.max_hp <= 0 or unit.attack_strategy is None:
+            raise ValueError(f"{unit!r}은(는) 원형으로 쓸 수 없습니다. (HP와 공격 전략이 필요합니다)")
+        self.cls = type(unit)
+        self.name = name
+        self._fields = set(vars(unit))
+        # (속성, 값, 복사 여부): 생성자와 같은 순서로 대입해야 인스턴스끼리 속성 이름 테이블을 공유한다
+        self._template = []
+        self._builder = None
+        for key, value in vars(unit).items():
+            if self._shareable(value):
+                self._template.append((key, value, False))
+            elif self._copyable(value):
+                self._template.append((key, value, True))
+            else:
+                self._builder = builder
+        # 재사용(UnitPool)은 템플릿으로 되돌릴 수 있는 원형만 가능하다
+        self.reusable = self._builder is None
+
+    @classmethod
+    def _shareable(cls, value) -> bool:
+        if isinstance(value, cls.SHARED_TYPES):
+            return True
+        if isinstance(value, (tuple, frozenset)):
+            return all(cls._shareable(item) for item in value)
+        return False
+
+    @classmethod
+    def _copyable(cls, value) -> bool:
+        """얕은 복사(.copy())만으로 유닛마다 독립된 값이 되는지"""
+        if isinstance(value, (list, set)):
+            return all(cls._shareable(item) for item in value)
+        if isinstance(value, dict):
+            return all(cls._shareable(k) and cls._shareable(v) for k, v in value.items())
+        return False
+
+    def _check(self, overrides: dict) -> None:
+        for arg in overrides:
+            for field in self.STAT_FIELDS.get(arg, (arg,)):
+                if field not in self._fields:
+                    raise TypeError(f"{self.cls.__name__}에는 '{arg}' 능력치가 없습니다.")
+
+    def _apply(self, unit, overrides: dict):
+        for arg, value in overrides.items():
+            for field in self.STAT_FIELDS.get(arg, (arg,)):
+                setattr(unit, field, value)
+        return unit
+
+    def _fill(self, unit, name: str, overrides: dict):
+        for key, value, fresh in self._template:
+            setattr(unit, key, value.copy() if fresh else value)
+        unit.name = name
+        return self._apply(unit, overrides)
+
+    def _make(self, name: str, overrides: dict):
+        if self._builder is not None:
+            return self._apply(self._builder(name), overrides)
+        return self._fill(object.__new__(self.cls), name, overrides)
+
+    def clone(self, name: str, **overrides):
+        self._check(overrides)
+        return self._make(name, overrides)
+
+    def cloner(self, **overrides):
+        """재정의가 같은 유닛을 여러 개 만들 때 쓰는 이름 -> 유닛 함수. 재정의 검사는 한 번만 한다."""
+        self._check(overrides)
+        make = self._make
+        return lambda name: make(name, overrides)
+
+    def reset(self, unit, name: str, **overrides):
+        """
+        풀에서 꺼낸 유닛을 clone()한 것과 같은 상태로 되돌린다. 템플릿의 모든 속성을 다시 대입하므로
+        게임/출력/변경 큐 연결도 원형의 값(연결 없음)으로 돌아가고, 다시 등록해야 한다. (reusable인 원형만)
+        """
+        if not self.reusable:
+            raise ValueError(f"{self.cls.__name__} 원형은 유닛을 되돌릴 수 없어 재사용할 수 없습니다.")
+        self._check(overrides)
+        return self._fill(unit, name, overrides)
 
 # --- 유닛 생성 팩토리 클래스 ---
 class UnitFactory:
-    def create_unit(self, unit_type: UnitType, name: str, **kwargs):
-        if unit_type == UnitType.MARINE:
-            return Marine(name=name, **kwargs)
-        elif unit_type == UnitType.ZERGLING:
-            return Zergling(name=name, **kwargs)
-        elif unit_type == UnitType.GHOST:
-            return Ghost(name=name, **kwargs)
+    """
+    유닛 타입(과 정예 등 변형)별 원형 레지스트리에서 복제해 유닛을 만든다.
+    레지스트리는 팩토리마다 따로 두고 기본 원형(_DEFAULT_PROTOTYPES)으로 시작한다.
+    새 유닛 종류는 register()로 원형만 등록하면 팩토리를 고치지 않고 만들 수 있다.
+    """
+    def __init__(self):
+        self._prototypes = dict(_DEFAULT_PROTOTYPES)  # (유닛 타입, 변형) -> UnitPrototype
+
+    def register(self, unit_type, prototype: UnitPrototype, variant: str = None) -> None:
+        self._prototypes[(unit_type, variant)] = prototype
+
+    def prototype(self, unit_type, variant: str = None) -> UnitPrototype:
+        prototype = self._prototypes.get((unit_type, variant))
+        if prototype is None:
+            kind = unit_type if variant is None else f"{unit_type}({variant})"
+            raise ValueError(f"'{kind}'은(는) 생성할 수 없는 유닛 타입입니다.")
+        return prototype
+
+    def create_unit(self, unit_type, name: str, pool: "UnitPool" = None, variant: str = None, **overrides):
+        """pool을 주면 그 풀에 남아 있는 같은 클래스의 유닛을 먼저 재사용한다."""
+        prototype = self.prototype(unit_type, variant)
+        if pool is not None:
+            return pool.acquire(prototype, name, **overrides)
+        return prototype.clone(name, **overrides)
+
+    def create_units(self, unit_type, count: int, name: str = None, pool: "UnitPool" = None,
+                     variant: str = None, **overrides):
+        """
+        같은 타입의 유닛 count개를 한 번에 만든다. 원형은 한 번만 찾고 능력치 재정의(overrides)도 모두에게 같게 적용한다.
+        이름은 name(없으면 원형의 이름) 뒤에 1부터 번호를 붙인다.
+        """
+        prototype = self.prototype(unit_type, variant)
+        if name is None:
+            name = prototype.name
+        if pool is None:
+            make = prototype.cloner(**overrides)
         else:
-            raise ValueError(f"'{unit_type}'은(는) 생성할 수 없는 유닛 타입입니다.")
+            make = functools.partial(pool.acquire, prototype, **overrides)
+        return [make(f"{name}{i}") for i in range(1, count + 1)]
+
+# 원형은 만든 뒤 바뀌지 않으므로 모든 팩토리가 같은 객체를 공유한다
+_DEFAULT_PROTOTYPES = {
+    (UnitType.MARINE, None): UnitPrototype(Marine),
+    (UnitType.MARINE, "elite"): UnitPrototype(Marine.create_elite_marine, name="정예 마린"),
+    (UnitType.ZERGLING, None): UnitPrototype(Zergling),
+    (UnitType.GHOST, None): UnitPrototype(Ghost),
+}
+
+# --- 유닛 레지스트리 ---
+class UnitRegistry:
+    """
+    살아있는 유닛을 원본 유닛의 id로 보관한다. 추가/제거는 O(1)이고 순회는 등록 순서를 따른다.
+    데코레이터로 감싼 유닛도 등록 시점에 원본(base_unit)을 한 번만 찾아 키로 쓴다.
+    """
+    def __init__(self):
+        self._units = {}  # id(base_unit) -> 등록된 유닛(감싼 객체일 수 있음)
+
+    def add(self, unit):
+        self._units[id(unit.base_unit)] = unit
+
+    def add_many(self, units):
+        self._units.update((id(unit.base_unit), unit) for unit in units)
+
+    def remove(self, unit):
+        """unit(원본이든 감싼 객체든)에 해당하는 등록 항목을 제거한다."""
+        return self._units.pop(id(unit.base_unit), None)
+
+    def get(self, unit):
+        return self._units.get(id(unit.base_unit))
+
+    def __contains__(self, unit):
+        return id(unit.base_unit) in self._units
+
+    def __iter__(self):
+        return iter(list(self._units.values()))
+
+    def __len__(self):
+        return len(self._units)
 
-# --- 게임 관리 클래스 (Observer) ---
+    def __repr__(self):
+        return f"UnitRegistry({list(self._units.values())!r})"
+
+# --- 유닛 객체 풀 ---
+class UnitPool:
+    """
+    죽은 유닛을 클래스별 free list에 모아 두었다가 다음 생성 때 원형(UnitPrototype.reset)으로 되살려 재사용한다.
+    생성과 사망이 반복되는 긴 전투에서 유닛 객체와 그 속성 저장 공간을 매번 새로 할당하지 않게 한다.
+    풀에 돌려준 유닛을 가리키던 참조(데코레이터 포함)는 그 유닛이 재사용되면 다른 유닛을 가리키게 된다.
+    """
+    def __init__(self, capacity: int = None):
+        self.capacity = capacity  # 클래스별 최대 보관 수 (None이면 제한 없음)
+        self.created = 0
+        self.reused = 0
+        self._free = collections.defaultdict(list)  # 클래스 -> 죽은 원본 유닛 목록
+
+    def acquire(self, prototype: UnitPrototype, name, **overrides):
+        if not prototype.reusable:
+            # 템플릿으로 되돌릴 수 없는 원형은 모아 둔 유닛을 버리고 새로 만든다
+            self._free.pop(prototype.cls, None)
+            self.created += 1
+            return prototype.clone(name, **overrides)
+        free = self._free.get(prototype.cls)
+        if free:
+            self.reused += 1
+            return prototype.reset(free.pop(), name, **overrides)
+        self.created += 1
+        return prototype.clone(name, **overrides)
+
+    def release(self, unit):
+        """죽은 유닛을 풀에 돌려준다. 감싼 객체를 받아도 원본을 보관한다."""
+        base = unit.base_unit
+        free = self._free[type(base)]
+        if self.capacity is None or len(free) < self.capacity:
+            free.append(base)
+
+    def __len__(self):
+        return sum(len(free) for free in self._free.values())
+
+# --- 게임 관리 클래스 (이벤트 구독자) ---
 class GameManager:
-    def __init__(self, reporter: BattleReporter):
+    def __init__(self, reporter: BattleReporter, clock: Clock = None, batch_events: bool = False,
+                 journal: BattleJournal = None, mutations: MutationQueue = None, unit_pool: UnitPool = None):
         self.reporter = reporter
-        self.units = []
+        self.journal = journal
+        # mutations를 주면 등록된 유닛의 상태 변경이 모두 그 큐의 작성자 스레드에서 적용된다
+        self.mutations = mutations
+        self.units = UnitRegistry()
         self.unit_factory = UnitFactory()
-
-    # 옵저버 콜백
-    def update(self, unit, event: str):
-        if event == "death":
-            # 리스트에서 즉시 제거 (랩핑된 객체까지 고려)
-            self._remove_unit_reference(unit)
+        # unit_pool을 주면 죽은 유닛을 풀에 돌려주고 다음 생성 때 재사용한다
+        self.unit_pool = unit_pool
+        # batch_events=True이면 사망 처리 등을 시나리오 단계가 끝날 때 한꺼번에 한다
+        self.event_bus = EventBus(batched=batch_events)
+        self.event_bus.subscribe(EventType.DEATH, self._on_deaths)
+        # VirtualClock을 주입하면 시나리오 대기, 재생, 스킬 만료가 모두 가상 시간으로 진행된다
+        self.clock = clock or RealClock()
+        self.scheduler = TickScheduler(clock=self.clock)  # 모든 유닛의 재생을 담당하는 단일 스레드
+        self.effects = EffectExpiryService(clock=self.clock)  # 클로킹/락다운 만료를 담당하는 단일 스레드
+
+    # 이벤트 구독: 사망
+    def _on_deaths(self, events):
+        for event in events:
+            unit = event.unit
+            # 레지스트리에서 제거 (랩핑된 객체까지 고려)
+            self.units.remove(unit)
+            self.scheduler.unregister(unit)
+            self.effects.cancel_owner(unit)
             self.reporter.log(f"{unit.name}이(가) 전장에서 쓰러졌습니다. (즉시 제거됨)")
-
-    def _remove_unit_reference(self, unit):
-        # UnitDecorator에 감싸져 리스트에 들어있을 수도 있으므로 언랩 비교
-        def unwrap(u):
-            while isinstance(u, UnitDecorator):
-                u = u.wrapped_unit
-            return u
-        base = unwrap(unit)
-        self.units = [u for u in self.units if unwrap(u) is not base]
+            if self.unit_pool is not None:
+                self.unit_pool.release(unit)
+
+    def register_unit(self, unit):
+        """이벤트 버스 연결, 유닛 목록 추가, 재생 작업 등록을 한 번에 처리한다."""
+        unit.event_bus = self.event_bus
+        unit.reporter = self.reporter
+        unit.journal = self.journal
+        if self.mutations is not None:
+            self.mutations.attach(unit)
+        unit.effect_service = self.effects
+        self.units.add(unit)
+        if isinstance(unit, RegeneratableMixin):
+            unit._start_regeneration_process(self.scheduler)
+        if isinstance(unit, EnergyRegeneratableMixin):
+            unit._start_energy_regeneration_process(self.scheduler)
+        self.reporter.log(f"--- {unit} 생성 완료 ---")
+
+    def _prepare_reuse(self):
+        # 풀의 유닛은 죽은 뒤에도 변경 큐에 명령이 남아 있을 수 있으므로 되살리기 전에 모두 적용해 둔다
+        if self.mutations is not None and self.unit_pool:
+            self.mutations.flush()
 
     def create_unit(self, unit_type: UnitType, name: str, *args, **kwargs):
         try:
-            unit = self.unit_factory.create_unit(unit_type, name, *args, **kwargs)
+            self._prepare_reuse()
+            unit = self.unit_factory.create_unit(unit_type, name, *args, pool=self.unit_pool, **kwargs)
             if unit:
-                unit.attach(self)             # ✅ 생성 즉시 옵저버 등록
-                self.units.append(unit)
-                self.reporter.log(f"--- {unit} 생성 완료 ---")
+                self.register_unit(unit)      # ✅ 생성 즉시 이벤트 버스 연결
             return unit
         except ValueError as e:
             self.reporter.log(str(e))
             return None
 
-    def run_scenario(self):
+    def register_units(self, units):
+        """
+        register_unit의 일괄 버전. 연결은 유닛마다 하되 레지스트리 추가와 재생 작업 등록은 한 번에 하고,
+        생성 로그도 종류별 마릿수를 요약한 한 줄만 남긴다.
+        """
+        bus, reporter, journal, effects = self.event_bus, self.reporter, self.journal, self.effects
+        regen = []
+        for unit in units:
+            unit.event_bus = bus
+            unit.reporter = reporter
+            unit.journal = journal
+            unit.effect_service = effects
+            if isinstance(unit, RegeneratableMixin):
+                regen.append((unit, unit._regenerate_once))
+            if isinstance(unit, EnergyRegeneratableMixin):
+                regen.append((unit, unit._energy_regenerate_once))
+        if self.mutations is not None:
+            for unit in units:
+                self.mutations.attach(unit)
+        self.units.add_many(units)
+        if regen:
+            self.scheduler.register_many(regen)
+        if units:
+            counts = collections.Counter(unit.__class__.__name__ for unit in units)
+            summary = ", ".join(f"{cls_name} {n}기" for cls_name, n in counts.items())
+            self.reporter.log(f"--- {summary} 생성 완료 ({units[0].name} ~ {units[-1].name}) ---")
+
+    def create_units(self, unit_type: UnitType, count: int, name: str = None, **overrides):
+        """같은 타입의 유닛 count개(웨이브)를 한 번에 만들어 등록한다. 이름 규칙은 UnitFactory.create_units를 따른다."""
+        with gc_paused():
+            try:
+                self._prepare_reuse()
+                units = self.unit_factory.create_units(unit_type, count, name, pool=self.unit_pool, **overrides)
+            except ValueError as e:
+                self.reporter.log(str(e))
+                return []
+            self.register_units(units)
+        return units
+
+    def shutdown(self):
+        """백그라운드 스케줄러와 효과 만료 서비스를 정지하고 남은 출력을 내보낸다."""
+        self.scheduler.stop()
+        self.effects.stop()
+        if self.mutations is not None:
+            self.mutations.flush()
+        self.reporter.flush()
+        if self.journal is not None:
+            self.journal.flush()
+
+    def scenario_steps(self):
+        """시나리오 단계를 실행하며, 대기가 필요한 지점마다 대기 시간(초)을 yield 한다."""
         self.reporter.log("="*40)
         self.reporter.log("### 스타크래프트 시뮬레이터 업그레이드 작전 개시 ###")
         self.reporter.log("="*40 + "\n")
@@ -445,9 +1414,7 @@ class GameManager:
 
         # 미션 3-1: 클래스 메서드로 정예 유닛 생성
         elite_marine = Marine.create_elite_marine("특전사 마린")
-        elite_marine.attach(self)  # ✅ 수동 생성도 옵저버 등록
-        self.units.append(elite_marine)
-        self.reporter.log(f"--- {elite_marine} 생성 완료 ---")
+        self.register_unit(elite_marine)  # ✅ 수동 생성도 이벤트 버스 연결
 
         self.reporter.log("\n" + "="*30)
         self.reporter.log("### 시나리오 1: 고급 기술 테스트 ###")
@@ -467,18 +1434,18 @@ class GameManager:
         # 미션 4: 데코레이터 테스트
         self.reporter.log("\n--- 데코레이터 테스트 ---")
         ghost.lockdown(marine, duration=4)
-        time.sleep(1)
+        yield 1
         ghost.cloak(duration=5)
 
         self.reporter.log("\n" + "="*30)
         self.reporter.log("### 시나리오 2: 전투 및 자동 회복 ###")
         self.reporter.log("="*30)
 
-        time.sleep(4)  # 락다운 및 클로킹 해제 시간 대기
+        yield 4  # 락다운 및 클로킹 해제 시간 대기
 
         # --- (미션3) 데코레이터 패턴: 마린 무기 업그레이드(+1) 적용 ---
         self.reporter.log("\n--- 데코레이터 패턴: 마린 무기 업그레이드(+1) 적용 ---")
-        marine = DamageUpgradeDecorator(marine, bonus=1)  # 변수만 감싸도 원본 유닛 옵저버는 그대로 유지
+        marine = DamageUpgradeDecorator(marine, bonus=1)  # 변수만 감싸도 원본 유닛의 이벤트 연결은 그대로 유지
         self.reporter.log(f"업그레이드 후 {marine.name}의 공격력: {marine.power}")
 
         # 기본 전략으로 교전
@@ -486,7 +1453,7 @@ class GameManager:
         zergling.attack(marine)
 
         self.reporter.log("\n저글링이 자동 회복하는 동안 대기합니다 (2초)...")
-        time.sleep(2)
+        yield 2
 
         # --- (도전) 전략 교체: 마린 → 스팀팩 전략 ---
         self.reporter.log("\n--- 전략 패턴: 마린이 스팀팩 전략으로 전환 ---")
@@ -497,13 +1464,275 @@ class GameManager:
         while zergling.is_alive:
             if elite_marine.is_alive:
                 elite_marine.attack(zergling)
-            time.sleep(0.5)
+            yield 0.5
 
-        # 생존 유닛 출력 (옵저버에 의해 사망자는 실시간 제거됨)
+        # 생존 유닛 출력 (사망 이벤트 구독으로 사망자는 제거됨)
         self.reporter.log(f"\n시나리오 종료 후 생존 유닛: {[str(unit) for unit in self.units if getattr(unit, 'is_alive', False)]}")
 
+    def run_scenario(self):
+        for delay in self.scenario_steps():
+            self.event_bus.flush()
+            self.clock.sleep(delay)
+        self.event_bus.flush()
+
+class AsyncGameManager(GameManager):
+    """
+    재생 루프, 클로킹/락다운 만료, 시나리오 대기를 모두 하나의 이벤트 루프에서 처리하는 GameManager.
+    추가 스레드 없이 여러 전투를 한 프로세스에서 동시에 실행할 수 있다.
+    """
+    def __init__(self, reporter: BattleReporter):
+        super().__init__(reporter)
+        self.scheduler = AsyncTickScheduler()
+        self.effects = AsyncEffectExpiryService()
+
+    async def run_scenario_async(self):
+        try:
+            for delay in self.scenario_steps():
+                self.event_bus.flush()
+                await asyncio.sleep(delay)
+            self.event_bus.flush()
+        finally:
+            self.shutdown()
+
+async def run_concurrent_battles(count: int, reporter_factory=None):
+    """독립된 AsyncGameManager 전투 count개를 같은 이벤트 루프에서 동시에 실행한다."""
+    reporter_factory = reporter_factory or ConsoleReporter
+    managers = [AsyncGameManager(reporter_factory()) for _ in range(count)]
+    await asyncio.gather(*(m.run_scenario_async() for m in managers))
+    return managers
+
+# --- 전투 결과 예측: 란체스터 모델 / 몬테카를로 비교용 라운드 전투 ---
+@dataclass(frozen=True)
+class BattlePrediction:
+    winner: Optional[int]   # 0: team_a, 1: team_b, None: 승률이 DECISIVE 미만인 팽팽한 전투, 무승부, 라운드 제한
+    survivors: tuple        # (team_a, team_b) 예상 생존 유닛 수
+    rounds: float           # 예상 전투 길이 (라운드)
+    win_probability: float  # team_a가 이길 확률
+
+    DECISIVE = 0.8  # 이 승률 이상일 때만 승자를 정한다 (팽팽한 전투에서 모델 승률이 한쪽으로 쏠리므로 높게 잡는다)
+
+def combat_stats(unit):
+    """(현재 HP, 한 번 공격의 피해량, 공격마다 스스로 잃는 HP). 업그레이드와 스팀팩을 반영한다."""
+    damage = unit.power if unit.attack_strategy is not None else 0
+    self_cost = 0
+    if isinstance(unit.attack_strategy, StimpackStrategy):
+        damage += GameConfig.STIMPACK_POWER_BONUS
+        self_cost = GameConfig.STIMPACK_HP_COST
+    return unit.hp, damage, self_cost
+
+def hits_to_kill_matrix(damage, hp):
+    """hits[i, j] = Unit.calculate_hits_to_kill(hp[j], damage[i])를 배열 연산으로 한 번에 계산한다."""
+    damage = np.asarray(damage, dtype=np.int64)[:, None]
+    hp = np.asarray(hp, dtype=np.int64)[None, :]
+    safe = np.where(damage > 0, damage, 1)
+    return np.where(damage > 0, (hp + safe - 1) // safe, np.inf)
+
+def combat_matrices(team_a, team_b):
+    """
+    두 팀의 살아있는 유닛으로 (피해량 행렬, 처치에 필요한 공격 횟수 행렬)을 팀 방향별로 만든다.
+    반환: {"damage_ab", "hits_ab", "damage_ba", "hits_ba", "self_cost_a", "self_cost_b", "hp_a", "hp_b"}
+    """
+    if np is None:
+        raise ImportError("전투 예측을 사용하려면 numpy가 필요합니다.")
+    stats_a = np.array([combat_stats(u) for u in team_a if u.is_alive], dtype=np.int64).reshape(-1, 3)
+    stats_b = np.array([combat_stats(u) for u in team_b if u.is_alive], dtype=np.int64).reshape(-1, 3)
+    hp_a, dmg_a, cost_a = stats_a.T
+    hp_b, dmg_b, cost_b = stats_b.T
+    return {
+        "damage_ab": np.broadcast_to(dmg_a[:, None], (len(dmg_a), len(hp_b))),
+        "hits_ab": hits_to_kill_matrix(dmg_a, hp_b),
+        "damage_ba": np.broadcast_to(dmg_b[:, None], (len(dmg_b), len(hp_a))),
+        "hits_ba": hits_to_kill_matrix(dmg_b, hp_a),
+        "self_cost_a": cost_a, "self_cost_b": cost_b,
+        "hp_a": hp_a, "hp_b": hp_b,
+    }
+
+def _poisson_pmf(lam, count):
+    """Poisson(lam)의 0..count-1 확률과 count 이상 꼬리 확률을 한 배열로 돌려준다."""
+    term = math.exp(-lam)
+    pmf = [term]
+    for k in range(1, count):
+        term *= lam / k
+        pmf.append(term)
+    pmf.append(max(0.0, 1.0 - math.fsum(pmf)))
+    return np.array(pmf)
+
+@functools.lru_cache(maxsize=32)
+def _hit_targets(max_hp, damage):
+    """after[h, k]: HP h인 유닛이 damage짜리 공격을 k번 맞은 뒤의 HP (0은 사망, 마지막 k는 확정 사망)"""
+    reach = -(-max_hp // damage)
+    after = np.maximum(np.arange(max_hp + 1)[:, None] - np.arange(reach + 1) * damage, 0)
+    after.flags.writeable = False  # 캐시에서 여러 호출이 공유한다
+    return after
+
+def _fire_matrix(max_hp, damage, lam):
+    """T[h, h']: HP h인 유닛이 damage짜리 공격을 Poisson(lam)번 맞고 HP h'가 될 확률"""
+    after = _hit_targets(max_hp, damage)
+    rows = np.broadcast_to(np.arange(max_hp + 1)[:, None], after.shape)
+    pmf = np.broadcast_to(_poisson_pmf(lam, after.shape[1] - 1), after.shape)
+    matrix = np.zeros((max_hp + 1, max_hp + 1))
+    np.add.at(matrix, (rows, after), pmf)  # 확정 사망 이후의 k들은 모두 h'=0에 누적된다
+    return matrix
+
+def _self_cost_matrix(max_hp, cost):
+    """공격마다 HP를 cost만큼 소모하는 유닛(스팀팩)의 HP 전이 행렬"""
+    hp = np.arange(max_hp + 1)
+    matrix = np.zeros((max_hp + 1, max_hp + 1))
+    matrix[hp, np.maximum(hp - cost, 0)] = 1.0
+    return matrix
+
+class _AttritionSide:
+    """
+    predict_battle에서 한 팀의 상태. HP, 피해량, 스팀팩 소모가 같은 유닛을 한 행으로 묶고
+    dist[g, h] = 그룹 g의 유닛 하나가 HP h일 확률 (h=0은 사망)을 라운드마다 갱신한다.
+    """
+    def __init__(self, hp, damage, self_cost, max_hp):
+        rows, self.count = np.unique(np.stack([hp, damage, self_cost], axis=1), axis=0, return_counts=True)
+        hp, self.damage, self.self_cost = rows.T
+        self.dist = np.zeros((len(rows), max_hp + 1))
+        self.dist[np.arange(len(rows)), hp] = 1.0
+        self.cost_matrices = {int(c): _self_cost_matrix(max_hp, int(c)) for c in np.unique(self.self_cost) if c > 0}
+        self.weapons = [(int(d), self.damage == d) for d in np.unique(self.damage) if d > 0]
+
+    def alive(self, dist=None):
+        """그룹별 생존 확률"""
+        return 1.0 - (self.dist if dist is None else dist)[:, 0]
+
+    def pay_self_cost(self):
+        """공격 직전에 스팀팩 HP를 뺀 분포"""
+        dist = self.dist.copy()
+        for cost, matrix in self.cost_matrices.items():
+            rows = self.self_cost == cost
+            dist[rows] = dist[rows] @ matrix
+        return dist
+
+    def fire(self, ready):
+        """피해량별 기대 공격 수. ready: 그룹별로 공격할 수 있는 확률"""
+        weights = ready * self.count
+        return [(damage, float(weights[rows].sum())) for damage, rows in self.weapons]
+
+    def take_fire(self, dist, shots, targets):
+        """살아있는 유닛 한 기가 받는 공격 횟수를 (공격 수 / 표적 기대 수 targets)를 평균으로 하는 포아송 분포로 본다."""
+        alive = float((targets * self.count).sum())
+        for damage, count in shots:
+            if alive > 0 and count > 0:
+                dist = dist @ _fire_matrix(dist.shape[1] - 1, damage, count / alive)
+        return dist
+
+    def wiped(self):
+        """모든 유닛이 쓰러졌을 확률 (유닛끼리 독립이라고 본다)"""
+        return float(np.prod(self.dist[:, 0] ** self.count))
+
+    def expected_alive(self):
+        return float((self.alive() * self.count).sum())
+
+    def condition_on_survival(self, wiped):
+        """전멸하지 않았다는 조건을 건다: P(HP h | 전멸 아님) = P(HP h) / (1 - P(전멸))"""
+        self.dist[:, 1:] /= 1.0 - wiped
+        self.dist[:, 0] = 1.0 - self.dist[:, 1:].sum(axis=1)
+
+def predict_battle(team_a, team_b, max_rounds: int = 100) -> BattlePrediction:
+    """
+    란체스터식 소모 모델로 team_a 대 team_b 전투 결과를 추정한다 (simulate_battle과 같은 규칙).
+
+    고전 란체스터 제곱 법칙은 한 유닛씩 집중 사격해 처치한다고 보지만, 라운드 전투는 무작위 적을 쏘므로
+    피해가 고르게 퍼져 한동안 아무도 쓰러지지 않다가 한꺼번에 쓰러진다. 그래서 유닛마다 HP 분포를 두고,
+    라운드마다 살아있는 적 한 기가 받는 공격 횟수를 포아송 분포로 보는 평균장 근사로 계산한다.
+    라운드 안의 무작위 순서는 그 라운드에 쓰러지는 유닛의 절반이 공격 차례 전에 쓰러진다고 보고, 그 중간
+    시점의 생존 수를 공격자 수와 표적 수로 써서 반영한다.
+
+    라운드가 끝날 때마다 한쪽이 전멸한 확률만큼의 전투를 끝난 것으로 떼어 내고(유닛끼리 독립 가정),
+    계속되는 전투는 두 팀 모두 전멸하지 않았다는 조건을 걸어 이어 간다. 그래서 승률, 생존 수와 라운드 수가
+    몬테카를로 평균과 같은 뜻의 기대값이 된다. 승률이 DECISIVE 미만이면 팽팽한 전투로 보아 winner를
+    None으로 둔다.
+
+    한계: 평균 궤적 하나를 따라가므로 한쪽이 초반 운으로 앞서 나가는 갈림길을 표현하지 못한다. 그래서
+    팽팽한 전투(몬테카를로 승률 35~65%)에서는 승률이 평균 궤적이 유리한 쪽으로 쏠리고(5 고스트 대 8 저글링:
+    0.2 대 몬테카를로 0.5), 동시 전멸을 과대평가해 양쪽 생존 수가 작게 나온다. 전력 차가 분명한 전투에서는
+    승자, 생존 수, 라운드 수가 몬테카를로 평균과 잘 맞는다 (benchmarks/lanchester_calibration.py).
+    저글링의 자동 회복처럼 시간에 따른 효과는 넣지 않는다.
+    """
+    m = combat_matrices(team_a, team_b)
+    a0, b0 = float(len(m["hp_a"])), float(len(m["hp_b"]))
+    if a0 == 0 or b0 == 0:
+        winner = None if a0 == b0 else (0 if a0 else 1)
+        return BattlePrediction(winner, (a0, b0), 0.0, float(winner == 0))
+
+    max_hp = int(max(m["hp_a"].max(), m["hp_b"].max()))
+    sides = (_AttritionSide(m["hp_a"], m["damage_ab"][:, 0], m["self_cost_a"], max_hp),
+             _AttritionSide(m["hp_b"], m["damage_ba"][:, 0], m["self_cost_b"], max_hp))
+    ongoing = 1.0            # 아직 끝나지 않은 전투의 확률
+    win = [0.0, 0.0]
+    survivors = [0.0, 0.0]   # 끝난 전투의 생존 수 기대값 (확률 가중 합)
+    rounds = 0.0
+    for rnd in range(1, max_rounds + 1):
+        paid = [side.pay_self_cost() for side in sides]
+        ready = [side.alive(dist) for side, dist in zip(sides, paid)]
+        present = ready
+        # 1차로 이번 라운드 사망 확률을 구하고, 2차에서는 그중 절반이 쓰러진 라운드 중간 시점의 생존 수를
+        # 공격자 수와 표적 수로 쓴다 (먼저 쓰러진 유닛은 쏘지 못하고, 남은 공격은 생존자에게 몰린다)
+        for _ in range(2):
+            after = [side.take_fire(dist, sides[1 - i].fire(present[1 - i]), present[i])
+                     for i, (side, dist) in enumerate(zip(sides, paid))]
+            present = [r - (r - side.alive(dist)) / 2 for side, r, dist in zip(sides, ready, after)]
+        for side, dist in zip(sides, after):
+            side.dist = dist
+
+        wiped = [side.wiped() for side in sides]
+        alive = [side.expected_alive() for side in sides]
+        for i in (0, 1):
+            # i가 살아남고 상대가 전멸한 전투: i의 생존 수는 "i 전멸 아님" 조건부 기대값
+            ended = ongoing * wiped[1 - i] * (1.0 - wiped[i])
+            win[i] += ended
+            if ended:
+                survivors[i] += ended * alive[i] / (1.0 - wiped[i])
+        finished = ongoing * (1.0 - (1.0 - wiped[0]) * (1.0 - wiped[1]))
+        rounds += finished * rnd
+        ongoing -= finished
+        if ongoing < 1e-4:
+            break
+        for side, w in zip(sides, wiped):
+            side.condition_on_survival(w)
+    else:
+        # 라운드 제한까지 끝나지 않은 전투
+        rounds += ongoing * max_rounds
+        for i, side in enumerate(sides):
+            survivors[i] += ongoing * side.expected_alive()
+
+    p_a = win[0]
+    winner = 0 if p_a >= BattlePrediction.DECISIVE else 1 if win[1] >= BattlePrediction.DECISIVE else None
+    return BattlePrediction(winner, tuple(survivors), rounds, p_a)
+
+def simulate_battle(team_a, team_b, rng: random.Random = None, max_rounds: int = 100):
+    """
+    predict_battle과 같은 규칙의 라운드 전투 한 판 (몬테카를로 비교용, 유닛 상태가 바뀐다).
+    매 라운드 살아있는 유닛이 무작위 순서로 무작위 적을 공격한다.
+    반환: (winner, (team_a 생존 수, team_b 생존 수), 라운드 수)
+    """
+    rng = rng or random.Random()
+    teams = (list(team_a), list(team_b))
+    alive = tuple(sum(u.is_alive for u in team) for team in teams)
+    rounds = 0
+    while all(alive) and rounds < max_rounds:
+        rounds += 1
+        order = [(side, u) for side, team in enumerate(teams) for u in team if u.is_alive]
+        rng.shuffle(order)
+        for side, unit in order:
+            if not unit.is_alive:
+                continue
+            enemies = [e for e in teams[1 - side] if e.is_alive]
+            if not enemies:
+                break
+            unit.attack(rng.choice(enemies))
+        alive = tuple(sum(u.is_alive for u in team) for team in teams)
+    if all(alive) or not any(alive):
+        return None, alive, rounds
+    return (0 if alive[0] else 1), alive, rounds
+
 # --- 시뮬레이션 실행 코드 ---
 if __name__ == "__main__":
+    configure_logging()
     reporter = ConsoleReporter()   # DIP: 구체 구현을 여기에서 주입
     game_manager = GameManager(reporter)
     game_manager.run_scenario()
+    game_manager.shutdown()
@@ -0,0 +1,50 @@
+"""
+asyncio 모드(AsyncGameManager)에서 한 코어가 동시에 몇 개의 전투를 감당하는지 측정한다.
+
+전투 N개를 하나의 이벤트 루프에서 동시에 돌리고, 전체 소요 시간과
+이벤트 루프 지연(예정보다 늦게 깨어난 시간)을 기록한다. 소요 시간이
+전투 하나의 시나리오 시간과 거의 같으면 그 수의 전투를 실시간으로 감당한 것이다.
+
+실행: python benchmarks/async_battles.py [N ...]
+"""
+import asyncio
+import sys
+import threading
+import time
+
+from common import load_module, silenced
+
+final = load_module("starcraft_final")
+
+async def _measure_lag(stop, interval=0.05):
+    worst = 0.0
+    while not stop.is_set():
+        before = time.monotonic()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.monotonic() - before - interval)
+    return worst
+
+async def _run(count):
+    stop = asyncio.Event()
+    lag_task = asyncio.create_task(_measure_lag(stop))
+    start = time.perf_counter()
+    await final.run_concurrent_battles(count, final.NullReporter)
+    elapsed = time.perf_counter() - start
+    stop.set()
+    return elapsed, await lag_task
+
+def bench(count):
+    with silenced():
+        elapsed, lag = asyncio.run(_run(count))
+    return {"battles": count, "seconds": elapsed, "max_loop_lag": lag,
+            "threads": threading.active_count()}
+
+if __name__ == "__main__":
+    counts = [int(a) for a in sys.argv[1:]] or [1, 10, 100, 1000]
+    baseline = None
+    print(f"{'battles':>8} {'seconds':>8} {'slowdown':>9} {'max lag(s)':>11} {'threads':>8}")
+    for count in counts:
+        r = bench(count)
+        baseline = baseline or r["seconds"]
+        print(f"{r['battles']:>8} {r['seconds']:>8.2f} {r['seconds'] / baseline:>8.2f}x "
+              f"{r['max_loop_lag']:>11.4f} {r['threads']:>8}")
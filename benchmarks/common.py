@@ -0,0 +1,40 @@
+"""벤치마크 스크립트 공용 도우미: 단원별 시뮬레이터 모듈을 현재 작업 트리나 git 리비전에서 불러온다."""
+import contextlib
+import importlib.util
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+# git 리비전에서 꺼낸 모듈은 임시 파일로 불러오므로 공용 패키지(starcraft_common)를 여기서 찾게 한다
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+MODULES = {
+    "starcraft_advanced": os.path.join("3 단원", "starcraft_advanced.py"),
+    "starcraft_enum": os.path.join("4 단원", "starcraft_enum.py"),
+    "starcraft_final": os.path.join("5 단원", "starcraft_final.py"),
+}
+
+def load_module(name, rev=None):
+    """MODULES의 시뮬레이터를 불러온다. rev를 주면 그 git 리비전의 파일을 불러온다."""
+    path = os.path.join(ROOT, MODULES[name])
+    label = name
+    if rev is not None:
+        source = subprocess.run(["git", "show", f"{rev}:{MODULES[name]}"], cwd=ROOT,
+                                check=True, capture_output=True).stdout
+        with tempfile.NamedTemporaryFile("wb", suffix=".py", delete=False) as f:
+            f.write(source)
+        path, label = f.name, f"{name}_{rev}"
+    spec = importlib.util.spec_from_file_location(label, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[label] = module
+    spec.loader.exec_module(module)
+    return module
+
+@contextlib.contextmanager
+def silenced():
+    """유닛 코드의 print 출력을 버린다."""
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
@@ -0,0 +1,59 @@
+"""
+진행 중인 Game의 중간 상태 하나에서 분기를 반복해서 만드는 속도를 측정한다.
+Game.fork(snapshot)과 copy.deepcopy(game)을 비교하고, 분기를 끝까지 진행한 처리량도 잰다.
+
+실행: python benchmarks/game_fork.py [--units 2] [--turn 7] [-n 2000]
+"""
+import argparse
+import copy
+import time
+
+from common import load_module, silenced
+
+def make_game(module, scale, use_ranges):
+    teams = [{module.Marine: 3 * scale, module.Ghost: scale},
+             {module.Zergling: 3 * scale},
+             {module.Zealot: 2 * scale},
+             {module.Wraith: 2 * scale}]
+    players = module.build_players(teams)
+    if use_ranges:
+        for i, u in enumerate(u for team in players for u in team):
+            u.x, u.y = (i * 7) % 40, (i * 13) % 40
+    return module.Game(players, max_turns=200, seed=1, verbose=False, use_ranges=use_ranges)
+
+def rate(count, fn):
+    start = time.perf_counter()
+    for _ in range(count):
+        fn()
+    elapsed = time.perf_counter() - start
+    return count / elapsed
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--units", type=int, default=2, help="팀 구성 배수 (1이면 유닛 10개)")
+    parser.add_argument("--turn", type=int, default=7, help="분기할 턴")
+    parser.add_argument("-n", "--count", type=int, default=2000)
+    parser.add_argument("--ranges", action="store_true", help="use_ranges=True로 실행")
+    args = parser.parse_args()
+
+    module = load_module("starcraft_advanced")
+    game = make_game(module, args.units, args.ranges)
+    with silenced():
+        for t in range(1, args.turn + 1):
+            game.step(t)
+            game.turns_played = t
+        snapshot = game.snapshot()
+
+        results = {
+            "snapshot": rate(args.count, game.snapshot),
+            "restore": rate(args.count, lambda: game.restore(snapshot)),
+            "fork": rate(args.count, lambda: game.fork(snapshot)),
+            "deepcopy": rate(max(1, args.count // 10), lambda: copy.deepcopy(game)),
+            "fork+resume": rate(max(1, args.count // 10), lambda: game.fork(snapshot).resume()),
+        }
+    print(f"{len(game.all_units)} units, branch at turn {args.turn}")
+    for label, per_sec in results.items():
+        print(f"{label:>12}: {per_sec:12,.0f} /s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+란체스터식 예측(predict_battle)을 몬테카를로 라운드 전투(simulate_battle)와 비교하는 보정 리포트.
+시나리오마다 예측값과 n판 시뮬레이션의 평균을 나란히 보여주고, 예측 한 번에 걸리는 시간을 잰다.
+승자 일치는 양쪽 모두 BattlePrediction.DECISIVE 이상의 승률일 때만 승자로 보는 같은 기준으로 센다.
+기준 시뮬레이터가 run_batch(3 단원)가 아닌 이유: run_batch는 3 단원의 유닛(위치, 사거리, 클로킹)으로
+돌아가므로 5 단원 유닛의 업그레이드/스팀팩 규칙을 재지 못한다. simulate_battle은 실제 5 단원 유닛의
+attack()을 그대로 부른다.
+
+실행: python benchmarks/lanchester_calibration.py [-n 500]
+"""
+import argparse
+import random
+import statistics
+import time
+
+from common import load_module
+
+def build_team(module, reporter, spec):
+    """spec: (UnitType 이름, 수, 무기 업그레이드 단계, 스팀팩 사용 여부)"""
+    type_name, count, upgrades, stim = spec
+    factory = module.UnitFactory()
+    team = []
+    for i in range(count):
+        unit = factory.create_unit(module.UnitType[type_name], f"{type_name}{i + 1}")
+        unit.reporter = reporter
+        if stim:
+            unit.set_strategy(module.StimpackStrategy())
+        for _ in range(upgrades):
+            unit = module.DamageUpgradeDecorator(unit)
+        team.append(unit)
+    return team
+
+SCENARIOS = [
+    (("MARINE", 10, 0, False), ("ZERGLING", 10, 0, False)),
+    (("MARINE", 10, 0, False), ("ZERGLING", 14, 0, False)),
+    (("MARINE", 10, 0, True), ("ZERGLING", 14, 0, False)),
+    (("MARINE", 8, 2, False), ("ZERGLING", 12, 0, False)),
+    (("MARINE", 20, 0, False), ("ZERGLING", 30, 0, False)),
+    (("GHOST", 5, 0, False), ("ZERGLING", 8, 0, False)),
+    (("GHOST", 6, 1, False), ("MARINE", 8, 0, False)),
+    (("ZERGLING", 8, 0, False), ("ZERGLING", 8, 0, False)),
+]
+
+def label(spec):
+    type_name, count, upgrades, stim = spec
+    return f"{count} {type_name.lower()}" + (f" +{upgrades}" if upgrades else "") + (" stim" if stim else "")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", "--trials", type=int, default=500, help="시나리오당 몬테카를로 판 수")
+    args = parser.parse_args()
+
+    module = load_module("starcraft_final")
+    reporter = module.NullReporter()
+    print(f"{'scenario':<34} {'winner':>6} {'P(A) pred':>9} {'P(A) MC':>8} {'surv pred':>11} {'surv MC':>11} "
+          f"{'rnd pred':>8} {'rnd MC':>7} {'predict':>9}")
+    agree = 0
+    for spec_a, spec_b in SCENARIOS:
+        team_a = build_team(module, reporter, spec_a)
+        team_b = build_team(module, reporter, spec_b)
+        start = time.perf_counter()
+        for _ in range(100):
+            prediction = module.predict_battle(team_a, team_b)
+        predict_us = (time.perf_counter() - start) / 100 * 1e6
+
+        outcomes = [module.simulate_battle(build_team(module, reporter, spec_a),
+                                           build_team(module, reporter, spec_b), random.Random(seed))
+                    for seed in range(args.trials)]
+        win_a = sum(winner == 0 for winner, _, _ in outcomes) / len(outcomes)
+        win_b = sum(winner == 1 for winner, _, _ in outcomes) / len(outcomes)
+        decisive = module.BattlePrediction.DECISIVE
+        mc_winner = 0 if win_a >= decisive else 1 if win_b >= decisive else None
+        agree += prediction.winner == mc_winner
+        mc_a = statistics.mean(alive[0] for _, alive, _ in outcomes)
+        mc_b = statistics.mean(alive[1] for _, alive, _ in outcomes)
+        mc_rounds = statistics.mean(rounds for _, _, rounds in outcomes)
+
+        names = {0: "A", 1: "B", None: "-"}
+        pred_a, pred_b = prediction.survivors
+        print(f"{label(spec_a) + ' vs ' + label(spec_b):<34} {names[prediction.winner]:>6} "
+              f"{prediction.win_probability:>9.2f} {win_a:>8.2f} "
+              f"{pred_a:>5.1f}/{pred_b:<5.1f} {mc_a:>5.1f}/{mc_b:<5.1f} "
+              f"{prediction.rounds:>8.1f} {mc_rounds:>7.1f} {predict_us:>7.0f}us")
+    print(f"\n승자 예측 일치: {agree}/{len(SCENARIOS)} (승률 {module.BattlePrediction.DECISIVE:.2f} 이상을 승자로, 시나리오당 {args.trials}판)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+여러 스레드가 같은 유닛들에 피해(take_damage)와 재생(_regenerate_once)을 동시에 가하는 스트레스 테스트.
+  none:   동기화 없음 (스레드 전환이 읽기-수정-쓰기 사이에 끼면 갱신을 잃는다)
+  lock:   전역 락 하나로 모든 변경을 감싼다
+  queue:  MutationQueue로 유닛마다 작성자 스레드 하나가 변경을 적용한다 (--shards)
+읽기 스레드는 여러 속성을 한 번에 읽는다 (lock은 같은 락을 잡고, queue는 unit.state() 스냅샷을 락 없이 읽는다).
+모드마다 기대 HP와 실제 HP의 차이(잃은 갱신 수)와 초당 처리한 변경+읽기 수를 출력한다.
+
+실행: python benchmarks/mutation_queue.py [--units 200] [--threads 4] [--readers 4] [--ops 50000] [--shards 1 2 4]
+"""
+import argparse
+import sys
+import threading
+import time
+
+from common import load_module
+
+START_HP = 10**8  # 재생이 최대치에 막히거나 유닛이 죽지 않도록 충분히 크게 둔다
+
+def make_units(module, count):
+    reporter = module.NullReporter()
+    units = []
+    for i in range(count):
+        unit = module.Zergling(f"저글링{i}")
+        unit.reporter = reporter
+        unit.max_hp = 2 * START_HP
+        unit.hp = START_HP
+        units.append(unit)
+    return units
+
+def run(module, mode, args, shards=1):
+    units = make_units(module, args.units)
+    queue = None
+    lock = threading.Lock()
+    if mode == "queue":
+        queue = module.MutationQueue(shards)
+        for unit in units:
+            queue.attach(unit)
+
+    if mode == "lock":
+        def damage(unit):
+            with lock:
+                unit.take_damage(1)
+
+        def regen(unit):
+            with lock:
+                unit._regenerate_once()
+
+        def read(unit):
+            # 여러 속성을 어긋나지 않게 읽으려면 읽기도 같은 락을 잡아야 한다
+            with lock:
+                return unit._snapshot_state()
+    else:
+        def damage(unit):
+            unit.take_damage(1)
+
+        def regen(unit):
+            unit._regenerate_once()
+
+        def read(unit):
+            return unit.state()
+
+    def attacker(offset):
+        count = len(units)
+        for i in range(args.ops):
+            damage(units[(i + offset) % count])
+
+    def regenerator():
+        # 재생 틱 스레드 흉내: 모든 유닛을 돌며 회복한다
+        for _ in range(args.ops // len(units)):
+            for unit in units:
+                regen(unit)
+
+    def reader(offset):
+        count = len(units)
+        for i in range(args.ops):
+            read(units[(i + offset) % count])
+
+    workers = [threading.Thread(target=attacker, args=(k * 7,)) for k in range(args.threads)]
+    workers.append(threading.Thread(target=regenerator))
+    workers.extend(threading.Thread(target=reader, args=(k * 13,)) for k in range(args.readers))
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    if queue is not None:
+        queue.flush()
+    elapsed = time.perf_counter() - start
+
+    regens = (args.ops // len(units)) * len(units)
+    operations = (args.threads + args.readers) * args.ops + regens
+    expected = len(units) * START_HP - args.threads * args.ops + regens * module.GameConfig.ZERGLING_HP_REGEN_RATE
+    # queue 모드에서는 작성자 스레드가 게시한 스냅샷으로 읽는다 (락 없는 읽기)
+    actual = sum(unit.state().hp for unit in units)
+    if queue is not None:
+        queue.close()
+    return operations / elapsed, abs(expected - actual)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--units", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=4, help="피해를 가하는 스레드 수 (재생 스레드 1개는 별도)")
+    parser.add_argument("--ops", type=int, default=50_000, help="스레드당 피해 호출 수")
+    parser.add_argument("--readers", type=int, default=4, help="상태 스냅샷을 읽는 스레드 수")
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--switch-interval", type=float, default=1e-5,
+                        help="sys.setswitchinterval 값 (작을수록 스레드가 자주 바뀌어 경쟁이 드러난다)")
+    args = parser.parse_args()
+
+    module = load_module("starcraft_final")
+    old_interval = sys.getswitchinterval()
+    sys.setswitchinterval(args.switch_interval)
+    try:
+        runs = [("none", 1), ("lock", 1)] + [("queue", shards) for shards in args.shards]
+        for mode, shards in runs:
+            rate, lost = run(module, mode, args, shards)
+            label = f"queue x{shards}" if mode == "queue" else mode
+            print(f"{label:>10}: {rate:12,.0f} ops/s, 잃은 갱신 {lost}")
+    finally:
+        sys.setswitchinterval(old_interval)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+영역 분할 엔진(ShardedGame)의 턴 처리량을 영역(워커 프로세스) 수별로 잰다.
+기준은 같은 규칙의 한 프로세스 구현 Game(use_ranges=True, simultaneous=True)이고,
+모든 영역 수에서 최종 상태가 기준과 같은지 확인한다 (다르면 종료 코드 1).
+비교용으로 순차 처리 Game(use_ranges=True)의 처리량도 출력한다 (규칙이 달라 결과는 다르다).
+병렬 이득은 코어 수에 달려 있으므로 CPU 수를 함께 출력한다. 코어가 하나뿐이면 영역을 늘려도 느려지기만 한다.
+
+실행: python benchmarks/sharded_game.py [--units 20000] [--turns 10] [--regions 1 2 4 8]
+"""
+import argparse
+import os
+import sys
+import time
+
+from common import load_module
+
+def make_players(module, units, seed):
+    scale = max(1, units // 10)  # 팀 구성 한 벌이 유닛 10개
+    teams = [{module.Marine: 3 * scale, module.Ghost: scale},
+             {module.Zergling: 3 * scale},
+             {module.Zealot: 2 * scale},
+             {module.Wraith: scale}]
+    players = module.build_players(teams)
+    side = (10 * scale) ** 0.5 * 6  # 유닛 수와 상관없이 밀도를 일정하게 둔다
+    for unit in (u for team in players for u in team):
+        unit.max_hp = unit.hp = 10**9  # 턴 수를 채우도록 아무도 죽지 않게 한다
+    return module.scatter_players(players, side, side, seed)
+
+def final_state(units):
+    return [(u.hp, u.x, u.y) for u in units]
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--units", type=int, default=20_000)
+    parser.add_argument("--turns", type=int, default=10)
+    parser.add_argument("--regions", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    module = load_module("starcraft_advanced")
+    print(f"CPU {os.cpu_count()}개, 유닛 {args.units}, {args.turns}턴")
+
+    reference = None
+    for label, simultaneous in (("Game", False), ("Game 동시", True)):
+        game = module.Game(make_players(module, args.units, args.seed), max_turns=args.turns,
+                           seed=args.seed, verbose=False, use_ranges=True, simultaneous=simultaneous)
+        with module.quiet_logging():
+            start = time.perf_counter()
+            game.run()
+            elapsed = time.perf_counter() - start
+        print(f"{label:>14}: {game.turns_played / elapsed:8.2f} turns/s")
+        if simultaneous:
+            reference = final_state(game.all_units)
+
+    mismatched = False
+    for regions in args.regions:
+        game = module.ShardedGame(make_players(module, args.units, args.seed), regions=regions,
+                                  max_turns=args.turns, seed=args.seed, processes=regions > 1)
+        start = time.perf_counter()
+        game.run()
+        elapsed = time.perf_counter() - start
+        match = final_state(game.all_units) == reference
+        mismatched |= not match
+        print(f"{f'Sharded x{regions}':>14}: {game.turns_played / elapsed:8.2f} turns/s  "
+              f"(Game 동시와 결과 {'같음' if match else '다름!'})")
+    if mismatched:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
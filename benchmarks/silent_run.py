@@ -0,0 +1,48 @@
+"""
+출력 없이 Game을 돌릴 때의 턴 처리량(turns/s)을 측정한다.
+  devnull: 로그를 켠 채 stdout만 버린다 (메시지 포맷 비용을 그대로 낸다)
+  quiet:   quiet_logging()으로 로그를 끈다 (이벤트를 포맷하지 않는다)
+
+실행: python benchmarks/silent_run.py [--scale 20] [--turns 50] [--against REV]
+"""
+import argparse
+import contextlib
+import time
+
+from common import load_module, silenced
+
+def bench(module, scale, turns, quiet):
+    teams = [{module.Marine: 3 * scale, module.Ghost: scale},
+             {module.Zergling: 3 * scale},
+             {module.Zealot: 2 * scale},
+             {module.Wraith: 2 * scale}]
+    players = module.build_players(teams)
+    for unit in (u for team in players for u in team):
+        unit.max_hp = unit.hp = 10**9  # 모든 턴에서 모든 유닛이 행동하도록 아무도 죽지 않게 한다
+    game = module.Game(players, max_turns=turns, seed=1, verbose=False)
+    with module.quiet_logging() if quiet else contextlib.nullcontext(), silenced():
+        start = time.perf_counter()
+        game.run()
+        elapsed = time.perf_counter() - start
+    return game.turns_played / elapsed, len(game.all_units)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scale", type=int, default=20, help="팀 구성 배수 (1이면 유닛 10개)")
+    parser.add_argument("--turns", type=int, default=50)
+    parser.add_argument("--against", help="비교할 git 리비전 (quiet_logging이 없으면 devnull만 측정)")
+    args = parser.parse_args()
+
+    runs = [("current", load_module("starcraft_advanced"))]
+    # devnull 모드가 실제로 메시지를 포맷하도록 콘솔 로깅을 켠다 (예전 리비전은 임포트할 때 스스로 켠다)
+    runs[0][1].configure_logging()
+    if args.against:
+        runs.insert(0, (args.against, load_module("starcraft_advanced", args.against)))
+    for label, module in runs:
+        modes = ["devnull"] + (["quiet"] if hasattr(module, "quiet_logging") else [])
+        for mode in modes:
+            rate, units = bench(module, args.scale, args.turns, mode == "quiet")
+            print(f"{label:>10} {mode:>8}: {rate:10,.1f} turns/s ({units} units)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""
+시뮬레이터 전반의 성능 지표를 한 번에 재고 JSON으로 남기는 벤치마크 모음.
+  game_turns:  starcraft_advanced.Game 턴 처리량 (유닛 10 / 1천 / 10만)
+  final_units: starcraft_final GameManager 유닛 생성 처리량과 공격 처리량
+  bulk_spawn:  starcraft_final 저글링 웨이브 생성 시간 (create_unit 반복 vs create_units)
+  enum_regen:  starcraft_enum 재생 모델의 부하 중 스레드 수와 유닛당 메모리
+               (유닛마다 스레드를 띄우던 저장소 첫 리비전 vs 현재 트리의 TickScheduler)
+  decorator:   starcraft_final UnitDecorator 속성 읽기 비용 (감싼 겹 수별)
+
+실행: python benchmarks/suite.py [--quick] [--only NAME ...] [--output out.json] [--compare old.json]
+"""
+import argparse
+import gc
+import json
+import platform
+import subprocess
+import sys
+import threading
+import time
+import timeit
+import tracemalloc
+from datetime import datetime, timezone
+
+from common import ROOT, load_module, silenced
+
+def bench_game_turns(quick):
+    module = load_module("starcraft_advanced")
+    # (유닛 수, 측정 턴 수): 유닛이 많을수록 턴을 줄여 전체 시간을 비슷하게 맞춘다
+    sizes = [(10, 200), (1_000, 20), (100_000, 3)] if not quick else [(10, 50), (1_000, 5), (10_000, 1)]
+    results = {}
+    for units, turns in sizes:
+        scale = units // 10  # 팀 구성 한 벌이 유닛 10개
+        teams = [{module.Marine: 3 * scale, module.Ghost: scale},
+                 {module.Zergling: 3 * scale},
+                 {module.Zealot: 2 * scale},
+                 {module.Wraith: scale}]
+        players = module.build_players(teams)
+        for unit in (u for team in players for u in team):
+            unit.max_hp = unit.hp = 10**9  # 모든 턴에서 모든 유닛이 행동하도록 아무도 죽지 않게 한다
+        game = module.Game(players, max_turns=turns, seed=1, verbose=False)
+        with module.quiet_logging(), silenced():
+            start = time.perf_counter()
+            game.run()
+            elapsed = time.perf_counter() - start
+        results[str(len(game.all_units))] = {
+            "turns": game.turns_played,
+            "turns_per_s": game.turns_played / elapsed,
+            "unit_actions_per_s": game.turns_played * len(game.all_units) / elapsed,
+        }
+    return results
+
+def bench_final_units(quick):
+    module = load_module("starcraft_final")
+    count = 2_000 if quick else 20_000
+    manager = module.GameManager(module.NullReporter(), clock=module.VirtualClock())
+    start = time.perf_counter()
+    marines = [manager.create_unit(module.UnitType.MARINE, f"마린{i}") for i in range(count)]
+    create_s = time.perf_counter() - start
+    zerglings = [manager.create_unit(module.UnitType.ZERGLING, f"저글링{i}") for i in range(count)]
+    for unit in zerglings:
+        unit.max_hp = unit.hp = 10**9  # 공격 대상이 죽어 등록 해제 비용이 섞이지 않도록 한다
+
+    rounds = 5
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for attacker, target in zip(marines, zerglings):
+            attacker.attack(target)
+    attack_s = time.perf_counter() - start
+    manager.shutdown()
+    return {
+        "units": count,
+        "create_per_s": count / create_s,
+        "attacks_per_s": count * rounds / attack_s,
+    }
+
+def bench_bulk_spawn(quick):
+    module = load_module("starcraft_final")
+    count = 10_000 if quick else 100_000
+    results = {"units": count}
+    for label in ("create_unit", "create_units"):
+        manager = module.GameManager(module.NullReporter(), clock=module.VirtualClock())
+        start = time.perf_counter()
+        if label == "create_unit":
+            for i in range(count):
+                manager.create_unit(module.UnitType.ZERGLING, f"저글링{i + 1}")
+        else:
+            manager.create_units(module.UnitType.ZERGLING, count)
+        results[f"{label}_s"] = time.perf_counter() - start
+        manager.shutdown()
+    return results
+
+def _root_rev():
+    return subprocess.run(["git", "rev-list", "--max-parents=0", "HEAD"], cwd=ROOT,
+                          check=True, capture_output=True, text=True).stdout.split()[0]
+
+def _enum_regen_load(module, count):
+    gc.collect()
+    threads_before = set(threading.enumerate())
+    with silenced():
+        tracemalloc.start()
+        manager = module.GameManager()  # RealClock: 재생/효과 만료가 실제 시간으로 돈다
+        for i in range(count):
+            manager.create_unit(module.UnitType.ZERGLING if i % 2 else module.UnitType.GHOST, f"유닛{i}")
+        time.sleep(0.2)  # 재생 틱이 몇 번 돌도록 둔다
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        threads_under_load = threading.active_count()
+        if hasattr(manager, "shutdown"):
+            manager.shutdown()
+        else:
+            # 스레드 모델에는 종료 API가 없다: 유닛을 죽이면 재생 루프가 다음 틱(1초) 뒤에 끝난다.
+            # 다음 측정에 섞이지 않도록 (출력도 버려지는 동안) 모두 끝나기를 기다린다.
+            for unit in manager.units:
+                unit.is_alive = False
+            for thread in set(threading.enumerate()) - threads_before:
+                thread.join()
+    return {
+        "threads_added": threads_under_load - len(threads_before),
+        "bytes_per_unit": current / count,
+        "peak_bytes": peak,
+    }
+
+def bench_enum_regen(quick):
+    """
+    baseline: 저장소 첫 리비전의 starcraft_enum (재생 믹스인이 유닛마다 스레드를 띄운다)
+    current:  현재 트리 (TickScheduler 스레드 하나가 모든 유닛의 재생을 돌린다)
+    """
+    counts = [100, 1_000] if quick else [100, 1_000, 10_000]
+    results = {}
+    for label, module in (("baseline", load_module("starcraft_enum", _root_rev())),
+                          ("current", load_module("starcraft_enum"))):
+        results[label] = {str(count): _enum_regen_load(module, count) for count in counts}
+    return results
+
+def bench_decorator(quick):
+    module = load_module("starcraft_final")
+    reads = 20_000 if quick else 200_000
+    unit = module.UnitFactory().create_unit(module.UnitType.MARINE, "마린")
+    unit.reporter = module.NullReporter()
+    layers = {0: unit}
+    wrapped = unit
+    for depth in range(1, 6):
+        wrapped = module.DamageUpgradeDecorator(wrapped)
+        layers[depth] = wrapped
+    results = {}
+    for depth in (0, 1, 5):
+        target = layers[depth]
+        per_attr = {}
+        for attr in ("power", "hp", "name", "journal"):  # journal은 __getattr__ 위임 경로
+            timer = timeit.Timer(f"u.{attr}", globals={"u": target})
+            per_attr[attr] = min(timer.repeat(repeat=3, number=reads)) / reads * 1e9
+        results[f"layers_{depth}"] = {f"{attr}_ns": ns for attr, ns in per_attr.items()}
+    return results
+
+BENCHMARKS = {
+    "game_turns": bench_game_turns,
+    "final_units": bench_final_units,
+    "bulk_spawn": bench_bulk_spawn,
+    "enum_regen": bench_enum_regen,
+    "decorator": bench_decorator,
+}
+
+def _git_rev():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              check=True, capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def _flatten(data, prefix=""):
+    for key, value in data.items():
+        if isinstance(value, dict):
+            yield from _flatten(value, f"{prefix}{key}.")
+        else:
+            yield f"{prefix}{key}", value
+
+def compare(old, new):
+    """두 결과의 같은 지표를 나란히 출력한다 (숫자가 아니거나 한쪽에만 있는 지표는 건너뛴다)."""
+    old_values = dict(_flatten(old["results"]))
+    for key, value in _flatten(new["results"]):
+        before = old_values.get(key)
+        if isinstance(value, (int, float)) and isinstance(before, (int, float)) and before:
+            print(f"{key:<48} {before:>14,.1f} -> {value:>14,.1f} ({value / before - 1:+7.1%})")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--quick", action="store_true", help="규모를 줄여 빨리 돈다 (CI/스모크 용)")
+    parser.add_argument("--only", nargs="+", choices=BENCHMARKS, help="지정한 벤치마크만 돈다")
+    parser.add_argument("--output", help="결과를 저장할 JSON 경로 (없으면 stdout)")
+    parser.add_argument("--compare", help="이전 결과 JSON과 지표를 비교해 출력한다")
+    args = parser.parse_args()
+
+    report = {
+        "meta": {
+            "git_rev": _git_rev(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "quick": args.quick,
+        },
+        "results": {},
+    }
+    for name in args.only or BENCHMARKS:
+        start = time.perf_counter()
+        report["results"][name] = BENCHMARKS[name](args.quick)
+        print(f"{name}: {time.perf_counter() - start:.1f}s", file=sys.stderr)
+
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(json.load(f), report)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+starcraft_advanced 유닛의 유닛당 메모리(바이트)와 생성 처리량을 측정한다.
+
+--against REV를 주면 해당 git 리비전의 starcraft_advanced.py도 같은 방식으로 측정해
+나란히 보여준다 (예: __slots__ 적용 전후 비교).
+
+실행: python benchmarks/unit_memory.py [-n 1000000] [--against REV]
+"""
+import argparse
+import gc
+import sys
+import time
+import tracemalloc
+
+from common import load_module
+
+UNIT_TYPES = ("Marine", "Zergling", "Zealot", "Ghost", "Wraith")
+
+def bytes_per_unit(cls, sample):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    units = [cls(name="u") for _ in range(sample)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # 리스트 자체(포인터 배열)는 제외
+    return (after - before - sys.getsizeof(units)) / sample
+
+def creation_rate(cls, count):
+    gc.collect()
+    start = time.perf_counter()
+    units = [cls(name="u") for _ in range(count)]
+    elapsed = time.perf_counter() - start
+    del units
+    return count / elapsed
+
+def measure(module, count, sample):
+    results = {}
+    for name in UNIT_TYPES:
+        cls = getattr(module, name)
+        results[name] = {"bytes_per_unit": bytes_per_unit(cls, sample),
+                         "units_per_sec": creation_rate(cls, count)}
+    return results
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", "--count", type=int, default=1_000_000, help="처리량 측정용 생성 수")
+    parser.add_argument("--sample", type=int, default=100_000, help="메모리 측정용 생성 수")
+    parser.add_argument("--against", help="비교할 git 리비전")
+    args = parser.parse_args()
+
+    columns = [("current", load_module("starcraft_advanced"))]
+    if args.against:
+        columns.insert(0, (args.against, load_module("starcraft_advanced", args.against)))
+
+    measured = [(label, measure(module, args.count, args.sample)) for label, module in columns]
+    print(f"{'unit':<10}" + "".join(f"{label + ' B/unit':>21} {label + ' units/s':>21}" for label, _ in measured))
+    for name in UNIT_TYPES:
+        row = f"{name:<10}"
+        for _, results in measured:
+            r = results[name]
+            row += f"{r['bytes_per_unit']:>21.0f} {r['units_per_sec']:>21,.0f}"
+        print(row)
+
+if __name__ == "__main__":
+    main()
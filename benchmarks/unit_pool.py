@@ -0,0 +1,70 @@
+"""
+유닛 생성과 사망이 반복되는 전투에서 UnitPool 재사용 효과를 잰다.
+한 사이클 = 유닛 --wave개를 create_unit으로 하나씩 만들고 모두 죽인다 (사망 처리에서 풀에 돌아간다).
+풀 사용/미사용마다 초당 사이클 수, 유닛당 시간, GC 수집 횟수(세대별)와 GC로 멈춘 총 시간을 출력한다.
+create_units는 생성 중 GC를 멈추므로 여기서는 하나씩 만드는 경로로 잰다.
+
+실행: python benchmarks/unit_pool.py [--cycles 200] [--wave 500] [--survivors 20000]
+"""
+import argparse
+import gc
+import time
+
+from common import load_module
+
+class GCWatch:
+    """gc.callbacks로 세대별 수집 횟수와 수집에 걸린 시간을 모은다."""
+    def __init__(self):
+        self.counts = [0, 0, 0]
+        self.pause = 0.0
+        self._start = None
+
+    def __call__(self, phase, info):
+        if phase == "start":
+            self._start = time.perf_counter()
+        elif self._start is not None:
+            self.pause += time.perf_counter() - self._start
+            self.counts[info["generation"]] += 1
+            self._start = None
+
+def run(module, args, pooled):
+    pool = module.UnitPool() if pooled else None
+    manager = module.GameManager(module.NullReporter(), clock=module.VirtualClock(), unit_pool=pool)
+    # 오래 살아남는 유닛이 많을수록 상위 세대 수집 한 번이 비싸진다
+    manager.create_units(module.UnitType.MARINE, args.survivors)
+    kinds = [module.UnitType.ZERGLING, module.UnitType.MARINE, module.UnitType.GHOST]
+    gc.collect()
+    watch = GCWatch()
+    gc.callbacks.append(watch)
+    try:
+        start = time.perf_counter()
+        for cycle in range(args.cycles):
+            unit_type = kinds[cycle % len(kinds)]
+            wave = [manager.create_unit(unit_type, f"유닛{i}") for i in range(args.wave)]
+            for unit in wave:
+                unit.take_damage(10**6)
+        elapsed = time.perf_counter() - start
+    finally:
+        gc.callbacks.remove(watch)
+    manager.shutdown()
+    return elapsed, watch, pool
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cycles", type=int, default=200)
+    parser.add_argument("--wave", type=int, default=500, help="사이클마다 만들고 죽이는 유닛 수")
+    parser.add_argument("--survivors", type=int, default=20_000, help="내내 살아 있는 유닛 수")
+    args = parser.parse_args()
+
+    module = load_module("starcraft_final")
+    for pooled in (False, True):
+        elapsed, watch, pool = run(module, args, pooled)
+        units = args.cycles * args.wave
+        label = "pool" if pooled else "no pool"
+        reuse = f", 재사용 {pool.reused}/{pool.reused + pool.created}" if pool is not None else ""
+        print(f"{label:>8}: {args.cycles / elapsed:8.1f} cycles/s, {elapsed / units * 1e6:6.2f} us/unit, "
+              f"GC gen0/1/2 {watch.counts[0]}/{watch.counts[1]}/{watch.counts[2]}, "
+              f"GC 정지 {watch.pause * 1e3:7.1f} ms{reuse}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""
+GameManager에 유닛 n개를 등록한 뒤 모두 처치하는 데 걸리는 시간을 측정한다.
+사망 처리(레지스트리 제거)가 유닛당 O(1)이면 전체 시간이 n에 비례한다.
+
+실행: python benchmarks/unit_registry.py [-n 50000] [--against REV]
+"""
+import argparse
+import time
+
+from common import load_module, silenced
+
+def bench(module, count):
+    manager = module.GameManager(module.NullReporter())
+    with silenced():
+        units = [manager.create_unit(module.UnitType.MARINE, f"마린{i}") for i in range(count)]
+        start = time.perf_counter()
+        for unit in units:
+            unit.take_damage(unit.max_hp)
+        elapsed = time.perf_counter() - start
+    manager.shutdown()
+    assert len(list(manager.units)) == 0
+    return elapsed
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", "--count", type=int, default=50_000)
+    parser.add_argument("--against", help="비교할 git 리비전 (NullReporter가 있어야 한다. O(n^2) 구현이면 -n을 줄일 것)")
+    args = parser.parse_args()
+
+    runs = [("current", load_module("starcraft_final"))]
+    if args.against:
+        runs.insert(0, (args.against, load_module("starcraft_final", args.against)))
+    for label, module in runs:
+        elapsed = bench(module, args.count)
+        print(f"{label:>10}: {args.count} kills in {elapsed:.3f}s ({args.count / elapsed:,.0f} kills/s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,9 @@
+"""
+여러 단원의 시뮬레이터 모듈이 함께 쓰는 공용 패키지.
+
+  log:     "starcraft" 로거와 구조화된 이벤트 도구 (3, 4, 5 단원)
+  runtime: 시계, 스킬 효과 만료 서비스, 재생 틱 스케줄러, 대량 생성용 gc_paused (4, 5 단원)
+
+단원 폴더는 패키지가 아니므로, 각 단원 모듈은 저장소 루트가 import 경로에 없을 때
+이 패키지를 파일 위치로 불러온다 (sys.path는 바꾸지 않는다).
+"""
@@ -0,0 +1,60 @@
+"""
+모든 시뮬레이터 모듈(3 단원 advanced, 4 단원 enum, 5 단원 final)이 함께 쓰는 로깅 도구.
+
+각 모듈은 "starcraft" 아래의 자식 로거(starcraft.advanced 등)에 구조화된 이벤트를 남긴다.
+레코드의 event 속성은 이벤트 이름, args는 필드 dict이고 메시지는 출력될 때만 포맷된다.
+임포트할 때는 레벨이나 핸들러를 건드리지 않는다. 콘솔에 보이려면 실행 진입점(main)에서
+configure_logging()을 부르고, 잠시 끄려면 quiet_logging()을 쓴다.
+콘솔 출력용 리포터는 ensure_console_output()으로 설정이 없을 때만 콘솔 출력을 붙인다.
+"""
+import contextlib
+import logging
+
+root_log = logging.getLogger("starcraft")
+
+class StdoutHandler(logging.Handler):
+    """메시지를 print로 내보낸다. 매번 sys.stdout을 찾으므로 redirect_stdout과도 함께 동작한다."""
+    def emit(self, record):
+        try:
+            print(self.format(record))
+        except Exception:
+            self.handleError(record)
+
+def configure_logging(level=logging.INFO):
+    """starcraft 로거가 메시지만 그대로 stdout에 출력하도록 설정한다. 여러 번 불러도 핸들러는 하나다."""
+    if not any(isinstance(handler, StdoutHandler) for handler in root_log.handlers):
+        root_log.addHandler(StdoutHandler())
+    root_log.setLevel(level)
+    root_log.propagate = False
+
+def ensure_console_output():
+    """
+    starcraft 로거(또는 그 상위 로거)에 핸들러가 하나도 없을 때만 configure_logging()처럼 stdout 출력을 붙인다.
+    이미 설정된 핸들러와 레벨(quiet_logging 등)은 건드리지 않는다.
+    """
+    if not root_log.hasHandlers():
+        root_log.addHandler(StdoutHandler())
+        root_log.propagate = False
+        if root_log.level == logging.NOTSET:
+            root_log.setLevel(logging.INFO)
+
+def silence_logging():
+    """starcraft 이벤트를 모두 끈다. 되돌릴 필요가 없는 곳(프로세스 풀 워커 초기화 등)에서 쓴다."""
+    root_log.setLevel(logging.CRITICAL + 1)
+
+@contextlib.contextmanager
+def quiet_logging(level=logging.CRITICAL + 1):
+    """블록 안에서 level 미만의 starcraft 이벤트를 모두 끈다 (기본: 전부)."""
+    old = root_log.level
+    root_log.setLevel(level)
+    try:
+        yield
+    finally:
+        root_log.setLevel(old)
+
+def log_event(logger, level, event, template, /, **fields):
+    """logger에 구조화된 이벤트를 남긴다. 꺼진 레벨이면 레코드도 만들지 않는다 (문자열 포맷 비용 없음)."""
+    if logger.isEnabledFor(level):
+        # Logger.log 대신 레코드를 직접 만들어 호출 위치 탐색(findCaller) 비용을 건너뛴다
+        logger.handle(logger.makeRecord(logger.name, level, "", 0, template, (fields,) if fields else (),
+                                        None, extra={"event": event}))
@@ -0,0 +1,338 @@
+"""
+4, 5 단원 시뮬레이터가 함께 쓰는 실행 시간 도구: 시계(실제/가상)와 그 시계로 움직이는 서비스.
+
+서비스는 시계에 연결(attach)되어, RealClock에서는 자기 스레드를 띄우고 VirtualClock에서는
+next_deadline()/run_due(now)로 시계가 sleep 하는 동안 예약 시각 순서대로 실행된다.
+유닛을 대량으로 만들 때 쓰는 gc_paused()도 여기에 둔다.
+"""
+from abc import ABC, abstractmethod
+import contextlib
+import gc
+import heapq
+import itertools
+import threading
+import time
+
+# --- 시간 추상화: 실제 시간 / 가상 시간 ---
+class Clock(ABC):
+    """시나리오 대기, 재생 틱, 스킬 효과 만료가 공통으로 사용하는 시계"""
+    @abstractmethod
+    def now(self) -> float:
+        pass
+
+    @abstractmethod
+    def sleep(self, seconds: float) -> None:
+        pass
+
+    def attach(self, service) -> None:
+        """주기/예약 작업 서비스를 이 시계에 연결한다. 실제 시간에서는 서비스가 자기 스레드를 띄운다."""
+        service.start_thread()
+
+    def detach(self, service) -> None:
+        pass
+
+class RealClock(Clock):
+    def now(self) -> float:
+        return time.monotonic()
+
+    def sleep(self, seconds: float) -> None:
+        time.sleep(seconds)
+
+class VirtualClock(Clock):
+    """
+    실제로 기다리지 않는 시계. sleep 하면 그 사이에 예약된 작업들을 시각 순서대로 실행하면서
+    다음 예약 시각으로 곧바로 건너뛴다. 연결된 서비스는 next_deadline()/run_due(now)를 제공한다.
+    """
+    def __init__(self, start: float = 0.0):
+        self._now = start
+        self._services = []
+
+    def now(self) -> float:
+        return self._now
+
+    def attach(self, service) -> None:
+        if service not in self._services:
+            self._services.append(service)
+
+    def detach(self, service) -> None:
+        if service in self._services:
+            self._services.remove(service)
+
+    def sleep(self, seconds: float) -> None:
+        target = self._now + seconds
+        while True:
+            due, service = None, None
+            for svc in self._services:
+                deadline = svc.next_deadline()
+                # 같은 시각이면 먼저 연결된 서비스부터 실행
+                if deadline is not None and deadline <= target and (due is None or deadline < due):
+                    due, service = deadline, svc
+            if service is None:
+                break
+            self._now = max(self._now, due)
+            service.run_due(self._now)
+        self._now = target
+
+# --- 스킬 효과 만료 서비스: 효과마다 Timer 스레드를 두지 않고 힙 하나로 관리 ---
+class EffectHandle:
+    """예약된 효과 만료 하나를 가리키는 핸들"""
+    def __init__(self, due, callback, owner=None, kind=None):
+        self.due = due
+        self.callback = callback
+        self.owner = owner
+        self.kind = kind
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+class EffectExpiryService:
+    """
+    클로킹/락다운 같은 지속 효과의 만료 시각을 우선순위 큐(heap)에 보관하고,
+    하나의 스레드가 만료 시각이 지난 효과를 모아 한 번에 처리한다. 대기는 최소 resolution 단위라서
+    잇달아 만료되는 효과들은 한 번 깨어날 때 함께 처리되며, 예약 시각보다 먼저 실행되지는 않는다.
+    owner와 kind를 지정하면 같은 유닛의 같은 효과는 새로 예약할 때 이전 예약이 취소된다.
+    """
+    _default = None
+
+    def __init__(self, resolution: float = 0.01, clock: Clock = None):
+        self.resolution = resolution
+        self.clock = clock or RealClock()
+        self._heap = []
+        self._seq = itertools.count()
+        self._by_owner = {}  # id(owner) -> {kind: EffectHandle}
+        self._cond = threading.Condition()
+        self._thread = None
+        self._started = False
+        self._stopped = False
+        # 만료 지연(jitter) 측정값: 실제 실행 시각 - 예약 시각
+        self.fired = 0
+        self.jitter_total = 0.0
+        self.jitter_max = 0.0
+
+    @classmethod
+    def default(cls):
+        """GameManager 밖에서 만든 유닛이 사용하는 공용 서비스"""
+        if cls._default is None:
+            cls._default = cls()
+        return cls._default
+
+    @property
+    def jitter_mean(self):
+        return self.jitter_total / self.fired if self.fired else 0.0
+
+    def __len__(self):
+        return sum(1 for _, _, h in self._heap if not h.cancelled)
+
+    def schedule(self, delay, callback, owner=None, kind=None) -> EffectHandle:
+        handle = EffectHandle(self.clock.now() + delay, callback, owner, kind)
+        with self._cond:
+            if owner is not None:
+                effects = self._by_owner.setdefault(id(owner), {})
+                previous = effects.get(kind)
+                if previous is not None:
+                    previous.cancel()
+                effects[kind] = handle
+            heapq.heappush(self._heap, (handle.due, next(self._seq), handle))
+            # 가장 이른 만료가 바뀌었을 때만 스레드를 깨운다
+            if self._heap[0][2] is handle:
+                self._cond.notify()
+        self.start()
+        return handle
+
+    def cancel(self, handle):
+        with self._cond:
+            handle.cancel()
+            self._forget(handle)
+
+    def cancel_effect(self, owner, kind):
+        """유닛의 특정 효과 만료 예약을 취소한다."""
+        with self._cond:
+            handle = self._by_owner.get(id(owner), {}).get(kind)
+            if handle is not None:
+                handle.cancel()
+                self._forget(handle)
+
+    def cancel_owner(self, owner):
+        """유닛에 걸린 모든 효과 만료를 취소한다 (예: 사망 시)."""
+        with self._cond:
+            for handle in self._by_owner.pop(id(owner), {}).values():
+                handle.cancel()
+
+    def _forget(self, handle):
+        if handle.owner is None:
+            return
+        effects = self._by_owner.get(id(handle.owner))
+        if effects is not None and effects.get(handle.kind) is handle:
+            del effects[handle.kind]
+            if not effects:
+                del self._by_owner[id(handle.owner)]
+
+    def _pop_due(self, now):
+        batch = []
+        while self._heap and self._heap[0][0] <= now:
+            handle = heapq.heappop(self._heap)[2]
+            if not handle.cancelled:
+                self._forget(handle)
+                batch.append(handle)
+        return batch
+
+    def start(self):
+        with self._cond:
+            if self._started:
+                return
+            self._started = True
+        self.clock.attach(self)
+
+    def start_thread(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        self.clock.detach(self)
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    # VirtualClock 연동
+    def next_deadline(self):
+        with self._cond:
+            while self._heap and self._heap[0][2].cancelled:
+                heapq.heappop(self._heap)
+            return self._heap[0][0] if self._heap else None
+
+    def run_due(self, now):
+        with self._cond:
+            batch = self._pop_due(now)
+        self._fire(batch)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._stopped:
+                    if not self._heap:
+                        self._cond.wait()
+                        continue
+                    wait = self._heap[0][0] - self.clock.now()
+                    if wait <= 0:
+                        break
+                    self._cond.wait(max(wait, self.resolution))
+                if self._stopped:
+                    return
+                batch = self._pop_due(self.clock.now())
+            # 콜백은 락 밖에서 실행 (콜백 안에서 다시 schedule 할 수 있도록)
+            self._fire(batch)
+
+    def _fire(self, batch):
+        now = self.clock.now()
+        for handle in batch:
+            if handle.cancelled:
+                continue
+            jitter = abs(now - handle.due)
+            self.fired += 1
+            self.jitter_total += jitter
+            self.jitter_max = max(self.jitter_max, jitter)
+            handle.callback()
+
+def effect_service_of(unit):
+    service = getattr(unit, "effect_service", None)
+    return service if service is not None else EffectExpiryService.default()
+
+# --- 회복 틱 스케줄러: 유닛 수와 무관하게 스레드 하나로 동작 ---
+class TickScheduler:
+    """등록된 유닛들의 주기 작업(HP/에너지 재생)을 하나의 스레드에서 매 틱 일괄 실행한다."""
+    def __init__(self, interval: float = 1.0, clock: Clock = None):
+        self.interval = interval
+        self.clock = clock or RealClock()
+        self._tasks = {}  # id(unit) -> (unit, [callback, ...])
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._next_tick = None
+
+    def register(self, unit, callback):
+        with self._lock:
+            _, callbacks = self._tasks.setdefault(id(unit), (unit, []))
+            callbacks.append(callback)
+        self.start()
+
+    def register_many(self, entries):
+        """(unit, callback) 쌍을 락 한 번으로 모두 등록한다."""
+        with self._lock:
+            tasks = self._tasks
+            for unit, callback in entries:
+                _, callbacks = tasks.setdefault(id(unit), (unit, []))
+                callbacks.append(callback)
+        self.start()
+
+    def unregister(self, unit):
+        with self._lock:
+            self._tasks.pop(id(unit), None)
+
+    def __len__(self):
+        return len(self._tasks)
+
+    def tick(self):
+        """한 틱 분량의 작업을 실행한다. 죽은 유닛은 여기서 등록 해제된다."""
+        with self._lock:
+            entries = list(self._tasks.items())
+        dead = []
+        for key, entry in entries:
+            unit, callbacks = entry
+            if not unit.is_alive:
+                dead.append((key, entry))
+                continue
+            for callback in callbacks:
+                callback()
+        if dead:
+            with self._lock:
+                for key, entry in dead:
+                    # 그사이 같은 id로 다시 등록된 유닛(풀에서 재사용 등)의 작업은 지우지 않는다
+                    if self._tasks.get(key) is entry:
+                        del self._tasks[key]
+
+    def start(self):
+        if self._next_tick is None:
+            self._next_tick = self.clock.now() + self.interval
+            self.clock.attach(self)
+
+    def start_thread(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        self.clock.detach(self)
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def _run(self):
+        # 매 틱 시각을 기준으로 기다리므로 틱 처리 시간만큼 주기가 밀리지 않는다
+        while not self._stop_event.wait(max(0.0, self._next_tick - self.clock.now())):
+            self.run_due(self.clock.now())
+
+    # VirtualClock 연동
+    def next_deadline(self):
+        return self._next_tick
+
+    def run_due(self, now):
+        while self._next_tick is not None and self._next_tick <= now:
+            self._next_tick += self.interval
+            self.tick()
+
+# --- 대량 생성 도우미 ---
+@contextlib.contextmanager
+def gc_paused():
+    """
+    블록 안에서 순환 GC를 멈춘다. 유닛 수만 개를 한꺼번에 만들면 할당 횟수 때문에 세대 수집이 계속 돌고,
+    이미 살아 있는 객체 전체를 매번 다시 훑는다. 블록이 끝나면 원래 상태로 돌려 놓는다.
+    """
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
@@ -0,0 +1,35 @@
+"""테스트 공용 픽스처: 단원별 시뮬레이터 모듈을 파일 경로로 불러온다 (단원 폴더는 패키지가 아니다)."""
+import importlib.util
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+MODULES = {
+    "starcraft_advanced": os.path.join("3 단원", "starcraft_advanced.py"),
+    "starcraft_enum": os.path.join("4 단원", "starcraft_enum.py"),
+    "starcraft_final": os.path.join("5 단원", "starcraft_final.py"),
+}
+
+def load_module(name):
+    """MODULES의 시뮬레이터를 한 번만 불러와 sys.modules에 등록한다 (pickle이 클래스를 찾을 수 있도록)."""
+    if name not in sys.modules:
+        spec = importlib.util.spec_from_file_location(name, os.path.join(ROOT, MODULES[name]))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+    return sys.modules[name]
+
+@pytest.fixture(scope="session")
+def advanced():
+    return load_module("starcraft_advanced")
+
+@pytest.fixture(scope="session")
+def enum_mod():
+    return load_module("starcraft_enum")
+
+@pytest.fixture(scope="session")
+def final():
+    return load_module("starcraft_final")
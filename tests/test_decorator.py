@@ -0,0 +1,30 @@
+"""5 단원: 업그레이드 데코레이터가 공격 전략에 보너스를 넘기는지 확인한다."""
+
+def _pair(final):
+    factory = final.UnitFactory()
+    marine = factory.create_unit(final.UnitType.MARINE, "마린", power=6)
+    target = factory.create_unit(final.UnitType.ZERGLING, "저글링", hp=100)
+    for unit in (marine, target):
+        unit.reporter = final.NullReporter()
+    return marine, target
+
+def test_upgraded_damage_reaches_strategy(final):
+    marine, target = _pair(final)
+    upgraded = final.DamageUpgradeDecorator(final.DamageUpgradeDecorator(marine, bonus=1), bonus=2)
+    upgraded.attack(target)
+    assert target.hp == 100 - 9
+    assert marine.power == 6
+
+def test_stimpack_adds_upgrade_bonus(final):
+    marine, target = _pair(final)
+    upgraded = final.DamageUpgradeDecorator(marine, bonus=2)
+    upgraded.set_strategy(final.StimpackStrategy())
+    upgraded.attack(target)
+    assert target.hp == 100 - (6 + 2 + final.GameConfig.STIMPACK_POWER_BONUS)
+
+def test_power_stays_assignable(final):
+    marine, _ = _pair(final)
+    upgraded = final.DamageUpgradeDecorator(marine, bonus=3)
+    marine.power = 1
+    assert upgraded.power == 4
+    assert upgraded.remove_upgrade() is marine
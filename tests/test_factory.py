@@ -0,0 +1,18 @@
+"""5 단원: UnitFactory의 원형 레지스트리는 팩토리마다 따로다."""
+import pytest
+
+def test_register_is_per_factory(final):
+    factory, other = final.UnitFactory(), final.UnitFactory()
+    factory.register(final.UnitType.GHOST, final.UnitPrototype(final.Marine), variant="disguised")
+    assert isinstance(factory.create_unit(final.UnitType.GHOST, "변장", variant="disguised"), final.Marine)
+    with pytest.raises(ValueError):
+        other.create_unit(final.UnitType.GHOST, "변장", variant="disguised")
+
+def test_clone_applies_overrides(final):
+    factory = final.UnitFactory()
+    elite = factory.create_unit(final.UnitType.MARINE, "정예", variant="elite", hp=70)
+    plain = factory.create_unit(final.UnitType.MARINE, "마린")
+    assert (elite.hp, elite.max_hp) == (70, 70)
+    assert plain.hp == final.GameConfig.MARINE_HP
+    with pytest.raises(TypeError):
+        factory.create_unit(final.UnitType.MARINE, "마린", energy=10)
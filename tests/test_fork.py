@@ -0,0 +1,37 @@
+"""3 단원: fork()로 갈라진 게임은 원래 게임과 유닛을 공유하지 않고, 그대로 두면 같은 결과에 이른다."""
+from test_replay import _game, _states
+
+def _play(game, turns):
+    for t in range(game.turns_played + 1, turns + 1):
+        game.step(t)
+        game.turns_played = t
+
+def test_untouched_fork_finishes_like_original(advanced):
+    game = _game(advanced, 11)
+    _play(game, 6)
+    twin = game.fork()
+    assert _states(advanced, twin) == _states(advanced, game)
+    assert twin.resume() == game.resume()
+    assert _states(advanced, twin) == _states(advanced, game)
+
+def test_fork_does_not_share_units(advanced):
+    game = _game(advanced, 11)
+    _play(game, 6)
+    before = _states(advanced, game)
+    twin = game.fork()
+    assert not set(map(id, twin.all_units)) & set(map(id, game.all_units))
+    for u in twin.all_units:
+        u.hp = 1
+    twin.resume()
+    assert _states(advanced, game) == before
+
+def test_forks_from_one_snapshot_are_independent(advanced):
+    game = _game(advanced, 11)
+    _play(game, 4)
+    snapshot = game.snapshot()
+    first, second = game.fork(snapshot), game.fork(snapshot)
+    first.p_lockdown = second.p_lockdown = 0.0
+    first.resume()
+    assert _states(advanced, second)[0] == 4
+    second.resume()
+    assert _states(advanced, first) == _states(advanced, second)
@@ -0,0 +1,32 @@
+"""공용 로깅: ConsoleReporter는 로깅 설정 없이도 콘솔에 출력한다."""
+import pytest
+
+@pytest.fixture
+def root_log(final):
+    """테스트가 바꾼 starcraft 로거 설정을 되돌린다."""
+    root = final.root_log
+    saved = (root.handlers[:], root.level, root.propagate)
+    yield root
+    root.handlers[:], root.level, root.propagate = saved
+
+def _unconfigure(root):
+    # pytest가 로그 캡처용으로 붙인 핸들러까지 떼어 "설정 없음" 상태로 만든다
+    root.handlers.clear()
+    root.setLevel(0)
+    root.propagate = False
+
+def test_console_reporter_prints_without_configuration(final, root_log, capsys):
+    _unconfigure(root_log)
+    reporter = final.ConsoleReporter()
+    assert root_log.handlers == []  # 만들기만 해서는 로깅 설정을 바꾸지 않는다
+    reporter.log("안녕")
+    reporter.event(final.logging.INFO, "hello", "%(who)s 반가워", who="마린")
+    assert capsys.readouterr().out == "안녕\n마린 반가워\n"
+
+def test_console_reporter_keeps_existing_configuration(final, root_log, capsys):
+    _unconfigure(root_log)
+    final.configure_logging()
+    with final.quiet_logging():
+        final.ConsoleReporter().log("조용히")
+    assert len(root_log.handlers) == 1
+    assert capsys.readouterr().out == ""
@@ -0,0 +1,68 @@
+"""5 단원: 변경 큐는 flush()/close() 때 들어온 명령을 하나도 잃지 않는다."""
+import threading
+
+import pytest
+
+HP = 10**6
+
+@pytest.fixture
+def units(final):
+    factory = final.UnitFactory()
+    units = factory.create_units(final.UnitType.ZERGLING, 8, hp=HP)
+    for unit in units:
+        unit.reporter = final.NullReporter()
+    return units
+
+def _hammer(units, hits, threads=4):
+    """여러 스레드에서 유닛마다 피해 1을 hits번씩 준다."""
+    def worker():
+        for _ in range(hits):
+            for unit in units:
+                unit.take_damage(1)
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    return threads * hits
+
+@pytest.mark.parametrize("shards", [1, 3])
+def test_flush_applies_every_command(final, units, shards):
+    queue = final.MutationQueue(shards)
+    for unit in units:
+        queue.attach(unit)
+    try:
+        total = _hammer(units, 500)
+        queue.flush()
+        assert queue.applied == total * len(units)
+        assert [unit.state().hp for unit in units] == [HP - total] * len(units)
+        assert [unit.hp for unit in units] == [HP - total] * len(units)
+    finally:
+        queue.close()
+
+def test_flush_waits_for_commands_submitted_by_commands(final, units):
+    queue = final.MutationQueue(4)
+    for unit in units:
+        queue.attach(unit)
+    first, rest = units[0], units[1:]
+
+    def fan_out():
+        # 작성자 스레드에서 다른 샤드의 유닛들에 명령을 넣는다
+        for unit in rest:
+            unit.take_damage(7)
+    queue.submit(first, fan_out)
+    queue.flush()
+    assert [unit.state().hp for unit in rest] == [HP - 7] * len(rest)
+    queue.close()
+
+def test_close_applies_pending_commands_and_detaches(final, units):
+    queue = final.MutationQueue(2)
+    for unit in units:
+        queue.attach(unit)
+    total = _hammer(units, 300)
+    queue.close()
+    assert queue.applied == total * len(units)
+    assert [unit.hp for unit in units] == [HP - total] * len(units)
+    assert all(unit.writer is None for unit in units)
+    units[0].take_damage(5)  # 떼어 낸 뒤에는 바로 적용된다
+    assert units[0].hp == HP - total - 5
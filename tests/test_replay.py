@@ -0,0 +1,49 @@
+"""3 단원: 리플레이는 저장/불러오기 후에도 같은 게임을 재현하고, seek는 어느 턴이든 같은 상태를 준다."""
+import pytest
+
+TEAMS = "Marine:4 Ghost:1 | Zergling:6 | Zealot:3 | Wraith:3"
+
+def _players(advanced):
+    teams = [{getattr(advanced, cls): int(n) for cls, n in (unit.split(":") for unit in team.split())}
+             for team in TEAMS.split("|")]
+    return advanced.build_players(teams)
+
+def _game(advanced, seed, max_turns=40):
+    return advanced.Game(_players(advanced), max_turns=max_turns, seed=seed, verbose=False)
+
+def _states(advanced, game):
+    return game.turns_played, [advanced.Game._unit_state(u) for u in game.all_units]
+
+@pytest.mark.parametrize("seed", [1, 7, 42])
+def test_save_load_play_matches_original(advanced, tmp_path, seed):
+    game = _game(advanced, seed)
+    replay = advanced.Replay.record(game, snapshot_every=5)
+    path = tmp_path / "battle.screplay"
+    replay.save(path)
+    played = advanced.Replay.load(path).play()
+    assert _states(advanced, played) == _states(advanced, game)
+    assert played.winner() == game.winner()
+
+def test_seek_matches_running_to_that_turn(advanced, tmp_path):
+    replay = advanced.Replay.record(_game(advanced, 3), snapshot_every=4)
+    replay.save(tmp_path / "battle.screplay")
+    loaded = advanced.Replay.load(tmp_path / "battle.screplay")
+    reused = None
+    for turn in [replay.turns, 9, 0, 4, replay.turns // 2]:
+        direct = _game(advanced, 3, max_turns=turn)
+        direct.run()
+        reused = loaded.seek(turn, game=reused)
+        assert _states(advanced, reused) == _states(advanced, direct)
+        assert _states(advanced, replay.seek(turn)) == _states(advanced, direct)
+
+def test_seek_out_of_range(advanced):
+    replay = advanced.Replay.record(_game(advanced, 5))
+    with pytest.raises(ValueError):
+        replay.seek(replay.turns + 1)
+
+def test_resume_from_snapshot_turn_matches_full_run(advanced):
+    game = _game(advanced, 3)
+    replay = advanced.Replay.record(game, snapshot_every=4)
+    resumed = replay.seek(8)
+    resumed.resume()
+    assert _states(advanced, resumed) == _states(advanced, game)
@@ -0,0 +1,51 @@
+"""5 단원: 풀에서 재사용한 유닛은 새로 만든 유닛과 같은 상태로 시작한다."""
+import pytest
+
+# 게임에 등록될 때마다 그 게임의 객체로 바뀌는 연결 속성
+CONNECTIONS = {"event_bus", "reporter", "journal", "effect_service", "writer", "_state"}
+
+def _fields(unit):
+    return {key: type(value) if key == "attack_strategy" else value
+            for key, value in vars(unit).items() if key not in CONNECTIONS}
+
+@pytest.fixture
+def manager(final):
+    manager = final.GameManager(final.NullReporter(), clock=final.VirtualClock(), unit_pool=final.UnitPool())
+    yield manager
+    manager.shutdown()
+
+def test_reused_unit_matches_a_fresh_one(final, manager):
+    ghost = manager.create_unit(final.UnitType.GHOST, "고스트")
+    marine = manager.create_unit(final.UnitType.MARINE, "마린")
+    ghost.cloak(duration=30)
+    ghost.lockdown(marine, duration=30)
+    ghost.set_strategy(final.StimpackStrategy())
+    ghost.take_damage(ghost.max_hp)
+    assert len(manager.unit_pool) == 1
+
+    reused = manager.create_unit(final.UnitType.GHOST, "새 고스트", hp=80)
+    fresh = final.UnitFactory().create_unit(final.UnitType.GHOST, "새 고스트", hp=80)
+    assert reused is ghost
+    assert manager.unit_pool.reused == 1
+    assert _fields(reused) == _fields(fresh)
+    assert reused in list(manager.units)
+
+def test_reused_unit_keeps_regenerating(final, manager):
+    zergling = manager.create_unit(final.UnitType.ZERGLING, "저글링")
+    zergling.take_damage(zergling.max_hp)
+    reused = manager.create_unit(final.UnitType.ZERGLING, "저글링2")
+    assert reused is zergling
+    reused.take_damage(10)
+    # 사망 때 해제된 재생 작업이 재사용 때 다시 등록되어야 한다
+    manager.clock.sleep(3)
+    assert reused.hp == min(reused.max_hp, reused.max_hp - 10 + 3 * final.GameConfig.ZERGLING_HP_REGEN_RATE)
+    assert len(manager.scheduler) == 1
+
+def test_capacity_limits_kept_units(final):
+    pool = final.UnitPool(capacity=1)
+    factory = final.UnitFactory()
+    for unit in factory.create_units(final.UnitType.MARINE, 3):
+        unit.reporter = final.NullReporter()
+        unit.take_damage(unit.max_hp)
+        pool.release(unit)
+    assert len(pool) == 1